@@ -0,0 +1,83 @@
+"""
+Micro-benchmark for anchor generation and underscore escaping.
+
+Renders the anchors of a synthetic document with 50k headers. Every name is anchored three times (index entry, header
+and navigation link), as in the generated documentation. Compares the per-call cost of the previous regex-based
+implementation with the translation table based, memoized implementation in md_utils.
+
+Usage:
+    python benchmarks/bench_anchors.py [--headers N]
+"""
+
+import argparse
+import re
+import string
+import time
+
+from markdowndocs import md_utils
+
+
+def gen_anchor_regex(txt: str) -> str:
+    """
+    Generate an anchor with the previous implementation of md_utils.gen_anchor, which compiled the regex on every call.
+
+    :param txt: A header text.
+    :return: The anchor of the header.
+    """
+    regex = re.compile("[%s+| ]" % re.escape(string.punctuation))
+    return regex.sub("", txt.lower())
+
+
+def escape_underscores_regex(txt: str) -> str:
+    """
+    Escape underscores with the previous implementation in md_utils.add_header and md_utils.add_index.
+
+    :param txt: A header text.
+    :return: The text with escaped underscores.
+    """
+    backslash = "\\_"
+    return re.sub("_", backslash, txt)
+
+
+def run(names, gen_anchor, escape_underscores) -> float:
+    """
+    Time anchoring and escaping all names three times.
+
+    :param names: The header names.
+    :param gen_anchor: The function that generates an anchor.
+    :param escape_underscores: The function that escapes underscores.
+    :return: The time per call, in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(3):
+        for name in names:
+            gen_anchor(name)
+            escape_underscores(name)
+    return (time.perf_counter() - start) / (3 * len(names)) * 1e6
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+
+    Prints the per-call cost of the previous and the current implementation.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--headers", type=int, default=50_000)
+    n_headers = parser.parse_args().headers
+
+    names = [f"package/module_{i // 500}.MyClass_{i // 50}.my_method_{i}" for i in range(n_headers)]
+    assert [gen_anchor_regex(n) for n in names[:1000]] == [md_utils.gen_anchor(n) for n in names[:1000]]
+    assert [escape_underscores_regex(n) for n in names[:1000]] == [md_utils.escape_underscores(n) for n in names[:1000]]
+    md_utils.gen_anchor.cache_clear()
+    md_utils.escape_underscores.cache_clear()
+
+    before = run(names, gen_anchor_regex, escape_underscores_regex)
+    after = run(names, md_utils.gen_anchor, md_utils.escape_underscores)
+    print(f"{n_headers} headers, 3 anchors per header")
+    print(f"before (regex):             {before:.3f} us/call")
+    print(f"after  (translate + memo):  {after:.3f} us/call  ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
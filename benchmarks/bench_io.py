@@ -0,0 +1,112 @@
+"""
+Benchmark for concurrent file I/O on a high-latency filesystem.
+
+Documents a synthetic codebase with a warm cache and split output (so that the run consists of directory listings,
+source hashing, cache reads and output file comparisons), on a stand-in for a network-mounted volume: every
+filesystem call made through os.scandir, os.stat, os.replace, os.utime and open is delayed by a fixed latency. Compares
+the wall time of sequential I/O (--io-concurrency 1) with concurrent I/O.
+
+Usage:
+    python benchmarks/bench_io.py [--packages N] [--modules N] [--latency MS] [--concurrency N]
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_codebase  # noqa: E402
+
+from markdowndocs.cli import set_up_parser  # noqa: E402
+from markdowndocs.mddocs import generate_markdown_file, identify_modules  # noqa: E402
+
+
+@contextmanager
+def latency(seconds: float):
+    """
+    Delay every filesystem call made through os.scandir, os.stat, os.replace, os.utime and open.
+
+    :param seconds: The delay per call, in seconds.
+    """
+
+    def delayed(func):
+        def call(*args, **kwargs):
+            time.sleep(seconds)
+            return func(*args, **kwargs)
+
+        return call
+
+    with mock.patch.object(builtins, "open", delayed(builtins.open)), mock.patch.multiple(
+        os,
+        scandir=delayed(os.scandir),
+        stat=delayed(os.stat),
+        replace=delayed(os.replace),
+        utime=delayed(os.utime),
+    ):
+        yield
+
+
+def run(concurrency: int) -> float:
+    """
+    Document the codebase in the working directory.
+
+    :param concurrency: The number of concurrent filesystem operations (--io-concurrency).
+    :return: The wall time, in seconds.
+    """
+    args = set_up_parser().parse_args(["--all", "--recursive", "--split", "--io-concurrency", str(concurrency)])
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        generate_markdown_file(args, identify_modules(args), "code_documentation.md")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+
+    Prints the wall time with sequential and with concurrent I/O.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--packages", type=int, default=10)
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=2.0, help="Latency per filesystem call (in milliseconds).")
+    parser.add_argument("--concurrency", type=int, default=16)
+    options = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        generate_codebase(
+            root,
+            n_packages=options.packages,
+            n_modules=options.modules,
+            n_classes=2,
+            n_methods=5,
+            n_functions=5,
+            source_lines=5,
+        )
+        os.chdir(root)
+        try:
+            # Warm the cache and write the output files, so that both runs do the same (read-only) work.
+            run(options.concurrency)
+            with latency(options.latency / 1000):
+                sequential = run(1)
+                concurrent = run(options.concurrency)
+        finally:
+            os.chdir(cwd)
+
+    n_modules = options.packages * options.modules
+    print(f"{n_modules} modules, {options.latency:g} ms per filesystem call, warm cache, split output")
+    print(f"sequential (--io-concurrency 1):   {sequential:.2f} s")
+    speed_up = sequential / concurrent
+    print(f"concurrent (--io-concurrency {options.concurrency}):  {concurrent:.2f} s  ({speed_up:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
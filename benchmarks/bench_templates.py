@@ -0,0 +1,163 @@
+"""
+Benchmark for rendering module sections from compiled templates.
+
+Renders the sections and index entries of a synthetic code base with 100k functions (half of them methods, with
+docstrings and source code). Compares the previous inline implementation, which assembled every fragment with f-strings
+and the md_utils helpers, with the compiled templates in markdowndocs.templates, and checks that both render the same
+markdown.
+
+Usage:
+    python benchmarks/bench_templates.py [--functions N] [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Iterator
+
+from markdowndocs import constants as c
+from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject
+from markdowndocs.md_utils import add_header, add_index, add_python_snippet, gen_anchor, list_to_md
+from markdowndocs.mddocs import iter_module_index, iter_module_markdown
+from markdowndocs.templates import load_templates
+
+
+def iter_module_markdown_inline(markdown_module_object: MarkDownModuleObject, index_file: str = "") -> Iterator[str]:
+    """
+    Render the section of a module with the previous implementation of mddocs.iter_module_markdown.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :param index_file: The file that holds the index, for the links back to the index.
+    :return: An iterator over markdown fragments.
+    """
+    index_link = f"{index_file}#{gen_anchor(c.FILE.DEFAULT_HEADER)}"
+    yield add_header(level=2, header_text=markdown_module_object.module)
+    yield f"\n{c.FILE.NAVIGATION} [code documentation index]({index_link})\n"
+
+    if markdown_module_object.dependencies:
+        yield list_to_md(items=markdown_module_object.dependencies, introductory_text=add_header(3, "Dependencies"))
+
+    if markdown_module_object.class_markdown_objects:
+        yield add_header(level=3, header_text="Classes")
+        yield add_index([my_class.class_name for my_class in markdown_module_object.class_markdown_objects])
+        for my_class in markdown_module_object.class_markdown_objects:
+            yield add_header(level=4, header_text=my_class.class_name)
+            yield f"\n{my_class.class_description}" if my_class.class_description else "\n*No docstrings available.*"
+            if my_class.function_objects:
+                yield add_header(level=5, header_text="Functions")
+                yield add_index([f"{i.function_name}" for i in my_class.function_objects])
+                for entry in my_class.function_objects:
+                    yield add_header(level=6, header_text=f"{entry.function_name}")
+                    yield f"\n{c.FILE.NAVIGATION} [code documentation index]({index_link})\n"
+                    yield f"\n{c.FILE.NAVIGATION} [module index](#{markdown_module_object.module})\n"
+                    yield f"\n{c.FILE.NAVIGATION} [class index](#{my_class.class_name})\n"
+                    yield (
+                        f"\n{entry.function_description}"
+                        if entry.function_description
+                        else "\n*No docstrings available.*"
+                    )
+                    if entry.code:
+                        yield add_python_snippet(entry.code)
+
+    if markdown_module_object.function_markdown_objects:
+        yield add_header(level=3, header_text="Functions")
+        yield add_index([i.function_name for i in markdown_module_object.function_markdown_objects])
+
+        for entry in markdown_module_object.function_markdown_objects:
+            yield add_header(level=4, header_text=entry.function_name)
+            yield f"\n{c.FILE.NAVIGATION} [code documentation index]({index_link})\n"
+            yield f"\n{c.FILE.NAVIGATION} [module index](#{markdown_module_object.module})\n"
+            yield f"\n{entry.function_description}" if entry.function_description else "\n*No docstrings available.*"
+            if entry.code:
+                yield add_python_snippet(entry.code)
+
+
+def iter_module_index_inline(markdown_module_object: MarkDownModuleObject) -> Iterator[str]:
+    """
+    Render the index entries of a module with the previous implementation of mddocs.iter_module_index.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :return: An iterator over markdown fragments.
+    """
+    yield add_index([markdown_module_object.module])
+    for m in markdown_module_object.class_markdown_objects:
+        yield add_index([m.class_name], 1)
+        for myclass in m.function_objects:
+            yield add_index([f"{myclass.function_name}"], 2)
+    for f in markdown_module_object.function_markdown_objects:
+        yield add_index([f.function_name], 1)
+
+
+def synthetic_modules(n_functions: int):
+    """
+    Synthetic modules.
+
+    :param n_functions: The total number of functions and methods.
+    :return: Modules with 5 classes of 10 methods and 50 functions each, with docstrings and source code.
+    """
+    code = "def f(x):\n    return x\n"
+    modules = []
+    for i in range(max(1, n_functions // 100)):
+        classes = [
+            MarkdownClassObject(
+                f"MyClass_{i}_{k}",
+                "A class." if k % 2 else "",
+                [FunctionObject(f"my_method_{j}", "A method." if j % 3 else None, code) for j in range(10)],
+            )
+            for k in range(5)
+        ]
+        functions = [FunctionObject(f"my_function_{j}", "A function.", code if j % 4 else None) for j in range(50)]
+        modules.append(MarkDownModuleObject(f"package/module_{i}", None, ["os", "sys"], functions, classes))
+    return modules
+
+
+def run(modules, render_section, render_index, repeat: int) -> float:
+    """
+    Time rendering the sections and index entries of all modules (best of repeat).
+
+    :param modules: Objects conforming with MarkDownModuleObject.
+    :param render_section: The function that renders the section of a module.
+    :param render_index: The function that renders the index entries of a module.
+    :param repeat: The number of runs.
+    :return: The wall time, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for mod in modules:
+            "".join(render_section(mod))
+            "".join(render_index(mod))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """
+    Run the benchmark.
+
+    Prints the wall time of the previous and the current implementation.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--functions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    modules = synthetic_modules(options.functions)
+    templates = load_templates()
+    for mod in modules[:10]:
+        assert "".join(iter_module_markdown_inline(mod)) == "".join(iter_module_markdown(mod, "", templates))
+        assert "".join(iter_module_index_inline(mod)) == "".join(iter_module_index(mod, "", templates))
+
+    before = run(modules, iter_module_markdown_inline, iter_module_index_inline, options.repeat)
+    after = run(
+        modules,
+        lambda mod: iter_module_markdown(mod, "", templates),
+        lambda mod: iter_module_index(mod, "", templates),
+        options.repeat,
+    )
+    print(f"{len(modules)} modules, {len(modules) * 100} functions")
+    print(f"before (inline f-strings):   {before:.3f} s")
+    print(f"after  (compiled templates): {after:.3f} s  ({before / after:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
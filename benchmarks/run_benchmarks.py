@@ -0,0 +1,211 @@
+"""
+Benchmark suite for markdowndocs.
+
+Generates a synthetic codebase and times module discovery (identify_modules), extraction (process_module), rendering
+(convert_markdown_module_object_to_markdown) and an end-to-end run of the CLI in a subprocess, including its peak RSS.
+Results are stored as JSON so that runs can be compared, e.g. before a release:
+
+    python benchmarks/run_benchmarks.py --output benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json
+
+The comparison exits with a non-zero status if any timing regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_codebase  # noqa: E402
+
+from markdowndocs import version  # noqa: E402
+from markdowndocs.cli import set_up_parser  # noqa: E402
+from markdowndocs.mddocs import (  # noqa: E402
+    convert_markdown_module_object_to_markdown,
+    identify_modules,
+    process_module,
+)
+
+
+@contextmanager
+def working_directory(path: str):
+    """
+    Temporarily change the working directory.
+
+    :param path: The directory to change to.
+    """
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """
+    Time a function (best of repeat).
+
+    :param repeat: The number of calls.
+    :param func: The function to time.
+    :return: The fastest wall time, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_end_to_end(root: str, cli_args) -> Dict[str, float]:
+    """
+    Run the CLI in a subprocess.
+
+    :param root: The working directory of the subprocess.
+    :param cli_args: The command line arguments.
+    :return: The wall time (in seconds) and the peak RSS (in MB) of the run.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "markdowndocs.cli", *cli_args], cwd=root, env=env, stdout=subprocess.DEVNULL
+    )
+    if hasattr(os, "wait4"):
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+        peak_rss = rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    else:
+        process.wait()
+        peak_rss = float("nan")
+    wall_time = time.perf_counter() - start
+    if process.returncode:
+        raise RuntimeError(f"markdowndocs exited with status {process.returncode}")
+    return {"wall_time": wall_time, "peak_rss_mb": peak_rss}
+
+
+def run(options) -> dict:
+    """
+    Generate the synthetic codebase and run all benchmarks.
+
+    :param options: argparse.Namespace with the size of the codebase and the benchmark options.
+    :return: A report with the codebase, the environment and the results.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        source_size = generate_codebase(
+            root,
+            n_packages=options.packages,
+            n_modules=options.modules,
+            n_classes=options.classes,
+            n_methods=options.methods,
+            n_functions=options.functions,
+            source_lines=options.source_lines,
+        )
+        cli_args = ["--all", "--no-cache", *options.cli_args]
+        args = set_up_parser().parse_args(cli_args)
+
+        with working_directory(root):
+            modules = identify_modules(args)
+            results["identify_modules"] = best_of(options.repeat, lambda: identify_modules(args))
+            results["process_module"] = best_of(options.repeat, lambda: [process_module(m, args) for m in modules])
+            mod_obj = [process_module(m, args) for m in modules]
+            results["convert_markdown_module_object_to_markdown"] = best_of(
+                options.repeat, lambda: [convert_markdown_module_object_to_markdown(m) for m in mod_obj]
+            )
+
+        end_to_end = [run_end_to_end(root, cli_args) for _ in range(options.repeat)]
+        results["main"] = min(r["wall_time"] for r in end_to_end)
+        results["main_peak_rss_mb"] = min(r["peak_rss_mb"] for r in end_to_end)
+
+    return {
+        "version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codebase": {
+            "packages": options.packages,
+            "modules": options.packages * options.modules,
+            "classes_per_module": options.classes,
+            "methods_per_class": options.methods,
+            "functions_per_module": options.functions,
+            "source_lines_per_function": options.source_lines,
+            "source_size_mb": round(source_size / 1024**2, 2),
+            "cli_args": cli_args,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> bool:
+    """
+    Compare a report with a baseline.
+
+    Prints the ratio of each result to the baseline.
+
+    :param report: The report of the current run.
+    :param baseline: The report of the baseline run.
+    :param threshold: The relative slowdown above which a result counts as a regression.
+    :return: False if any result regressed beyond the threshold.
+    """
+    ok = True
+    if report["codebase"] != baseline["codebase"]:
+        print("Warning: the baseline was measured on a different synthetic codebase.")
+    for name, value in report["results"].items():
+        reference = baseline["results"].get(name)
+        if not reference:
+            continue
+        ratio = value / reference
+        regressed = ratio > 1 + threshold
+        ok = ok and not regressed
+        print(f"{name:<45} {reference:>10.3f} -> {value:>10.3f}  ({ratio:.2f}x){'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    """
+    Run the benchmark suite.
+
+    Parses the options, runs the benchmarks and stores or compares the results.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark markdowndocs on a synthetic codebase.")
+    parser.add_argument("--packages", type=int, default=5)
+    parser.add_argument("--modules", type=int, default=20, help="Modules per package.")
+    parser.add_argument("--classes", type=int, default=3, help="Classes per module.")
+    parser.add_argument("--methods", type=int, default=10, help="Methods per class.")
+    parser.add_argument("--functions", type=int, default=10, help="Functions per module.")
+    parser.add_argument("--source-lines", type=int, default=10, help="Statements per function.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare the results with a JSON file written by a previous run.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown when comparing.")
+    parser.add_argument(
+        "--cli-args", nargs=argparse.REMAINDER, default=[], help="Extra markdowndocs options (e.g. --static)."
+    )
+    options = parser.parse_args()
+
+    report = run(options)
+    print(json.dumps(report, indent=2))
+
+    if options.output:
+        os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok=True)
+        with open(options.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if options.compare:
+        with open(options.compare, "r") as baseline:
+            if not compare(report, json.load(baseline), options.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Synthetic codebases for benchmarking markdowndocs.
+
+Generates packages with a configurable number of modules, classes, functions and lines of source code per function.
+"""
+
+import os
+import textwrap
+
+
+def _function_source(name: str, source_lines: int, indent: str = "") -> str:
+    """
+    Source code of a documented function.
+
+    :param name: The name of the function.
+    :param source_lines: The number of statements in the body of the function.
+    :param indent: The indentation of the function definition.
+    :return: The function source code.
+    """
+    body = "\n".join(f"    value = value * {i} + {i}  # statement {i}" for i in range(source_lines))
+    return textwrap.indent(
+        f'def {name}(self_or_value, value=1):\n    """\n    {name.replace("_", " ").capitalize()}.\n\n'
+        f'    :param value: A number.\n    :return: Another number.\n    """\n{body}\n    return value\n',
+        indent,
+    )
+
+
+def module_source(n_classes: int, n_methods: int, n_functions: int, source_lines: int) -> str:
+    """
+    Source code of a synthetic module.
+
+    :param n_classes: The number of classes in the module.
+    :param n_methods: The number of methods per class.
+    :param n_functions: The number of module-level functions.
+    :param source_lines: The number of statements in the body of every function and method.
+    :return: The module source code.
+    """
+    parts = ['"""A synthetic module."""\n\nimport os\nimport sys\n']
+    for c in range(n_classes):
+        methods = "\n".join(_function_source(f"method_{m}", source_lines, "    ") for m in range(n_methods))
+        parts.append(f'\nclass SyntheticClass{c}:\n    """Synthetic class {c}."""\n\n{methods}')
+    parts += [f"\n\n{_function_source(f'function_{f}', source_lines)}" for f in range(n_functions)]
+    return "".join(parts)
+
+
+def generate_codebase(
+    root: str, n_packages: int, n_modules: int, n_classes: int, n_methods: int, n_functions: int, source_lines: int
+) -> int:
+    """
+    Generate a synthetic codebase.
+
+    :param root: The directory in which the packages are created.
+    :param n_packages: The number of packages (directories directly under root).
+    :param n_modules: The number of modules per package.
+    :param n_classes: The number of classes per module.
+    :param n_methods: The number of methods per class.
+    :param n_functions: The number of module-level functions per module.
+    :param source_lines: The number of statements in the body of every function and method.
+    :return: The total size of the generated source code, in bytes.
+    """
+    source = module_source(n_classes, n_methods, n_functions, source_lines)
+    for p in range(n_packages):
+        package = os.path.join(root, f"package_{p}")
+        os.makedirs(package, exist_ok=True)
+        open(os.path.join(package, "__init__.py"), "w").close()
+        for m in range(n_modules):
+            with open(os.path.join(package, f"module_{m}.py"), "w") as module_file:
+                module_file.write(source)
+    return n_packages * n_modules * len(source.encode())
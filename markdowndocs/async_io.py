@@ -0,0 +1,91 @@
+"""
+Concurrent file I/O.
+
+Filesystem operations (listing directories, hashing sources, reading cache entries and writing output files) are
+offloaded to a bounded pool of threads and awaited concurrently on an asyncio event loop, so that on high-latency
+filesystems (e.g. network-mounted volumes) their round-trips overlap instead of adding up. Items are handed to the
+threads in small batches, which keeps the overhead of the event loop per item low. With a concurrency of one, the
+operations run sequentially in the calling thread, without starting an event loop.
+"""
+
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+from markdowndocs import constants as c
+
+
+def _gather(fn: Callable[[Any], Any], items: Sequence, concurrency: int) -> List:
+    """
+    Apply a function to every item in a pool of threads, awaited on an asyncio event loop.
+
+    :param fn: A function that performs a filesystem operation on an item.
+    :param items: A sequence of items.
+    :param concurrency: The number of threads.
+    :return: The results, in the same order as the items.
+    """
+    # Imported here, as importing asyncio would almost double the import time of the CLI (see tests/test_import_time.py).
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = [None] * len(items)
+
+    def run(batch: range) -> None:
+        for i in batch:
+            results[i] = fn(items[i])
+
+    async def run_batches() -> None:
+        size = max(1, min(c.IO.BATCH_SIZE, len(items) // (concurrency * 4)))
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, run, range(i, min(i + size, len(items))))
+                    for i in range(0, len(items), size)
+                )
+            )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(run_batches())
+    else:
+        # Called from a running event loop (e.g. in a notebook), which cannot be blocked on: use a loop of our own.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, run_batches()).result()
+    return results
+
+
+def gather(fn: Callable[[Any], Any], items: Iterable, concurrency: int) -> List:
+    """
+    Apply a function to every item, with at most concurrency calls in flight.
+
+    :param fn: A function that performs a filesystem operation on an item.
+    :param items: An iterable of items.
+    :param concurrency: The maximum number of concurrent calls.
+    :return: The results, in the same order as the items.
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    return _gather(fn, items, concurrency)
+
+
+def iter_gather(fn: Callable[[Any], Any], items: Iterable, concurrency: int) -> Iterator:
+    """
+    Apply a function to every item, with at most concurrency calls in flight, and at most c.IO.WINDOW results held.
+
+    :param fn: A function that performs a filesystem operation on an item.
+    :param items: An iterable of items.
+    :param concurrency: The maximum number of concurrent calls.
+    :return: An iterator over the results, in the same order as the items.
+    """
+    if concurrency <= 1:
+        yield from map(fn, items)
+        return
+
+    items = iter(items)
+    while True:
+        window = list(islice(items, c.IO.WINDOW))
+        if not window:
+            return
+        yield from gather(fn, window, concurrency)
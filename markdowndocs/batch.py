@@ -0,0 +1,136 @@
+"""
+Batch mode.
+
+Documents several root directories (e.g. the checkouts of several repositories) in a single process, so that the
+interpreter start-up, the imports of markdowndocs and its dependencies, and the cache are shared between them. The roots
+are listed in a JSON config file, each with its own output file name and discovery options. Modules are discovered and
+imported relative to their root, without changing the working directory.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+from markdowndocs import console
+from markdowndocs import constants as c
+from markdowndocs import timings
+from markdowndocs.mddocs import check_md_file, generate_markdown_file, identify_modules
+
+
+def load_config(path: str) -> List[dict]:
+    """
+    Load a batch config.
+
+    The config is a JSON object with a list of roots, e.g.
+    {"roots": [{"root": "../repo-a", "output_file_name": "docs/code.md", "exclude_paths": ["tests"]}, {"root": "lib"}]}.
+    Besides its root, every entry can set the options in c.BATCH.OPTIONS. Relative roots are relative to the directory
+    of the config file.
+
+    :param path: The path to the JSON config file.
+    :return: The entries of the config, with the roots relative to the current WD.
+    """
+    with open(path, "r") as config_file:
+        config = json.load(config_file)
+
+    entries = config.get("roots") if isinstance(config, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected an object with a non-empty list of roots")
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("root"), str):
+            raise ValueError(f"{path}: every root needs a 'root' directory")
+        unknown = sorted(set(entry) - {"root", *c.BATCH.OPTIONS})
+        if unknown:
+            raise ValueError(f"{path}: unknown options for root {entry['root']}: {', '.join(unknown)}")
+
+    config_dir = os.path.dirname(path)
+    return [{**entry, "root": os.path.normpath(os.path.join(config_dir, entry["root"]))} for entry in entries]
+
+
+def root_args(args, entry: dict) -> argparse.Namespace:
+    """
+    Root arguments.
+
+    :param args: User-specified arguments, which apply to every root.
+    :param entry: An entry of the batch config.
+    :return: A copy of the arguments with the options of the entry, and with relative paths resolved against the root.
+    """
+    parsed = argparse.Namespace(**vars(args))
+    parsed.batch = None
+    for option in c.BATCH.OPTIONS:
+        if option in entry:
+            setattr(parsed, option, entry[option])
+    for option in c.BATCH.PATH_OPTIONS:
+        if getattr(parsed, option):
+            setattr(parsed, option, os.path.join(entry["root"], getattr(parsed, option)))
+    return parsed
+
+
+def _forget_root_modules(root: str, imported: set) -> None:
+    """
+    Remove the modules of a root that were imported while documenting it from sys.modules, so that modules with the same
+    name in other roots are not mistaken for them.
+
+    :param root: A root directory.
+    :param imported: The names of the modules in sys.modules before the root was documented.
+    """
+    root = os.path.join(os.path.realpath(root), "")
+    for name in set(sys.modules) - imported:
+        path = getattr(sys.modules[name], "__file__", None)
+        if path and os.path.realpath(path).startswith(root):
+            del sys.modules[name]
+
+
+def run_batch(args, config_path: str) -> List[dict]:
+    """
+    Run batch.
+
+    Documents every root in the config in turn. A root that fails is reported, and does not stop the other roots.
+
+    :param args: User-specified arguments, which apply to every root unless its entry in the config overrides them.
+    :param config_path: The path to the JSON config file.
+    :return: A summary per root, with the number of documented modules, the output file, the wall time and an error
+        message (empty if the root was documented).
+    """
+    results = []
+    for entry in load_config(config_path):
+        root = entry["root"]
+        parsed = root_args(args, entry)
+        output_file_name = check_md_file(parsed.output_file_name)
+        imported = set(sys.modules)
+        start = time.perf_counter()
+        modules, error = [], ""
+        try:
+            with timings.phase("discovery"):
+                modules = identify_modules(parsed, root)
+            modules = generate_markdown_file(parsed, modules, output_file_name, root)
+        except SystemExit:
+            # Module discovery exits when the (selected) modules cannot be found; the reason has been reported.
+            error = "no modules documented"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            _forget_root_modules(root, imported)
+        results.append(
+            {
+                "root": root,
+                "modules": len(modules) if not error else 0,
+                "output_file_name": output_file_name,
+                "seconds": time.perf_counter() - start,
+                "error": error,
+            }
+        )
+
+    console.secho("\nBatch summary: \n-------------------", bold=True)
+    for result in results:
+        if result["error"]:
+            console.secho(f" - {result['root']}: failed ({result['error']})", bold=True, fg="red")
+        else:
+            console.secho(
+                f" - {result['root']}: {result['modules']} modules in {result['seconds']:.2f} s "
+                f"-> {result['output_file_name']}",
+                bold=True,
+            )
+    return results
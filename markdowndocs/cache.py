@@ -0,0 +1,127 @@
+"""
+Persistent cache for extracted module objects.
+
+Entries are keyed by the content hash of the module source, the root directory of the module, the markdowndocs version
+and the options that affect the extracted objects, so that unchanged modules do not need to be imported and inspected
+again. Entries are stored in the JSONL record format of jsonl.py, so that loading an entry never executes code, unlike
+unpickling.
+"""
+
+import hashlib
+import os
+import shutil
+from typing import Optional
+
+from markdowndocs import constants as c
+from markdowndocs import jsonl
+from markdowndocs import version
+from markdowndocs.constants import MarkDownModuleObject, Module
+from markdowndocs.incremental import hash_source
+
+
+def cache_key(mod: Module, path: str, args, source_hash: Optional[str] = None) -> str:
+    """
+    Cache key.
+
+    :param mod: The module that will be processed.
+    :param path: The path to the module source file.
+    :param args: argparse.Namespace from the CLI.
+    :param source_hash: The hash of the module source (as computed by incremental.hash_source); the source file is
+        hashed if None.
+    :return: A hex digest identifying the extracted module object.
+    """
+    digest = hashlib.sha256()
+    # The same module name can refer to a different module in another root, or when imported as part of its package.
+    options = [args.exclude_code, args.exclude_dependencies, args.static, args.package_imports]
+    for part in [version, c.CACHE.FORMAT, mod.name, os.path.realpath(mod.root), *options]:
+        digest.update(f"{part}\0".encode())
+    digest.update((source_hash or hash_source(path)).encode())
+    return digest.hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    """
+    Entry path.
+
+    :param key: A cache key.
+    :return: The path of the cache entry.
+    """
+    return os.path.join(c.CACHE.DIRECTORY, key + c.CACHE.SUFFIX)
+
+
+def contains(key: str) -> bool:
+    """
+    Check whether the cache holds an entry for a key.
+
+    :param key: A cache key.
+    :return: True if there is an entry for the key.
+    """
+    return os.path.isfile(_entry_path(key))
+
+
+def load(key: str) -> Optional[MarkDownModuleObject]:
+    """
+    Load a module object from the cache.
+
+    Marks the entry as recently used, so that it is evicted last.
+
+    :param key: A cache key.
+    :return: The cached object, or None if there is no (readable) entry for the key.
+    """
+    entry_path = _entry_path(key)
+    try:
+        markdown_module_objects = list(jsonl.read_jsonl(entry_path))
+        os.utime(entry_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return markdown_module_objects[0] if len(markdown_module_objects) == 1 else None
+
+
+def store(key: str, markdown_module_object: MarkDownModuleObject) -> None:
+    """
+    Store a module object in the cache.
+
+    The entry is written to a temporary file first (see jsonl.open_jsonl), so that concurrent runs never read partially
+    written entries.
+
+    :param key: A cache key.
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    """
+    os.makedirs(c.CACHE.DIRECTORY, exist_ok=True)
+    jsonl.write_jsonl(_entry_path(key), [markdown_module_object])
+
+
+def evict(max_size: int = c.CACHE.MAX_SIZE_BYTES) -> None:
+    """
+    Evict the least recently used entries until the cache fits within max_size bytes.
+
+    :param max_size: The maximum total size of the cache entries, in bytes.
+    """
+    if not os.path.isdir(c.CACHE.DIRECTORY):
+        return
+
+    entries = []
+    with os.scandir(c.CACHE.DIRECTORY) as it:
+        for entry in it:
+            if entry.name.endswith(c.CACHE.SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
+def clear_cache() -> None:
+    """
+    Clear cache.
+
+    Removes all cached module objects.
+    """
+    shutil.rmtree(c.CACHE.DIRECTORY, ignore_errors=True)
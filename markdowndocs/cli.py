@@ -1,10 +1,21 @@
 import argparse
+import sys
 
-import typer
-
+from markdowndocs import console
 from markdowndocs import constants as c
+from markdowndocs import timings
 from markdowndocs import version
-from markdowndocs.mddocs import check_md_file, generate_markdown_file, identify_modules
+from markdowndocs.batch import run_batch
+from markdowndocs.cache import clear_cache
+from markdowndocs.mddocs import (
+    check_markdown_file,
+    check_md_file,
+    generate_markdown_file,
+    generate_markdown_file_from_jsonl,
+    identify_modules,
+)
+from markdowndocs.source_index import SourceChangedError
+from markdowndocs.watch import watch
 
 
 def set_up_parser() -> argparse.ArgumentParser:
@@ -41,6 +52,176 @@ def set_up_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="If enabled, excludes the source code for each function." "\n[default: False]",
     )
+    add_arg(
+        "--static",
+        action="store_true",
+        help="If enabled, extracts docstrings and source code by parsing the source files instead of importing the "
+        "modules. Modules that cannot be parsed are imported instead."
+        "\n[default: False]",
+    )
+    add_arg(
+        "--jobs",
+        metavar="N",
+        type=int,
+        help="Number of worker processes used to extract the documentation of the modules. Use 0 to start one worker "
+        "per CPU.\n[default: 1]",
+        default=1,
+    )
+    add_arg(
+        "--templates",
+        metavar="FILE",
+        help="A JSON file that maps template names to templates, to change the layout of the generated markdown. "
+        "Templates that are not in the file keep their defaults (see markdowndocs/templates.py).",
+        default=None,
+    )
+    add_arg(
+        "--render-threads",
+        metavar="N",
+        type=int,
+        help="Number of threads that render the documentation of the modules while later modules are extracted. Use 0 "
+        "to render in the main thread.\n[default: one per CPU on free-threaded Python builds, 1 if the modules are "
+        "extracted in worker processes (with --jobs or --isolate), and 0 otherwise]",
+        default=None,
+    )
+    add_arg(
+        "--no-cache",
+        action="store_true",
+        help=f"If enabled, neither reads from nor writes to the cache of extracted modules in {c.CACHE.DIRECTORY}."
+        "\n[default: False]",
+    )
+    add_arg(
+        "--clear-cache",
+        action="store_true",
+        help="If enabled, removes all entries from the cache of extracted modules before processing.\n[default: False]",
+    )
+    add_arg(
+        "--incremental",
+        action="store_true",
+        help="If enabled, only re-renders the modules whose source changed since the previous run and updates their "
+        "sections in the existing output file. Section boundaries and source hashes are recorded on every run in a "
+        f"hidden manifest next to the output file (.<output file name>{c.FILE.MANIFEST_SUFFIX})."
+        "\n[default: False]",
+    )
+    add_arg(
+        "--check",
+        action="store_true",
+        help="If enabled, checks that the output file is up to date without writing it, and exits with status 1 if it "
+        "is not, listing the stale modules. Only the modules whose source changed since the output was generated are "
+        "extracted.\n[default: False]",
+    )
+    add_arg(
+        "--watch",
+        action="store_true",
+        help="If enabled, keeps running after generating the documentation and incrementally regenerates it whenever "
+        "one of the documented modules changes.\n[default: False]",
+    )
+    add_arg(
+        "--recursive",
+        action="store_true",
+        help="If enabled, looks for modules in all subdirectories of your working directory, instead of only one "
+        "level deep.\n[default: False]",
+    )
+    add_arg(
+        "--exclude-paths",
+        metavar="PATTERN",
+        nargs="+",
+        type=str,
+        help="Use this option to skip files and directories that match .gitignore-style patterns (e.g. 'vendor/' or "
+        f"'docs/**/*.py'). The following directories are always skipped: {' '.join(c.DISCOVERY.DEFAULT_EXCLUDES)}",
+    )
+    add_arg(
+        "--exclude-from",
+        metavar="FILE",
+        type=str,
+        help="Use this option to skip files and directories that match the patterns in a .gitignore-style file "
+        "(e.g. .gitignore).",
+    )
+    add_arg(
+        "--include-paths",
+        metavar="PATTERN",
+        nargs="+",
+        type=str,
+        help="Use this option to only include modules whose path matches one of the .gitignore-style patterns (e.g. "
+        "'src/*.py' for the modules directly in src, or 'src/**' for all modules in src and its subdirectories).",
+    )
+    add_arg(
+        "--isolate",
+        action="store_true",
+        help="If enabled, imports every module in a separate worker process. Modules that fail to import, crash the "
+        "worker or exceed the timeout are reported as errors and left out of the documentation.\n[default: False]",
+    )
+    add_arg(
+        "--timeout",
+        metavar="SECONDS",
+        type=float,
+        help="The maximum time to spend on a single module when --isolate is enabled."
+        f"\n[default: {c.ISOLATION.TIMEOUT:g}]",
+        default=c.ISOLATION.TIMEOUT,
+    )
+    add_arg(
+        "--memory-limit",
+        metavar="MB",
+        type=int,
+        help="The maximum memory (address space) of each worker process when --isolate is enabled. Only supported on "
+        "POSIX systems.\n[default: no limit]",
+    )
+    add_arg(
+        "--package-imports",
+        action="store_true",
+        help="If enabled, imports modules by their dotted name (e.g. package.module) instead of loading them from their "
+        "file, so that every module is executed only once, even if other modules import it.\n[default: False]",
+    )
+    add_arg(
+        "--split",
+        action="store_true",
+        help="If enabled, documents every module in a separate file (in a directory named after the output file), and "
+        "writes an index with links to these files to the output file. Files whose content did not change are not "
+        "rewritten.\n[default: False]",
+    )
+    add_arg(
+        "--jsonl",
+        metavar="FILE",
+        type=str,
+        help="Use this option to also export the documentation model to a JSONL file, with one record per module, "
+        "class and function.",
+    )
+    add_arg(
+        "--since",
+        metavar="REF",
+        type=str,
+        help="Only extract the modules whose source files changed since a git ref (e.g. origin/main), according to the "
+        "local git repository. The other modules are taken from the previous JSONL export (see --jsonl) if they did not "
+        "change since it was exported, or else from the cache. Requires --jsonl.",
+    )
+    add_arg(
+        "--timings",
+        action="store_true",
+        help="If enabled, reports the time spent in each phase of the run (discovery, import, inspection, source "
+        "extraction, rendering and writing), and the slowest modules.\n[default: False]",
+    )
+    add_arg(
+        "--timings-output",
+        metavar="FILE",
+        type=str,
+        help="Use this option to save the timings (per phase and per module, including the growth of the peak memory "
+        "use) as a JSON report. Implies --timings.",
+    )
+    add_arg(
+        "--profile",
+        metavar="FILE",
+        type=str,
+        help="Use this option to profile the run with cProfile and save the statistics to a file that can be inspected "
+        "with pstats (e.g. python -m pstats FILE).",
+    )
+    add_arg(
+        "--io-concurrency",
+        metavar="N",
+        type=int,
+        help="The number of filesystem operations (directory listings, source hashing, cache reads and output writes) "
+        "that run concurrently. Use a higher number (e.g. 16) on network-mounted volumes, where every operation is a "
+        "round-trip.\n[default: 1]",
+        default=1,
+    )
     add_arg(
         "--version",
         action="version",
@@ -72,6 +253,21 @@ def set_up_parser() -> argparse.ArgumentParser:
         type=str,
         help="Use this option to exclude a specific module or multiple modules from the documentation generator",
     )
+    group.add_argument(
+        "--from-jsonl",
+        metavar="FILE",
+        type=str,
+        help="Use this option to generate documentation from a JSONL export (see --jsonl) instead of from the modules in "
+        "your current working directory",
+    )
+    group.add_argument(
+        "--batch",
+        metavar="CONFIG",
+        type=str,
+        help="Use this option to document the modules in several root directories in one run. CONFIG is a JSON file "
+        "that lists the roots, each with its own output file name and options (see the README); options that a root "
+        "does not set are taken from the command line",
+    )
     return parser
 
 
@@ -83,23 +279,97 @@ def main(_args=None) -> None:
     """
     parser = set_up_parser()
     args = _args or parser.parse_args()
+    if args.batch and args.watch:
+        parser.error("--watch cannot be combined with --batch")
+    if args.check and (args.watch or args.batch or args.from_jsonl):
+        parser.error("--check cannot be combined with --watch, --batch or --from-jsonl")
+    if args.since and not (args.jsonl or args.batch):
+        parser.error("--since requires --jsonl, to take the unchanged modules from the previous export")
+    if args.jobs < 0 or (args.render_threads is not None and args.render_threads < 0):
+        parser.error("--jobs and --render-threads cannot be negative")
+    if args.io_concurrency < 1:
+        parser.error("--io-concurrency must be at least 1")
+
+    profiler, recorder = None, None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.timings or args.timings_output:
+        recorder = timings.enable()
+
+    try:
+        _run(args)
+    except SourceChangedError as e:
+        # Source code is read when it is rendered; a module that is saved in the meantime cannot be documented.
+        console.secho(f"\n{e}", bold=True, fg="red", err=True)
+        sys.exit(1)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            console.secho(f"Profile statistics: {args.profile}", bold=True)
+        if recorder:
+            timings.disable()
+            console.secho(f"\n{recorder.summary()}", bold=True)
+            if args.timings_output:
+                recorder.save(args.timings_output)
+                console.secho(f"Timings report: {args.timings_output}", bold=True)
+
+
+def _run(args) -> None:
+    """
+    Run the documentation generator.
+
+    :param args: parser arguments.
+    """
+    if args.clear_cache:
+        clear_cache()
+
+    if args.batch:
+        if any(result["error"] for result in run_batch(args, args.batch)):
+            sys.exit(1)
+        return
 
-    # Process modules in directory / user-supplied module.
-    modules = identify_modules(args)
     output_file_name = check_md_file(args.output_file_name)
-    generate_markdown_file(args=args, modules=modules, output_file_name=output_file_name)
+    if args.check:
+        with timings.phase("discovery"):
+            modules = identify_modules(args)
+        stale = check_markdown_file(args, modules, output_file_name)
+        if stale:
+            prefix = "\n - "
+            console.secho(f"Out of date: {prefix}{prefix.join(stale)}", bold=True, fg="red")
+            sys.exit(1)
+        console.secho(f"{output_file_name} is up to date.", bold=True)
+        return
+
+    if args.watch:
+        try:
+            watch(args, output_file_name)
+        except KeyboardInterrupt:
+            console.secho("\nStopped watching.", bold=True)
+        return
+
+    if args.from_jsonl:
+        module_names = generate_markdown_file_from_jsonl(args.from_jsonl, output_file_name, args.templates)
+    else:
+        # Process modules in directory / user-supplied module.
+        with timings.phase("discovery"):
+            modules = identify_modules(args)
+        modules = generate_markdown_file(args=args, modules=modules, output_file_name=output_file_name)
+        module_names = [mod.name for mod in modules]
 
     prefix = "\n -"
-    typer.secho(
+    console.secho(
         f"\n"
         f"Processed modules: "
         f"\n-------------------\n"
-        f"\n -{prefix.join([mod.name for mod in modules])}\n"
+        f"\n -{prefix.join(module_names)}\n"
         f"\n-------------------\n"
         f"Output file: {output_file_name}",
         bold=True,
     )
-    typer.Exit()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+"""
+Lightweight terminal output.
+
+A minimal replacement for typer.secho, so that the CLI does not need to import a CLI framework just to print messages.
+"""
+
+import sys
+from typing import Optional
+
+COLORS = {"red": 31, "green": 32, "yellow": 33, "blue": 34}
+
+
+def secho(message: str, bold: bool = False, fg: Optional[str] = None, err: bool = False) -> None:
+    """
+    Print a (styled) message.
+
+    Styles are only applied when printing to a terminal.
+
+    :param message: The message to print.
+    :param bold: If true, prints the message in bold.
+    :param fg: The name of the foreground color (one of COLORS).
+    :param err: If true, prints to stderr instead of stdout.
+    """
+    stream = sys.stderr if err else sys.stdout
+    codes = ([1] if bold else []) + ([COLORS[fg]] if fg else [])
+    if codes and stream.isatty():
+        message = f"\033[{';'.join(map(str, codes))}m{message}\033[0m"
+    print(message, file=stream, flush=True)
@@ -1,5 +1,9 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Union
+
+if TYPE_CHECKING:
+    from markdowndocs.source_index import SourceSegment
 
 
 class FILE:
@@ -11,36 +15,150 @@ class FILE:
     NAVIGATION = "&uparrow; Back to"
     DOCUMENTATION_REF = "\n## Code documentation\n[Code documentation](code_documentation.md)"
     PACKAGE_NAME = "markdowndocs"
+    MANIFEST_SUFFIX = ".manifest.json"
+    SPLIT_MANIFEST_SUFFIX = ".files.json"
+
+
+class CACHE:
+    """Constants for the on-disk cache of extracted module objects"""
+
+    DIRECTORY = ".markdowndocs_cache"
+    SUFFIX = ".jsonl"
+    # Bumped whenever the layout of the cached objects changes.
+    FORMAT = 3
+    MAX_SIZE_BYTES = 64 * 1024 * 1024
+
+
+class DISCOVERY:
+    """Constants for module discovery"""
+
+    # gitignore-style patterns for directories that are never descended into.
+    DEFAULT_EXCLUDES = [".*/", "__pycache__/", "venv/", "node_modules/", "*.egg-info/"]
+
+
+class SOURCE:
+    """Constants for reading module source files"""
+
+    # The number of source files that are kept in memory to materialize the source code of functions.
+    BUFFER_CACHE_SIZE = 4
+
+
+class ISOLATION:
+    """Constants for isolated module import workers"""
+
+    TIMEOUT = 60.0
+
+
+class JSONL:
+    """Constants for the JSONL export of the documentation model"""
+
+    SCHEMA_VERSION = 1
+
+
+class PIPELINE:
+    """Constants for the streaming pipeline from extraction to output"""
+
+    # The number of modules per job that are extracted ahead of the module that is being rendered.
+    WINDOW_PER_JOB = 2
+    # The number of modules that a worker process imports by name at a time.
+    PACKAGE_CHUNK_SIZE = 8
+    # The number of characters that are copied at a time from spooled or previously generated markdown.
+    READ_SIZE = 64 * 1024
+
+
+class IO:
+    """Constants for concurrent file I/O"""
+
+    # The maximum number of items that a thread handles in one go.
+    BATCH_SIZE = 64
+    # The number of items whose results are gathered at a time when results are consumed one by one.
+    WINDOW = 64
+
+
+class BATCH:
+    """Constants for batch mode"""
+
+    # The options that can be set for every root in a batch config; the other options are taken from the command line.
+    OPTIONS = [
+        "output_file_name",
+        "module_names",
+        "exclude_modules",
+        "exclude_paths",
+        "exclude_from",
+        "include_paths",
+        "recursive",
+        "exclude_code",
+        "exclude_dependencies",
+        "static",
+        "package_imports",
+        "split",
+        "incremental",
+        "jsonl",
+        "add_to_readme",
+    ]
+    # Options that hold paths, which are relative to the root.
+    PATH_OPTIONS = ["output_file_name", "exclude_from", "jsonl"]
+
+
+class WATCH:
+    """Constants for watch mode"""
+
+    POLL_INTERVAL = 0.5
+    DEBOUNCE = 0.3
+
+
+# The documentation objects below are created for every function, class and module, so they use __slots__ instead of
+# a __dict__, and intern their names.
 
 
 @dataclass
 class FunctionObject:
-    """A FunctionObject object"""
+    """A FunctionObject object (the code may be a SourceSegment, which is materialized when rendered)"""
 
+    __slots__ = ("function_name", "function_description", "code")
     function_name: str
     function_description: Optional[str]
-    code: Optional[str]
+    code: Optional[Union[str, "SourceSegment"]]
+
+    def __post_init__(self):
+        self.function_name = sys.intern(self.function_name)
 
 
 @dataclass
 class MarkdownClassObject:
     """A MarkdownFunctionObject object"""
 
+    __slots__ = ("class_name", "class_description", "function_objects")
     class_name: str
     class_description: str
     function_objects: List[FunctionObject]
 
+    def __post_init__(self):
+        self.class_name = sys.intern(self.class_name)
+
 
 @dataclass
 class MarkDownModuleObject:
     """A MarkdownFunctionObject object"""
 
+    __slots__ = (
+        "module",
+        "module_description",
+        "dependencies",
+        "function_markdown_objects",
+        "class_markdown_objects",
+    )
     module: str
     module_description: Optional[str]
     dependencies: Optional[List[str]]
     function_markdown_objects: List[FunctionObject]
     class_markdown_objects: List[MarkdownClassObject]
 
+    def __post_init__(self):
+        self.module = sys.intern(self.module)
+        if self.dependencies:
+            self.dependencies = [sys.intern(dependency) for dependency in self.dependencies]
+
 
 @dataclass
 class Module:
@@ -48,3 +166,5 @@ class Module:
 
     name: str
     path: str
+    # The directory that the module name is relative to, and from which the module is imported.
+    root: str = "."
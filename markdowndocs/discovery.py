@@ -0,0 +1,172 @@
+"""
+Discovery of Python modules.
+
+Walks the working directory with os.scandir, level by level, pruning excluded directories before they are descended
+into. Exclude patterns follow .gitignore syntax: a trailing slash only matches directories, a pattern that contains a
+slash is anchored to the working directory, wildcards do not match slashes (except for "**", which matches any number
+of directories), and a leading exclamation mark re-includes paths that were excluded by an earlier pattern. Include
+patterns are matched in the same way (without negation).
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+from markdowndocs import async_io
+
+
+def read_patterns(path: str) -> List[str]:
+    """
+    Read patterns.
+
+    :param path: The path to a .gitignore-style file.
+    :return: The patterns in the file, without comments and blank lines.
+    """
+    with open(path, "r") as pattern_file:
+        lines = [line.strip() for line in pattern_file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> Pattern:
+    """
+    Compile a .gitignore-style pattern into a regular expression.
+
+    :param pattern: A pattern without the leading exclamation mark, the leading slash and the trailing slash.
+    :return: A regular expression that matches the (complete) slash-separated paths that the pattern matches.
+    """
+    regex, i = [], 0
+    while i < len(pattern):
+        at_segment_start = i == 0 or pattern[i - 1] == "/"
+        if at_segment_start and pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif at_segment_start and pattern[i:] == "**":
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            chars = pattern[i + 1 : end].replace("\\", "\\\\")
+            if chars[0] in "!^":
+                chars = "^" + chars[1:]
+            # Like the other wildcards, a character class does not match slashes.
+            regex.append(f"(?!/)[{chars}]")
+            i = end + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(regex), re.DOTALL)
+
+
+def _match(pattern: str, rel_path: str, is_dir: bool) -> bool:
+    """
+    Match a single .gitignore-style pattern.
+
+    :param pattern: A pattern without the leading exclamation mark.
+    :param rel_path: A slash-separated path relative to the working directory.
+    :param is_dir: Whether the path refers to a directory.
+    :return: True if the pattern matches the path.
+    """
+    if pattern.endswith("/"):
+        if not is_dir:
+            return False
+        pattern = pattern.rstrip("/")
+
+    if "/" in pattern:
+        return _compile(pattern.lstrip("/")).fullmatch(rel_path) is not None
+    return _compile(pattern).fullmatch(rel_path.rsplit("/", 1)[-1]) is not None
+
+
+def is_excluded(rel_path: str, is_dir: bool, patterns: List[str]) -> bool:
+    """
+    Check whether a path is excluded; the last matching pattern decides.
+
+    :param rel_path: A slash-separated path relative to the working directory.
+    :param is_dir: Whether the path refers to a directory.
+    :param patterns: A list of .gitignore-style patterns.
+    :return: True if the path is excluded.
+    """
+    excluded = False
+    for pattern in patterns:
+        negated = pattern.startswith("!")
+        if excluded == negated and _match(pattern[1:] if negated else pattern, rel_path, is_dir):
+            excluded = not negated
+    return excluded
+
+
+def _list_directory(
+    root: str, rel_dir: str, descend: bool, exclude: List[str], include: Optional[List[str]]
+) -> Tuple[List[str], List[str]]:
+    """
+    List a directory.
+
+    :param root: The directory that is walked.
+    :param rel_dir: The slash-separated path of the directory relative to root.
+    :param descend: Whether the subdirectories of the directory are walked.
+    :param exclude: .gitignore-style patterns for files and directories to skip.
+    :param include: .gitignore-style patterns that (relative) file paths need to match; all files are included if None.
+    :return: The relative paths of the Python files and of the subdirectories to walk, sorted by name.
+    """
+    with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    files, subdirs = [], []
+    for entry in entries:
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if descend and not is_excluded(rel_path, True, exclude):
+                subdirs.append(rel_path)
+        elif (
+            entry.name.endswith(".py")
+            and not entry.name.endswith("__.py")
+            and not is_excluded(rel_path, False, exclude)
+            and (not include or any(_match(pattern, rel_path, False) for pattern in include))
+        ):
+            files.append(rel_path)
+    return files, subdirs
+
+
+def iter_python_files(
+    root: str = ".",
+    max_depth: Optional[int] = 1,
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+    concurrency: int = 1,
+) -> Iterator[str]:
+    """
+    Iterate over the Python files in a directory tree.
+
+    Files in a directory are yielded (sorted by name) before the files in its subdirectories. Dunder files such as
+    __init__.py are skipped, and symbolic links to directories are not followed. The directories at the same depth
+    are listed concurrently.
+
+    :param root: The directory to walk.
+    :param max_depth: The number of directory levels below root to descend into (unlimited if None).
+    :param exclude: .gitignore-style patterns for files and directories to skip.
+    :param include: .gitignore-style patterns that (relative) file paths need to match; all files are included if None.
+    :param concurrency: The maximum number of directories that are listed at the same time.
+    :return: An iterator over slash-separated file paths relative to root.
+    """
+    exclude = exclude or []
+    listings = {}
+    level, depth = [""], 0
+    while level:
+        descend = max_depth is None or depth < max_depth
+        listed = async_io.gather(
+            lambda rel_dir: _list_directory(root, rel_dir, descend, exclude, include), level, concurrency
+        )
+        listings.update(zip(level, listed))
+        level, depth = [subdir for _, subdirs in listed for subdir in subdirs], depth + 1
+
+    stack = [""]
+    while stack:
+        files, subdirs = listings[stack.pop()]
+        yield from files
+        stack += reversed(subdirs)
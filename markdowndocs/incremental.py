@@ -0,0 +1,255 @@
+"""
+Sidecar manifests for incremental regeneration and check mode.
+
+The manifest records, for every module, the hash of its source and the lengths of its index entries and its section in
+the generated markdown file, so that a later run only needs to re-render the modules whose source changed and can splice
+the result into the existing file, while copying the parts of the other modules from it. In split mode, the manifest
+records the files that were generated and, for every module, the hashes of its source, its file and its index entries.
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from markdowndocs import constants as c
+from markdowndocs import version
+
+
+def manifest_path(output_file_name: str, suffix: str = c.FILE.MANIFEST_SUFFIX) -> str:
+    """
+    Manifest path.
+
+    :param output_file_name: The output file name for the .md file.
+    :param suffix: The suffix of the manifest file name.
+    :return: The path of the (hidden) manifest next to the output file.
+    """
+    directory, name = os.path.split(output_file_name)
+    return os.path.join(directory, f".{name}{suffix}")
+
+
+def hash_source(path: str) -> str:
+    """
+    Hash source.
+
+    :param path: The path to a module source file.
+    :return: The sha256 hex digest of the file contents.
+    """
+    with open(path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def manifest_options(args) -> dict:
+    """
+    Manifest options.
+
+    :param args: argparse.Namespace from the CLI.
+    :return: The version and options that affect the generated markdown.
+    """
+    return {
+        "version": version,
+        "exclude_code": args.exclude_code,
+        "exclude_dependencies": args.exclude_dependencies,
+        "static": args.static,
+        "templates": hash_source(args.templates) if args.templates else None,
+    }
+
+
+def build_manifest(
+    args,
+    module_names: List[str],
+    source_hashes: List[str],
+    header_length: int,
+    index_lengths: List[int],
+    section_lengths: List[int],
+    output_hash: str,
+) -> dict:
+    """
+    Build manifest.
+
+    :param args: argparse.Namespace from the CLI.
+    :param module_names: The names of the documented modules, in output order.
+    :param source_hashes: The source hashes of the documented modules.
+    :param header_length: The length of the markdown header of the file.
+    :param index_lengths: The length of the index entries of each module.
+    :param section_lengths: The length of the markdown section of each module.
+    :param output_hash: The hash of the generated markdown file.
+    :return: A JSON-serializable manifest.
+    """
+    return {
+        "options": manifest_options(args),
+        "output_hash": output_hash,
+        "header_length": header_length,
+        "modules": [
+            {"name": name, "source_hash": source_hash, "index_length": index_length, "section_length": section_length}
+            for name, source_hash, index_length, section_length in zip(
+                module_names, source_hashes, index_lengths, section_lengths
+            )
+        ],
+    }
+
+
+def load_manifest(output_file_name: str) -> Optional[dict]:
+    """
+    Load manifest.
+
+    :param output_file_name: The output file name for the .md file.
+    :return: The manifest, or None if there is no readable manifest.
+    """
+    try:
+        with open(manifest_path(output_file_name), "r") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(output_file_name: str, manifest: dict) -> None:
+    """
+    Save manifest.
+
+    :param output_file_name: The output file name for the .md file.
+    :param manifest: A manifest created with build_manifest.
+    """
+    with open(manifest_path(output_file_name), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1)
+
+
+def hash_output(output_file_name: str) -> str:
+    """
+    Hash output.
+
+    The file is hashed in chunks, so that it is never held in memory as a whole.
+
+    :param output_file_name: The output file name for the .md file.
+    :return: The sha256 hex digest of the utf-8 encoded text of the file (as computed by md_utils.MarkdownWriter).
+    """
+    digest = hashlib.sha256()
+    with open(output_file_name, "r") as doc:
+        for chunk in iter(lambda: doc.read(c.PIPELINE.READ_SIZE), ""):
+            digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def matches_output(manifest: Optional[dict], args, module_names: List[str], output_file_name: str) -> bool:
+    """
+    Check that a manifest describes the existing output file.
+
+    :param manifest: The manifest of the previous run.
+    :param args: argparse.Namespace from the CLI.
+    :param module_names: The names of the modules that will be documented, in output order.
+    :param output_file_name: The output file name for the .md file.
+    :return: True if the existing file can be updated by splicing in the parts of the changed modules, False if it needs
+        to be regenerated in full.
+    """
+    if (
+        not manifest
+        or manifest.get("options") != manifest_options(args)
+        or [m["name"] for m in manifest["modules"]] != module_names
+    ):
+        return False
+
+    try:
+        return hash_output(output_file_name) == manifest["output_hash"]
+    except OSError:
+        return False
+
+
+def hash_text(text: str) -> str:
+    """
+    Hash text.
+
+    :param text: A string.
+    :return: The sha256 hex digest of the utf-8 encoded text (as computed by hash_output for a file that holds the text).
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_split_manifest(
+    args,
+    files: List[str],
+    module_names: List[str],
+    source_hashes: List[str],
+    file_hashes: List[str],
+    index_hashes: List[str],
+    output_hash: str,
+) -> dict:
+    """
+    Build the manifest of split mode.
+
+    :param args: argparse.Namespace from the CLI.
+    :param files: The paths of the files of the documented modules, relative to the directory that holds them.
+    :param module_names: The names of the documented modules, in output order.
+    :param source_hashes: The source hashes of the documented modules.
+    :param file_hashes: The hashes of the files of the documented modules.
+    :param index_hashes: The hashes of the index entries of the documented modules.
+    :param output_hash: The hash of the index file.
+    :return: A JSON-serializable manifest.
+    """
+    return {
+        "version": version,
+        "options": manifest_options(args),
+        "output_hash": output_hash,
+        "files": files,
+        "modules": [
+            {"name": name, "source_hash": source_hash, "file_hash": file_hash, "index_hash": index_hash}
+            for name, source_hash, file_hash, index_hash in zip(module_names, source_hashes, file_hashes, index_hashes)
+        ],
+    }
+
+
+def split_manifest_modules(manifest: Optional[dict], args, module_names: List[str]) -> Optional[List[dict]]:
+    """
+    Check that a manifest of split mode describes the modules.
+
+    :param manifest: The manifest of the previous run in split mode.
+    :param args: argparse.Namespace from the CLI.
+    :param module_names: The names of the modules that will be documented, in output order.
+    :return: The recorded hashes of every module (see build_split_manifest), or None if the manifest does not describe
+        the modules with the current options.
+    """
+    if not manifest or manifest.get("options") != manifest_options(args):
+        return None
+    modules = manifest.get("modules")
+    if not isinstance(modules, list) or not all(isinstance(m, dict) for m in modules):
+        return None
+    if [m.get("name") for m in modules] != module_names:
+        return None
+    return modules
+
+
+def load_split_manifest(output_file_name: str) -> Optional[dict]:
+    """
+    Load the manifest of split mode.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :return: The manifest, or None if there is no readable manifest.
+    """
+    try:
+        with open(manifest_path(output_file_name, c.FILE.SPLIT_MANIFEST_SUFFIX), "r") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def save_split_manifest(output_file_name: str, manifest: dict) -> None:
+    """
+    Save the manifest of split mode.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :param manifest: A manifest created with build_split_manifest.
+    """
+    with open(manifest_path(output_file_name, c.FILE.SPLIT_MANIFEST_SUFFIX), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1)
+
+
+def load_generated_files(output_file_name: str) -> List[str]:
+    """
+    Load the list of files that were generated in split mode.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :return: The paths of the files of the modules that the previous run generated, relative to the directory that holds
+        them; empty if there is no readable list.
+    """
+    files = (load_split_manifest(output_file_name) or {}).get("files")
+    return [path for path in files if isinstance(path, str)] if isinstance(files, list) else []
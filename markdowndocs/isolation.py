@@ -0,0 +1,173 @@
+"""
+Isolated module import workers.
+
+Imports and inspects modules in reusable subprocesses, so that modules with slow or crashing import-time side effects
+are reported as per-module errors instead of stalling or taking down the whole run. Each module is subject to a timeout,
+and the address space of the workers can be capped.
+"""
+
+import multiprocessing
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+
+from markdowndocs.constants import MarkDownModuleObject, Module
+
+
+def _context():
+    """
+    Multiprocessing context for the workers.
+
+    Workers are (re)started from the threads of the pool in isolated_workers, and forking a multithreaded process may
+    deadlock the child. They are started from a single-threaded fork server instead, or spawned where fork servers are
+    not supported.
+
+    :return: A multiprocessing context.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _worker_main(conn, memory_limit: Optional[int]) -> None:
+    """
+    Worker main loop.
+
+    Receives (module, args) tuples and sends back ("ok", MarkDownModuleObject) or ("error", message) tuples, until it
+    receives None.
+
+    :param conn: The worker end of a multiprocessing pipe.
+    :param memory_limit: The maximum address space of the worker, in bytes (unlimited if None).
+    """
+    if memory_limit:
+        try:
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    from markdowndocs.mddocs import extract_module
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        mod, args = task
+        try:
+            conn.send(("ok", extract_module(mod, args)))
+        except BaseException as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class ModuleWorker:
+    """
+    Module worker.
+
+    A subprocess that extracts modules one at a time. The subprocess is reused across modules, and replaced when it
+    crashes or exceeds the timeout.
+    """
+
+    def __init__(self, memory_limit: Optional[int] = None):
+        """
+        Initialize the worker.
+
+        :param memory_limit: The maximum address space of the worker, in bytes (unlimited if None).
+        """
+        self.memory_limit = memory_limit
+        self.process, self.conn = None, None
+
+    def _start(self) -> None:
+        """
+        Start the subprocess.
+        """
+        context = _context()
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, self.memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self) -> None:
+        """
+        Stop the subprocess (if running).
+        """
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process, self.conn = None, None
+
+    def _kill(self) -> None:
+        """
+        Kill the subprocess, so that a fresh one is started for the next module.
+        """
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.process, self.conn = None, None
+
+    def extract(self, mod: Module, args, timeout: Optional[float]) -> Tuple[Optional[MarkDownModuleObject], str]:
+        """
+        Extract a module in the subprocess.
+
+        :param mod: The module that will be processed.
+        :param args: argparse.Namespace from the CLI.
+        :param timeout: The maximum time (in seconds) to wait for the module (unlimited if None).
+        :return: The extracted object and an empty string, or None and an error message.
+        """
+        if self.process is None:
+            self._start()
+
+        self.conn.send((mod, args))
+        if not self.conn.poll(timeout):
+            self._kill()
+            return None, f"timed out after {timeout:g} seconds"
+
+        try:
+            status, result = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(timeout=1)
+            exitcode = self.process.exitcode
+            self._kill()
+            return None, f"worker process exited unexpectedly (exit code {exitcode})"
+
+        return (result, "") if status == "ok" else (None, result)
+
+
+@contextmanager
+def isolated_workers(args, jobs: int = 1) -> Iterator[Callable[[Module], Future]]:
+    """
+    Start a pool of isolated worker processes.
+
+    Workers are reused for consecutive modules, and stopped when the context exits.
+
+    :param args: argparse.Namespace from the CLI.
+    :param jobs: The number of worker processes.
+    :return: A function that submits a module for extraction, and returns a future of the extracted object (None if the
+        module failed) and an error message (empty if the module succeeded).
+    """
+    memory_limit = args.memory_limit * 1024 * 1024 if args.memory_limit else None
+    workers = queue.Queue()
+    for _ in range(max(1, jobs)):
+        workers.put(ModuleWorker(memory_limit))
+
+    def extract(mod: Module) -> Tuple[Optional[MarkDownModuleObject], str]:
+        worker = workers.get()
+        try:
+            return worker.extract(mod, args, args.timeout)
+        finally:
+            workers.put(worker)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers.qsize()) as executor:
+            yield lambda mod: executor.submit(extract, mod)
+    finally:
+        while not workers.empty():
+            workers.get().stop()
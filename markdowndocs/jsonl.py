@@ -0,0 +1,213 @@
+"""
+JSONL export and import of the documentation model.
+
+Every module, class and function is exported as a separate JSON record on its own line, so that the extraction
+results can be consumed (e.g. by a search indexer) without parsing the markdown output. Records carry the names of
+the module (and class) they belong to, and are written in document order: a module record is followed by the records
+of its classes (each followed by the records of its methods), and then by the records of its functions. The first line
+holds a header record with the schema version and the options that the modules were extracted with.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, Set
+
+from markdowndocs import constants as c
+from markdowndocs import version
+from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject
+
+
+def _function_record(module: str, class_name, function_object: FunctionObject) -> dict:
+    """
+    Function record.
+
+    :param module: The name of the module that defines the function.
+    :param class_name: The name of the class that defines the function (None for module-level functions).
+    :param function_object: An object conforming with FunctionObject.
+    :return: A JSON-serializable record.
+    """
+    return {
+        "type": "function",
+        "module": module,
+        "class_name": class_name,
+        "function_name": function_object.function_name,
+        "function_description": function_object.function_description,
+        "code": None if function_object.code is None else str(function_object.code),
+    }
+
+
+def iter_records(markdown_module_object: MarkDownModuleObject) -> Iterator[dict]:
+    """
+    Iterate over the records of a module.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :return: An iterator over JSON-serializable records, in document order.
+    """
+    module = markdown_module_object.module
+    yield {
+        "type": "module",
+        "module": module,
+        "module_description": markdown_module_object.module_description,
+        "dependencies": markdown_module_object.dependencies,
+    }
+    for class_object in markdown_module_object.class_markdown_objects:
+        yield {
+            "type": "class",
+            "module": module,
+            "class_name": class_object.class_name,
+            "class_description": class_object.class_description,
+        }
+        for function_object in class_object.function_objects:
+            yield _function_record(module, class_object.class_name, function_object)
+    for function_object in markdown_module_object.function_markdown_objects:
+        yield _function_record(module, None, function_object)
+
+
+def export_options(args) -> dict:
+    """
+    Export options.
+
+    :param args: argparse.Namespace from the CLI.
+    :return: The options that affect the exported records.
+    """
+    return {"exclude_code": args.exclude_code, "exclude_dependencies": args.exclude_dependencies, "static": args.static}
+
+
+@contextmanager
+def open_jsonl(
+    path: str, options: Optional[dict] = None, git: Optional[dict] = None
+) -> Iterator[Callable[[MarkDownModuleObject], None]]:
+    """
+    Open a JSONL export, to which modules can be written one at a time.
+
+    The export is written to a temporary file first, which replaces the file at the path when the context exits, so
+    that readers never see a partially written export.
+
+    :param path: The path to the JSONL file.
+    :param options: The options that the modules were extracted with (see export_options), which are recorded in the
+        header.
+    :param git: The state of the git working tree that the modules were extracted from (see vcs.working_tree_state),
+        which is recorded in the header.
+    :return: A function that writes the records of a module to the export.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    header = {"type": "header", "version": version, "schema": c.JSONL.SCHEMA_VERSION}
+    if options is not None:
+        header["options"] = options
+    if git is not None:
+        header["git"] = git
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as export:
+            export.write(json.dumps(header) + "\n")
+
+            def write(markdown_module_object: MarkDownModuleObject) -> None:
+                for record in iter_records(markdown_module_object):
+                    export.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            yield write
+    except BaseException:
+        # The previous export (if any) is kept.
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def write_jsonl(path: str, markdown_module_objects: Iterable[MarkDownModuleObject]) -> int:
+    """
+    Write the records of modules to a JSONL file.
+
+    :param path: The path to the JSONL file.
+    :param markdown_module_objects: An iterable of objects conforming with MarkDownModuleObject.
+    :return: The number of exported modules.
+    """
+    n_modules = 0
+    with open_jsonl(path) as write:
+        for markdown_module_object in markdown_module_objects:
+            write(markdown_module_object)
+            n_modules += 1
+    return n_modules
+
+
+def read_header(path: str) -> dict:
+    """
+    Read the header of a JSONL file.
+
+    :param path: The path to a JSONL file written by write_jsonl.
+    :return: The header record (empty if the file does not start with a header).
+    """
+    with open(path, "r", encoding="utf-8") as export:
+        record = json.loads(export.readline() or "{}")
+    return record if record.get("type") == "header" else {}
+
+
+def read_module_names(path: str) -> Set[str]:
+    """
+    Read the names of the modules in a JSONL file, without rebuilding the modules.
+
+    :param path: The path to a JSONL file written by write_jsonl.
+    :return: The names of the exported modules.
+    """
+    # Module records are written with their type first, so the (much more numerous) other records need not be parsed.
+    prefix = json.dumps({"type": "module"})[:-1]
+    with open(path, "r", encoding="utf-8") as export:
+        return {json.loads(line)["module"] for line in export if line.startswith(prefix)}
+
+
+def read_jsonl(path: str) -> Iterator[MarkDownModuleObject]:
+    """
+    Read modules from a JSONL file.
+
+    Modules are rebuilt one at a time, so that only a single module is held in memory.
+
+    :param path: The path to a JSONL file written by write_jsonl.
+    :return: An iterator over objects conforming with MarkDownModuleObject, in the order in which they were exported.
+    """
+    markdown_module_object, class_object = None, None
+    with open(path, "r", encoding="utf-8") as export:
+        for line_number, line in enumerate(export, start=1):
+            record = json.loads(line)
+            record_type = record.get("type")
+            if record_type == "header":
+                if record.get("schema") != c.JSONL.SCHEMA_VERSION:
+                    raise ValueError(f"{path}: unsupported schema version {record.get('schema')}")
+                continue
+
+            if record_type == "module":
+                if markdown_module_object is not None:
+                    yield markdown_module_object
+                markdown_module_object = MarkDownModuleObject(
+                    module=record["module"],
+                    module_description=record["module_description"],
+                    dependencies=record["dependencies"],
+                    function_markdown_objects=[],
+                    class_markdown_objects=[],
+                )
+                class_object = None
+                continue
+
+            if markdown_module_object is None or record.get("module") != markdown_module_object.module:
+                raise ValueError(f"{path}:{line_number}: record does not follow the record of its module")
+
+            if record_type == "class":
+                class_object = MarkdownClassObject(
+                    class_name=record["class_name"], class_description=record["class_description"], function_objects=[]
+                )
+                markdown_module_object.class_markdown_objects.append(class_object)
+            elif record_type == "function":
+                function_object = FunctionObject(
+                    function_name=record["function_name"],
+                    function_description=record["function_description"],
+                    code=record["code"],
+                )
+                if record["class_name"] is None:
+                    markdown_module_object.function_markdown_objects.append(function_object)
+                elif class_object is not None and record["class_name"] == class_object.class_name:
+                    class_object.function_objects.append(function_object)
+                else:
+                    raise ValueError(f"{path}:{line_number}: record does not follow the record of its class")
+            else:
+                raise ValueError(f"{path}:{line_number}: unknown record type {record_type!r}")
+
+    if markdown_module_object is not None:
+        yield markdown_module_object
@@ -1,22 +1,42 @@
-import re
+import hashlib
 import string
-from typing import List
+from functools import lru_cache
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, List
 
-import pandas as pd
-from tabulate import tabulate
+from markdowndocs import constants as c
 
+if TYPE_CHECKING:
+    import pandas as pd
 
+
+# Translation table that strips punctuation and spaces from anchors.
+ANCHOR_TABLE = str.maketrans("", "", string.punctuation + " ")
+MEMO_SIZE = 2**16
+
+
+@lru_cache(maxsize=MEMO_SIZE)
 def gen_anchor(txt: str) -> str:
     """
     Generate anchor.
 
-    Generates an anchor for a title (for internal links).
+    Generates an anchor for a title (for internal links). Anchors are memoized, as the same names are anchored in the
+    index, the headers and the navigation links.
 
     :param txt: A string object.
     :return: A hyphen-separated string.
     """
-    regex = re.compile("[%s+| ]" % re.escape(string.punctuation))
-    return regex.sub("", txt.lower())
+    return txt.lower().translate(ANCHOR_TABLE)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def escape_underscores(txt: str) -> str:
+    """
+    Escape underscores.
+
+    :param txt: A string object.
+    :return: The string with markdown-escaped underscores.
+    """
+    return txt.replace("_", "\\_")
 
 
 def add_custom_header_anchor(txt: str) -> str:
@@ -40,8 +60,7 @@ def add_header(level: int, header_text: str) -> str:
     assert level <= 6, "Header level cannot exceed 4"
 
     prefix = "" if level == 1 else "\n"
-    backslash = "\\_"
-    return f"{prefix}{'#' * level} {add_custom_header_anchor(header_text)}{re.sub('_', backslash, header_text)}"
+    return f"{prefix}{'#' * level} {add_custom_header_anchor(header_text)}{escape_underscores(header_text)}"
 
 
 def list_to_md(
@@ -58,14 +77,9 @@ def list_to_md(
     :param indent: The indentation level.
     :return: Markdown syntax for a list of bullet points.
     """
-    md_string = "\n"
-    if introductory_text is not None:
-        md_string += introductory_text
-
-    for x in items:
-        md_string += list_st.format(indent="\t" * indent, txt=x)
-
-    return md_string
+    tabs = "\t" * indent
+    prefix = "\n" if introductory_text is None else "\n" + introductory_text
+    return prefix + "".join([list_st.format(indent=tabs, txt=x) for x in items])
 
 
 def italicize(txt: str):
@@ -94,23 +108,89 @@ def add_python_snippet(txt: str, expandable: bool = True):
     return md_str
 
 
-def add_table(df: pd.DataFrame) -> str:
+def add_table(df: "pd.DataFrame") -> str:
     """
     Add table.
 
+    Requires the optional tabulate dependency, which is imported on first use to keep the import of this module cheap
+    (pip install markdowndocs[tables]).
+
     :param df: A pandas dataframe.
     :return: Table markdown syntax.
     """
+    try:
+        from tabulate import tabulate
+    except ImportError as e:
+        raise ImportError("add_table requires tabulate: pip install markdowndocs[tables]") from e
+
     return tabulate(df, tablefmt="pipe", headers="keys", showindex=False)
 
 
-def add_index(headers: List[str], indent: int = 0) -> str:
+def add_index(headers: List[str], indent: int = 0, file_name: str = "") -> str:
     """
     Add index.
 
     :param headers: A list of header strings.
     :param indent: The indentation level for the link.
+    :param file_name: The (relative) path to the file that contains the headers, if it is not the current file.
     :return: Markdown syntax for an index.
     """
-    backslash = "\\_"
-    return list_to_md([f"[{re.sub('_', backslash, h)}](#{gen_anchor(h)})" for h in headers], indent=indent)
+    return list_to_md([f"[{escape_underscores(h)}]({file_name}#{gen_anchor(h)})" for h in headers], indent=indent)
+
+
+class MarkdownWriter:
+    """
+    Markdown writer.
+
+    Writes chunks of markdown syntax straight to a file handle, so that the full document never needs to be held in
+    memory, while keeping track of the length and hash of everything written so far.
+    """
+
+    def __init__(self, doc: IO[str]):
+        """
+        Initialize the writer.
+
+        :param doc: A file handle opened for writing text.
+        """
+        self.doc = doc
+        self.length = 0
+        self._hash = hashlib.sha256()
+
+    def write(self, chunks: Iterable[str]) -> int:
+        """
+        Write chunks of markdown syntax.
+
+        :param chunks: An iterable of strings.
+        :return: The number of characters written.
+        """
+        length = 0
+        for chunk in chunks:
+            self.doc.write(chunk)
+            self._hash.update(chunk.encode("utf-8"))
+            length += len(chunk)
+        self.length += length
+        return length
+
+    def hexdigest(self) -> str:
+        """
+        Hex digest.
+
+        :return: The sha256 hex digest of the utf-8 encoded text written so far.
+        """
+        return self._hash.hexdigest()
+
+
+def read_chunks(doc: IO[str], length: int) -> Iterator[str]:
+    """
+    Read chunks of text.
+
+    :param doc: A file handle opened for reading text.
+    :param length: The number of characters to read from the current position.
+    :return: An iterator over strings of at most c.PIPELINE.READ_SIZE characters, that add up to length characters.
+    """
+    while length > 0:
+        chunk = doc.read(min(length, c.PIPELINE.READ_SIZE))
+        if not chunk:
+            raise ValueError(f"{doc.name}: unexpected end of file")
+        length -= len(chunk)
+        yield chunk
@@ -1,27 +1,44 @@
-import importlib
+import hashlib
+import importlib.util
 import inspect
 import os
 import sys
-from contextlib import contextmanager
-from os.path import basename, isdir, isfile
+import tempfile
+from collections import deque
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import List, Tuple, Union
-
-import typer
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+from markdowndocs import async_io
+from markdowndocs import cache
+from markdowndocs import console
 from markdowndocs import constants as c
+from markdowndocs import incremental
+from markdowndocs import jsonl
+from markdowndocs import timings
+from markdowndocs import vcs
+from markdowndocs import version
 from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject, Module
-from markdowndocs.md_utils import add_header, add_index, add_python_snippet, gen_anchor, list_to_md
+from markdowndocs.discovery import iter_python_files, read_patterns
+from markdowndocs.md_utils import MarkdownWriter, read_chunks
+from markdowndocs.source_index import SourceIndex
+from markdowndocs.static_analysis import parse_module
+from markdowndocs.templates import Templates, load_templates
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 
 @contextmanager
-def load_from_wd():
+def load_from_wd(root: str = "."):
     """
     Load from working directory.
 
-    Context manager that ensures we only read files from the current WD.
+    Context manager that ensures we only read files from the current WD (or from the root directory of the modules).
+
+    :param root: The root directory of the modules, relative to the current WD.
     """
-    dir_ = Path.cwd()
+    dir_ = Path(os.path.abspath(root))
     import_path0 = sys.path[0]
     sys.path[0] = str(dir_)
 
@@ -31,39 +48,135 @@ def load_from_wd():
         sys.path[0] = import_path0
 
 
-def _module_exist_error(identified_modules: List[Module], mod_name: str) -> None:
+def _module_exist_error(identified_modules: List[Module], mod_name: str, root: str = ".") -> None:
     """
     Check if a module with a user-specified name exists; raise an error if not.
 
     :param identified_modules: A list of identified modules in the wd.
     :param mod_name: The user-specified module name.
+    :param root: The directory in which the modules were identified.
     """
     names = [i.name for i in identified_modules]
     sep = "\n - "
+    where = "your wd" if root == "." else root
     if mod_name not in names:
-        typer.secho(
+        console.secho(
             f"\nModule {mod_name} not found. Process aborted."
             "\n-------------------------------------------\n"
-            f"\n{c.FILE.PACKAGE_NAME} found the following modules in your wd: \n - {sep.join(names)}",
+            f"\n{c.FILE.PACKAGE_NAME} found the following modules in {where}: \n - {sep.join(names)}",
             bold=True,
         )
-        os._exit(1)
+        sys.exit(1)
 
 
-def gen_real_path(pth: str) -> str:
+def gen_real_path(pth: str, root: str = ".") -> str:
     """
     Generate absolute filesytem path.
 
     :param pth: Input path / name.
+    :param root: The directory that relative paths are relative to.
     :return: Absolute filesytem path.
     """
-    for f in [os.path.expanduser, os.path.normpath, os.path.realpath, os.path.abspath]:
+    pth = os.path.join(root, os.path.expanduser(pth))
+    for f in [os.path.normpath, os.path.realpath, os.path.abspath]:
         pth = f(pth)
     return pth + ".py"
 
 
+def module_import_name(mod: Module) -> str:
+    """
+    Module import name.
+
+    :param mod: A module in the wd.
+    :return: The dotted name under which the module can be imported from the wd (empty for a top-level __init__).
+    """
+    parts = Path(mod.name).parts
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _imported_module(mod: Module):
+    """
+    Find the already imported module object of a module in the wd.
+
+    :param mod: A module in the wd.
+    :return: The module object from sys.modules, or None if the module has not been imported yet (or if its import
+        name refers to a different file, e.g. a shadowed standard library module).
+    """
+    my_module = sys.modules.get(module_import_name(mod))
+    path = getattr(my_module, "__file__", None)
+    if path and os.path.realpath(path) == gen_real_path(mod.name, mod.root):
+        return my_module
+    return None
+
+
+def _import_by_name(mod: Module):
+    """
+    Import a module by its dotted name.
+
+    Modules are imported into sys.modules, so that sibling modules (and the packages they belong to) are executed only
+    once, no matter how many of the documented modules import them.
+
+    :param mod: A module in the wd.
+    :return: The imported module object, or None if the module cannot be imported by name.
+    """
+    name = module_import_name(mod)
+    if not name:
+        return None
+    with load_from_wd(mod.root):
+        importlib.import_module(name)
+    return _imported_module(mod)
+
+
+def forget_modules(modules: List[Module]) -> None:
+    """
+    Remove modules from sys.modules, so that they are executed again the next time they are imported by name.
+
+    :param modules: A list of modules in the wd.
+    """
+    for mod in modules:
+        if _imported_module(mod) is not None:
+            del sys.modules[module_import_name(mod)]
+
+
+def _load_source_index(my_module, args) -> Optional[SourceIndex]:
+    """
+    Load the source index of an imported module.
+
+    :param my_module: An imported module.
+    :param args: User-specified options.
+    :return: A SourceIndex for the module's source file, or None if the source code is excluded or cannot be indexed.
+    """
+    path = getattr(my_module, "__file__", None)
+    if args.exclude_code or not path or not path.endswith(".py"):
+        return None
+    try:
+        return SourceIndex(path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _has_source_file(func: callable) -> bool:
+    """
+    Check whether a function was defined in a source file.
+
+    Functions generated at runtime (e.g. the methods added by the dataclass decorator) are compiled from strings, and
+    have no source code to document.
+
+    :param func: A function.
+    :return: False if the (unwrapped) function was compiled from a string.
+    """
+    code = getattr(inspect.unwrap(func), "__code__", None)
+    return code is None or not code.co_filename.startswith("<")
+
+
 def _extract_function_information(
-    functions: List[Tuple[str, callable]], module: callable, args, condition: str
+    functions: List[Tuple[str, callable]],
+    module: callable,
+    args,
+    condition: str,
+    source_index: Optional[SourceIndex] = None,
 ) -> List[FunctionObject]:
     """
     Extract function information.
@@ -72,25 +185,25 @@ def _extract_function_information(
     :param module: An imported module.
     :param args: User-specified options.
     :param condition: A string value that the module name needs to meet in order to be included in the markdown object.
+    :param source_index: The source index of the module; source code is sliced from it where possible, instead of
+        calling inspect.getsource for every function.
     :return: A list of populated objects conforming with FunctionObject.
     """
     function_objects = []
 
     # __init__ order is not preserved in the case of classes with private methods.
-    fnames = [i[0] for i in functions]
-    if "__init__" in fnames:
-        fnames.remove("__init__")
-        fnames.insert(0, "__init__")
-        functions = [i for j in fnames for i in filter(lambda k: k[0] == j, functions)]
+    functions = [f for f in functions if f[0] == "__init__"] + [f for f in functions if f[0] != "__init__"]
 
     for f in functions:
-        if str(f[1].__module__) == condition:
+        if str(f[1].__module__) == condition and _has_source_file(f[1]):
             function_object = FunctionObject(
                 function_name=f[1].__qualname__, function_description=f[1].__doc__, code=None
             )
 
             if not args.exclude_code:
-                function_object.code = inspect.getsource(getattr(module, f[0]))
+                function_object.code = source_index and source_index.function_source(f[1], lazy=True)
+                if function_object.code is None:
+                    function_object.code = inspect.getsource(getattr(module, f[0]))
 
             function_objects.append(function_object)
     return function_objects
@@ -119,17 +232,25 @@ def process_module(mod: Union[Module, str], args) -> MarkDownModuleObject:
     :return: An object conforming with MarkDownModuleObject.
     """
 
-    if isinstance(mod, str):
-        with load_from_wd():
-            my_module = importlib.import_module(mod)
-    else:
-        spec = importlib.util.spec_from_file_location(mod.name, gen_real_path(mod.name))
-        my_module = importlib.util.module_from_spec(spec)
-        with load_from_wd():
-            spec.loader.exec_module(my_module)
-
+    name = mod.name if isinstance(mod, Module) else mod
+    with timings.phase("import", name):
+        my_module = None
+        if isinstance(mod, str):
+            with load_from_wd():
+                my_module = importlib.import_module(mod)
+        elif args.package_imports:
+            my_module = _import_by_name(mod)
+
+        if my_module is None:
+            spec = importlib.util.spec_from_file_location(mod.name, gen_real_path(mod.name, mod.root))
+            my_module = importlib.util.module_from_spec(spec)
+            with load_from_wd(mod.root):
+                spec.loader.exec_module(my_module)
+
+    with timings.phase("source", name):
+        source_index = _load_source_index(my_module, args)
     markdown_module_object = MarkDownModuleObject(
-        module=my_module.__name__,
+        module=mod.name if isinstance(mod, Module) else my_module.__name__,
         module_description=my_module.__doc__,
         class_markdown_objects=[],
         function_markdown_objects=[],
@@ -157,169 +278,1199 @@ def process_module(mod: Union[Module, str], args) -> MarkDownModuleObject:
 
             functions = inspect.getmembers(myclass[1], inspect.isfunction)
             class_markdown_object.function_objects += _extract_function_information(
-                module=myclass[1], args=args, functions=functions, condition=myclass[1].__module__
+                module=myclass[1],
+                args=args,
+                functions=functions,
+                condition=myclass[1].__module__,
+                source_index=source_index,
             )
             markdown_module_object.class_markdown_objects.append(class_markdown_object)
 
     # Identify non-class functions
     functions = inspect.getmembers(my_module, inspect.isfunction)
     markdown_module_object.function_markdown_objects += _extract_function_information(
-        module=my_module, args=args, functions=functions, condition=my_module.__name__
+        module=my_module, args=args, functions=functions, condition=my_module.__name__, source_index=source_index
     )
 
     return markdown_module_object
 
 
-def convert_markdown_module_object_to_markdown(markdown_module_object: MarkDownModuleObject) -> str:
+def extract_module(mod: Union[Module, str], args) -> MarkDownModuleObject:
     """
-    Convert a MarkDownModuleObject instance into markdown syntax.
+    Extract module.
+
+    Extracts the documentation objects of a module with the backend selected by the user. The static backend reads
+    the source text without importing the module; modules that cannot be parsed statically (or that are referred to by
+    their dotted import name) fall back to the import-based extraction in process_module.
+
+    :param mod: The module that will be processed.
+    :param args: argparse.Namespace from the CLI.
+    :return: An object conforming with MarkDownModuleObject.
+    """
+    name = mod.name if isinstance(mod, Module) else mod
+    # Time that is not spent importing, parsing or reading the source is spent inspecting the module.
+    with timings.track_module(name), timings.phase("inspect", name):
+        if args.static and isinstance(mod, Module):
+            try:
+                with timings.phase("parse", name):
+                    return parse_module(mod, gen_real_path(mod.name, mod.root), args)
+            except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+                console.secho(
+                    f"Static extraction failed for {mod.name} ({e}); falling back to importing the module.",
+                    bold=True,
+                    fg="yellow",
+                )
+        return process_module(mod, args)
+
+
+def _extract_by_name(modules: List[Module], args) -> Tuple[List[MarkDownModuleObject], int]:
+    """
+    Extract modules that are imported by their dotted name.
+
+    :param modules: A list of modules.
+    :param args: argparse.Namespace from the CLI.
+    :return: A list of objects conforming with MarkDownModuleObject, and the number of modules that did not have to be
+        executed again because they were already imported (e.g. by a sibling module).
+    """
+    mod_obj, reused = [], 0
+    for mod in modules:
+        reused += not args.static and _imported_module(mod) is not None
+        mod_obj.append(extract_module(mod, args))
+    return mod_obj, reused
+
+
+def _map_in_order(submit: Callable[[Any], "Future"], items: Iterable, window: int) -> Iterator:
+    """
+    Map over items with an executor, keeping a bounded number of items in flight.
+
+    :param submit: A function that submits an item to an executor, and returns a future of its result.
+    :param items: An iterable of items.
+    :param window: The maximum number of submitted items whose results have not been consumed yet.
+    :return: An iterator over the results, in the same order as the items.
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(submit(item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _iter_extract_uncached(modules: List[Module], args) -> Iterator[Optional[MarkDownModuleObject]]:
+    """
+    Extract modules without consulting the cache.
+
+    Spreads the work over a pool of worker processes if the user requested more than one job; workers run at most
+    c.PIPELINE.WINDOW_PER_JOB modules ahead of the consumer. In isolated mode, every module is imported in a worker
+    process with a timeout, and modules that fail are reported and yielded as None.
+
+    :param modules: A list of modules.
+    :param args: argparse.Namespace from the CLI.
+    :return: An iterator over objects conforming with MarkDownModuleObject, in the same order as the input modules.
+    """
+    jobs = min(args.jobs or os.cpu_count() or 1, len(modules))
+    window = jobs * c.PIPELINE.WINDOW_PER_JOB
+    if args.isolate and modules:
+        from markdowndocs.isolation import isolated_workers
+
+        with isolated_workers(args, jobs) as submit:
+            for mod, (obj, error) in zip(modules, _map_in_order(submit, modules, window)):
+                if error:
+                    console.secho(f"Failed to process module {mod.name}: {error}", bold=True, fg="red", err=True)
+                yield obj
+        return
+
+    if args.package_imports:
+        yield from _iter_extract_package(modules, args, jobs)
+        return
+
+    if jobs <= 1:
+        for mod in modules:
+            yield extract_module(mod, args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from _map_in_order(lambda mod: executor.submit(extract_module, mod, args), modules, window)
+
+
+def _iter_extract_package(modules: List[Module], args, jobs: int) -> Iterator[MarkDownModuleObject]:
+    """
+    Extract modules by importing them by their dotted name, and report how many re-executions were avoided.
+
+    When extracting in parallel, the worker processes get contiguous chunks of the (sorted) modules, so that modules of
+    the same package share the imports of the worker.
+
+    :param modules: A list of modules.
+    :param args: argparse.Namespace from the CLI.
+    :param jobs: The number of worker processes.
+    :return: An iterator over objects conforming with MarkDownModuleObject, in the same order as the input modules.
+    """
+    size = c.PIPELINE.PACKAGE_CHUNK_SIZE if jobs > 1 else 1
+    chunks = (modules[i : i + size] for i in range(0, len(modules), size))
+    reused = 0
+    if jobs <= 1:
+        for chunk in chunks:
+            chunk_obj, chunk_reused = _extract_by_name(chunk, args)
+            reused += chunk_reused
+            yield from chunk_obj
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = _map_in_order(
+                lambda chunk: executor.submit(_extract_by_name, chunk, args), chunks, jobs * c.PIPELINE.WINDOW_PER_JOB
+            )
+            for chunk_obj, chunk_reused in results:
+                reused += chunk_reused
+                yield from chunk_obj
+
+    if not args.static:
+        console.secho(
+            f"Imported {len(modules)} modules by name; {reused} were already imported and not executed again.",
+            bold=True,
+        )
+
+
+def hash_sources(modules: List[Module], args) -> List[str]:
+    """
+    Hash the sources of modules.
+
+    :param modules: A list of (selected) modules in the wd.
+    :param args: argparse.Namespace from the CLI.
+    :return: The source hashes of the modules, computed with incremental.hash_source.
+    """
+    return async_io.gather(
+        lambda mod: incremental.hash_source(gen_real_path(mod.name, mod.root)), modules, args.io_concurrency
+    )
+
+
+def _iter_extract_cached(
+    modules: List[Module], args, source_hashes: Optional[List[str]] = None
+) -> Iterator[Tuple[Module, Optional[MarkDownModuleObject]]]:
+    """
+    Extract modules, loading the modules whose source (and relevant options) did not change since a previous run from
+    the on-disk cache.
+
+    :param modules: A list of (selected) modules in the wd.
+    :param args: argparse.Namespace from the CLI.
+    :param source_hashes: The source hashes of the modules, if they have been computed already.
+    :return: An iterator over the modules and their objects, in the same order as the input modules.
+    """
+    if args.no_cache:
+        keys, hits = None, [False] * len(modules)
+    else:
+        with timings.phase("cache"):
+            if source_hashes is None:
+                source_hashes = hash_sources(modules, args)
+            keys = [
+                cache.cache_key(mod, gen_real_path(mod.name, mod.root), args, source_hash)
+                for mod, source_hash in zip(modules, source_hashes)
+            ]
+            hits = async_io.gather(cache.contains, keys, args.io_concurrency)
+
+    loaded = async_io.iter_gather(cache.load, [key for key, hit in zip(keys or [], hits) if hit], args.io_concurrency)
+    extracted = _iter_extract_uncached([mod for mod, hit in zip(modules, hits) if not hit], args)
+    stored = False
+    for i, (mod, hit) in enumerate(zip(modules, hits)):
+        obj = None
+        if hit:
+            with timings.phase("cache"):
+                obj = next(loaded)
+        if obj is None:
+            with timings.phase("extract"):
+                # An entry that was found may have been evicted by a concurrent run since.
+                obj = next(_iter_extract_uncached([mod], args)) if hit else next(extracted)
+            if keys is not None and obj is not None:
+                with timings.phase("cache"):
+                    cache.store(keys[i], obj)
+                stored = True
+        yield mod, obj
+
+    # Let the extraction finish, so that it reports its summary and shuts down its workers.
+    next(extracted, None)
+    if stored:
+        with timings.phase("cache"):
+            cache.evict()
+
+
+def _module_files(modules: List[Module]) -> Set[str]:
+    """
+    Module files.
+
+    :param modules: A list of (selected) modules in the wd.
+    :return: The normalized paths of the source files of the modules, relative to their root (as listed by git).
+    """
+    return {os.path.normpath(f"{mod.name}.py") for mod in modules}
+
+
+def _open_export(args, modules: List[Module], root: str = "."):
+    """
+    Open the JSONL export of a run.
+
+    In --since mode, the commit that is checked out (and the source files of the modules that differ from it) are
+    recorded in the export, so that a later run can tell which of the exported modules still match their source files.
+
+    :param args: argparse.Namespace from the CLI.
+    :param modules: The modules that are exported.
+    :param root: The root directory of the modules.
+    :return: A context manager that yields a function that writes a module to the export (see jsonl.open_jsonl).
+    """
+    git = None
+    if args.since:
+        try:
+            git = vcs.working_tree_state(root, _module_files(modules))
+        except RuntimeError as e:
+            console.secho(f"Cannot record the git commit in {args.jsonl}, so it cannot be reused: {e}", fg="yellow")
+    return jsonl.open_jsonl(args.jsonl, jsonl.export_options(args), git)
+
+
+def _unchanged_since(modules: List[Module], args) -> List[bool]:
+    """
+    Find the modules that can be taken from the previous JSONL export in --since mode.
+
+    :param modules: A list of (selected) modules in the wd.
+    :param args: argparse.Namespace from the CLI.
+    :return: For every module, whether its source file did not change since the git ref, and it is in the previous JSONL
+        export (written by the same version of markdowndocs, with the same options) and did not change since it was
+        exported.
+    """
+    if not args.since:
+        return [False] * len(modules)
+    root = modules[0].root if modules else "."
+    module_files = _module_files(modules)
+    try:
+        changed = vcs.changed_files(args.since, root) & module_files
+    except RuntimeError as e:
+        console.secho(f"Cannot find the files that changed since {args.since}: {e}", bold=True, fg="red")
+        sys.exit(1)
+
+    if not args.jsonl or not os.path.isfile(args.jsonl):
+        console.secho(f"No previous JSONL export found; extracting all {len(modules)} modules.", fg="yellow")
+        return [False] * len(modules)
+    header = jsonl.read_header(args.jsonl)
+    if header.get("version") != version or header.get("options") != jsonl.export_options(args):
+        return [False] * len(modules)
+    # The files that changed since the export are those that differ from the commit it was exported from, and those
+    # that already differed from it when it was exported.
+    git = header.get("git") or {}
+    try:
+        changed.update(vcs.changed_files(git["commit"], root) & module_files, module_files.intersection(git["changed"]))
+    except (KeyError, TypeError, RuntimeError):
+        console.secho(f"Cannot find the files that changed since {args.jsonl} was exported.", fg="yellow")
+        return [False] * len(modules)
+    exported = jsonl.read_module_names(args.jsonl)
+    return [os.path.normpath(f"{mod.name}.py") not in changed and mod.name in exported for mod in modules]
+
+
+def iter_extract_modules(
+    modules: List[Module], args, source_hashes: Optional[List[str]] = None
+) -> Iterator[Tuple[Module, Optional[MarkDownModuleObject]]]:
+    """
+    Extract modules.
+
+    Extracts the documentation objects of the modules one at a time. Modules whose source (and relevant options) did not
+    change since a previous run are loaded from the on-disk cache; only the remaining modules are extracted. In --since
+    mode, the modules whose source files did not change since the git ref (nor since the previous JSONL export) are
+    taken from that export instead, without reading their sources. Objects are yielded as soon as they are available, so that the consumer can
+    render and drop them before the next ones are extracted.
+
+    :param modules: A list of (selected) modules in the wd.
+    :param args: argparse.Namespace from the CLI.
+    :param source_hashes: The source hashes of the modules, if they have been computed already.
+    :return: An iterator over the modules and their objects conforming with MarkDownModuleObject, in the same order as
+        the input modules. The objects of modules that failed in isolated mode are None.
+    """
+    with timings.phase("cache"):
+        unchanged = _unchanged_since(modules, args)
+    if not any(unchanged):
+        yield from _iter_extract_cached(modules, args, source_hashes)
+        return
+
+    console.secho(
+        f"Reusing {sum(unchanged)} of {len(modules)} modules from {args.jsonl} (unchanged since {args.since} and since "
+        "the export).",
+        bold=True,
+    )
+    changed = [i for i, reused in enumerate(unchanged) if not reused]
+    extracted = _iter_extract_cached(
+        [modules[i] for i in changed], args, None if source_hashes is None else [source_hashes[i] for i in changed]
+    )
+    # The previous export is read alongside the modules; both are in discovery order.
+    previous = jsonl.read_jsonl(args.jsonl)
+    try:
+        for mod, reused in zip(modules, unchanged):
+            if not reused:
+                yield next(extracted)
+                continue
+            with timings.phase("cache"):
+                obj = next((obj for obj in previous if obj.module == mod.name), None)
+            if obj is None:
+                with timings.phase("extract"):
+                    # The export lists the modules in another order (e.g. that of an earlier --module-names option).
+                    obj = next(_iter_extract_uncached([mod], args))
+            yield mod, obj
+        next(extracted, None)
+    finally:
+        previous.close()
+
+
+def iter_module_markdown(
+    markdown_module_object: MarkDownModuleObject, index_file: str = "", templates: Optional[Templates] = None
+) -> Iterator[str]:
+    """
+    Iterate over the markdown syntax of a MarkDownModuleObject instance.
 
     :param markdown_module_object: An object conforming with MarkDownModuleObject.
-    :return: A string of markdown syntax.
+    :param index_file: The (relative) path to the file with the code documentation index, if the module is documented
+        in a separate file.
+    :param templates: The compiled templates (the defaults if None).
+    :return: An iterator over chunks of markdown syntax.
     """
-    md_string = ""
-    md_string += add_header(level=2, header_text=markdown_module_object.module)
-    md_string += f"\n{c.FILE.NAVIGATION} [code documentation index](#{gen_anchor(c.FILE.DEFAULT_HEADER)})\n"
+    t = templates or load_templates()
+    index_navigation = t.index_navigation(index_file)
+    module_navigation = t.navigation("module index", f"#{markdown_module_object.module}")
+    yield t.header(2, markdown_module_object.module)
+    yield index_navigation
 
     if markdown_module_object.dependencies:
-        md_string += list_to_md(
-            items=markdown_module_object.dependencies, introductory_text=add_header(3, "Dependencies")
-        )
+        yield t.list(t.section_headers[3, "Dependencies"], t.items(markdown_module_object.dependencies))
 
     if markdown_module_object.class_markdown_objects:
-        md_string += add_header(level=3, header_text="Classes")
-        md_string += add_index([my_class.class_name for my_class in markdown_module_object.class_markdown_objects])
+        yield t.section_headers[3, "Classes"]
+        yield t.index([my_class.class_name for my_class in markdown_module_object.class_markdown_objects])
         for my_class in markdown_module_object.class_markdown_objects:
-            md_string += add_header(level=4, header_text=my_class.class_name)
-            md_string += (
-                f"\n{my_class.class_description}" if my_class.class_description else "\n*No docstrings available.*"
-            )
+            yield t.header(4, my_class.class_name)
+            yield t.description(my_class.class_description) if my_class.class_description else t.no_description
             if my_class.function_objects:
-                md_string += add_header(level=5, header_text="Functions")
-                md_string += add_index([f"{i.function_name}" for i in my_class.function_objects])
+                class_navigation = t.navigation("class index", f"#{my_class.class_name}")
+                yield t.section_headers[5, "Functions"]
+                yield t.index([f"{i.function_name}" for i in my_class.function_objects])
                 for entry in my_class.function_objects:
-                    md_string += add_header(level=6, header_text=f"{entry.function_name}")
-                    md_string += (
-                        f"\n{c.FILE.NAVIGATION} [code documentation index](#{gen_anchor(c.FILE.DEFAULT_HEADER)})\n"
-                    )
-                    md_string += f"\n{c.FILE.NAVIGATION} [module index](#{markdown_module_object.module})\n"
-                    md_string += f"\n{c.FILE.NAVIGATION} [class index](#{my_class.class_name})\n"
-                    md_string += (
-                        f"\n{entry.function_description}"
-                        if entry.function_description
-                        else "\n*No docstrings available.*"
-                    )
+                    yield t.header(6, entry.function_name)
+                    yield index_navigation
+                    yield module_navigation
+                    yield class_navigation
+                    yield t.description(entry.function_description) if entry.function_description else t.no_description
                     if entry.code:
-                        md_string += add_python_snippet(entry.code)
+                        yield t.code(entry.code)
 
     if markdown_module_object.function_markdown_objects:
-        md_string += add_header(level=3, header_text="Functions")
-        md_string += add_index([i.function_name for i in markdown_module_object.function_markdown_objects])
+        yield t.section_headers[3, "Functions"]
+        yield t.index([i.function_name for i in markdown_module_object.function_markdown_objects])
 
         for entry in markdown_module_object.function_markdown_objects:
-            md_string += add_header(level=4, header_text=entry.function_name)
-            md_string += f"\n{c.FILE.NAVIGATION} [code documentation index](#{gen_anchor(c.FILE.DEFAULT_HEADER)})\n"
-            md_string += f"\n{c.FILE.NAVIGATION} [module index](#{markdown_module_object.module})\n"
-            md_string += (
-                f"\n{entry.function_description}" if entry.function_description else "\n*No docstrings available.*"
-            )
+            yield t.header(4, entry.function_name)
+            yield index_navigation
+            yield module_navigation
+            yield t.description(entry.function_description) if entry.function_description else t.no_description
             if entry.code:
-                md_string += add_python_snippet(entry.code)
+                yield t.code(entry.code)
 
-    return md_string
 
+def convert_markdown_module_object_to_markdown(markdown_module_object: MarkDownModuleObject) -> str:
+    """
+    Convert a MarkDownModuleObject instance into markdown syntax.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :return: A string of markdown syntax.
+    """
+    return "".join(iter_module_markdown(markdown_module_object))
 
-def identify_modules(args) -> List[Module]:
+
+def identify_modules(args, root: str = ".") -> List[Module]:
     """
     Identify modules.
 
+    Finds the Python modules in the current directory (or in another root directory) and its subdirectories (one level
+    deep, unless the recursive option is enabled), skipping excluded paths.
+
     :param args: User-specified arguments.
+    :param root: The directory in which to look for modules; module names are relative to it.
     :return: a list of module names and full paths in the current directory.
     """
 
-    mods = os.listdir()
+    exclude = c.DISCOVERY.DEFAULT_EXCLUDES + (args.exclude_paths or [])
+    if args.exclude_from:
+        exclude += read_patterns(args.exclude_from)
 
     identified_modules = [
-        Module(name=basename(f)[:-3], path=f)
-        for f in mods
-        if isfile(f) and f.endswith(".py") and not f.endswith("__.py")
+        Module(name=f[:-3], path=os.path.normpath(os.path.join(root, f)), root=root)
+        for f in iter_python_files(
+            root,
+            max_depth=None if args.recursive else 1,
+            exclude=exclude,
+            include=args.include_paths,
+            concurrency=args.io_concurrency,
+        )
     ]
 
-    dirs = [i for i in mods if isdir(i)]
-    for dir in dirs:
-        mods = [os.path.join(dir, i) for i in os.listdir(dir)]
-        identified_modules += [
-            Module(name=f"{dir}/{basename(f)[:-3]}", path=f)
-            for f in mods
-            if isfile(f) and f.endswith(".py") and not f.endswith("__.py")
-        ]
-
+    identified_names = {i.name for i in identified_modules}
     if args.module_names:
         module_names = [x.replace(".py", "") for x in args.module_names]
         for mod_name in module_names:
-            if mod_name not in [i.name for i in identified_modules]:
-                _module_exist_error(identified_modules, mod_name)
-        identified_modules = [i for i in identified_modules if i.name in module_names]
+            if mod_name not in identified_names:
+                _module_exist_error(identified_modules, mod_name, root)
+        selected = set(module_names)
+        identified_modules = [i for i in identified_modules if i.name in selected]
 
     if args.exclude_modules:
         module_names = [x.replace(".py", "") for x in args.exclude_modules]
         for mod_name in module_names:
-            if mod_name not in [i.name for i in identified_modules]:
-                _module_exist_error(identified_modules, mod_name)
-        identified_modules = [i for i in identified_modules if i.name not in module_names]
+            if mod_name not in identified_names:
+                _module_exist_error(identified_modules, mod_name, root)
+        selected = set(module_names)
+        identified_modules = [i for i in identified_modules if i.name not in selected]
 
     if not identified_modules:
-        typer.secho(f"\nNo Python modules found in current wd. Process aborted.", bold=True)
-        os._exit(1)
+        where = "current wd" if root == "." else root
+        console.secho(f"\nNo Python modules found in {where}. Process aborted.", bold=True)
+        sys.exit(1)
 
     return identified_modules
 
 
-def generate_markdown_file(args, modules: List[Module], output_file_name: str) -> None:
+def iter_module_index(
+    markdown_module_object: MarkDownModuleObject, module_file: str = "", templates: Optional[Templates] = None
+) -> Iterator[str]:
     """
-    Generate markdown file.
+    Iterate over the entries of a module in the hierarchical index.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :param module_file: The (relative) path to the file that documents the module, if the module is documented in a
+        separate file.
+    :param templates: The compiled templates (the defaults if None).
+    :return: An iterator over chunks of markdown syntax.
+    """
+    t = templates or load_templates()
+    yield t.index([markdown_module_object.module], file_name=module_file)  # Add module link
+    if markdown_module_object.class_markdown_objects:
+        for m in markdown_module_object.class_markdown_objects:
+            yield t.index([m.class_name], 1, module_file)  # Add class link
+            for myclass in m.function_objects:
+                yield t.index([f"{myclass.function_name}"], 2, module_file)  # Add class.function link
+
+    if markdown_module_object.function_markdown_objects:
+        for f in markdown_module_object.function_markdown_objects:
+            yield t.index([f.function_name], 1, module_file)  # Add function link
+
+
+def summarize_module(markdown_module_object: MarkDownModuleObject) -> MarkDownModuleObject:
+    """
+    Summarize a module.
+
+    :param markdown_module_object: An object conforming with MarkDownModuleObject.
+    :return: A copy of the object with only the names of the module, its classes and its functions, which is all that
+        is needed to render its index entries.
+    """
+    return MarkDownModuleObject(
+        module=markdown_module_object.module,
+        module_description=None,
+        dependencies=None,
+        function_markdown_objects=[
+            FunctionObject(f.function_name, None, None) for f in markdown_module_object.function_markdown_objects
+        ],
+        class_markdown_objects=[
+            MarkdownClassObject(
+                m.class_name, None, [FunctionObject(f.function_name, None, None) for f in m.function_objects]
+            )
+            for m in markdown_module_object.class_markdown_objects
+        ],
+    )
+
+
+def _render_threads(args) -> int:
+    """
+    Render threads.
+
+    :param args: User-specified arguments.
+    :return: The number of threads that render the sections of the modules: as requested by the user, or else one per
+        CPU on a free-threaded build of Python (where the threads render in parallel), one if the modules are extracted
+        in worker processes (so that rendering overlaps with their extraction), and none otherwise (where a thread would
+        only contend for the GIL with the extraction).
+    """
+    if args.render_threads is not None:
+        return args.render_threads
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        return os.cpu_count() or 1
+    return 1 if args.isolate or (args.jobs or os.cpu_count() or 1) > 1 else 0
+
+
+def _iter_rendered(
+    extracted: Iterable[Tuple[Module, Optional[MarkDownModuleObject]]],
+    render: Callable[[Module, MarkDownModuleObject], Iterable[str]],
+    threads: int,
+) -> Iterator[Tuple[Module, Optional[MarkDownModuleObject], Iterable[str]]]:
+    """
+    Render modules.
+
+    With render threads, the sections are rendered in a pool of threads while later modules are extracted, at most
+    c.PIPELINE.WINDOW_PER_JOB modules per thread ahead of the consumer. Without, the chunks are rendered lazily, as the
+    consumer iterates over them.
+
+    :param extracted: An iterator over the modules and their objects (None for modules that failed to process).
+    :param render: A function that renders the object of a module into chunks of markdown syntax.
+    :param threads: The number of render threads.
+    :return: An iterator over the modules, their objects and their chunks of markdown syntax, in the same order as the
+        input modules.
+    """
+    if threads < 1:
+        for mod, obj in extracted:
+            yield mod, obj, (() if obj is None else render(mod, obj))
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def task(mod: Module, obj: Optional[MarkDownModuleObject]) -> Tuple:
+        return mod, obj, (() if obj is None else ["".join(render(mod, obj))])
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        yield from _map_in_order(
+            lambda item: executor.submit(task, *item), extracted, threads * c.PIPELINE.WINDOW_PER_JOB
+        )
+
+
+def _render_sections(
+    args,
+    modules: List[Module],
+    spool: IO[str],
+    export: Optional[Callable[[MarkDownModuleObject], None]],
+    templates: Templates,
+    source_hashes: Optional[List[str]] = None,
+) -> List[Optional[Tuple[MarkDownModuleObject, int]]]:
+    """
+    Extract modules and render their sections to a spool file, one module at a time.
+
+    Every module object is dropped as soon as its section is rendered; only a name-only summary is kept, from which the
+    index is rendered once all sections are known.
 
     :param args: User-specified arguments.
     :param modules: A list of (selected) modules in the wd.
+    :param spool: A file handle opened for writing text, to which the sections are appended.
+    :param export: A function that writes a module to the JSONL export (if any).
+    :param templates: The compiled templates.
+    :param source_hashes: The source hashes of the modules, if they have been computed already.
+    :return: The summary of every module and the length of its section, or None for modules that failed to process (in
+        isolated mode).
+    """
+    rendered = []
+    extracted = iter_extract_modules(modules, args, source_hashes)
+    render = lambda mod, obj: iter_module_markdown(obj, "", templates)  # noqa: E731
+    for mod, obj, chunks in _iter_rendered(extracted, render, _render_threads(args)):
+        if obj is None:
+            rendered.append(None)
+            continue
+        if export is not None:
+            with timings.phase("write"):
+                export(obj)
+        with timings.phase("render", mod.name):
+            length = sum(spool.write(chunk) for chunk in chunks)
+        rendered.append((summarize_module(obj), length))
+    return rendered
+
+
+def _write_markdown_file(
+    output_file_name: str,
+    header: str,
+    parts: List[Optional[Tuple[MarkDownModuleObject, int]]],
+    spool: IO[str],
+    manifest: Optional[dict],
+    templates: Templates,
+    dry_run: bool = False,
+) -> Tuple[MarkdownWriter, List[int], List[int], List[int]]:
+    """
+    Write the markdown file.
+
+    The index entries of the modules are rendered from their summaries and their sections are copied from the spool
+    file. The index entries and sections of modules that were not re-rendered are copied from the existing file, as
+    described by its manifest. The file is written to a temporary file first, which then replaces the existing file.
+    In a dry run, nothing is written; the writer only keeps track of the length and hash of the file.
+
     :param output_file_name: The output file name for the .md file.
+    :param header: The markdown header of the file.
+    :param parts: The summary of every module and the length of its section in the spool file, or None for modules
+        whose parts are copied from the existing file.
+    :param spool: A file handle to which the sections of the modules were written with _render_sections.
+    :param manifest: The manifest of the existing file (only needed if some parts are None).
+    :param templates: The compiled templates.
+    :param dry_run: If True, the file is not written.
+    :return: The writer, the lengths of the index entries and sections of the modules, and the indices of the
+        re-rendered modules whose index entries or section differ from those in the existing file.
+    """
+    tmp_path = os.devnull if dry_run else f"{output_file_name}.{os.getpid()}.tmp"
+    spool.seek(0)
+    index_lengths, section_lengths = [], []
+    # The previous and the re-rendered parts of every module are hashed, to tell which modules changed.
+    digests = {}
+    with open(output_file_name, "r") if manifest else nullcontext() as existing, open(tmp_path, "w") as doc:
+        writer = MarkdownWriter(doc)
+        writer.write([header])
+        if existing:
+            for _ in read_chunks(existing, manifest["header_length"]):
+                pass
+
+        for key, lengths in [("index_length", index_lengths), ("section_length", section_lengths)]:
+            for i, part in enumerate(parts):
+                previous = read_chunks(existing, manifest["modules"][i][key]) if existing else iter(())
+                if part is None:
+                    lengths.append(writer.write(previous))
+                    continue
+                chunks = (
+                    iter_module_index(part[0], "", templates) if key == "index_length" else read_chunks(spool, part[1])
+                )
+                if existing:
+                    old, new = digests.setdefault(i, (hashlib.sha256(), hashlib.sha256()))
+                    for chunk in previous:
+                        old.update(chunk.encode("utf-8"))
+                    chunks = _hashed(chunks, new)
+                with timings.phase("render") if key == "index_length" else nullcontext():
+                    lengths.append(writer.write(chunks))
+    if not dry_run:
+        os.replace(tmp_path, output_file_name)
+    differing = [i for i, (old, new) in digests.items() if old.digest() != new.digest()]
+    return writer, index_lengths, section_lengths, differing
+
+
+def _hashed(chunks: Iterable[str], digest: Any) -> Iterator[str]:
+    """
+    Hash chunks of text while they are consumed.
+
+    :param chunks: An iterable of strings.
+    :param digest: A hashlib hash object, which is updated with the utf-8 encoded chunks.
+    :return: An iterator over the chunks.
+    """
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+        yield chunk
+
+
+def generate_markdown_file_from_jsonl(
+    jsonl_file_name: str, output_file_name: str, templates_file: Optional[str] = None
+) -> List[str]:
+    """
+    Generate markdown file from a JSONL export.
+
+    Rebuilds the markdown documentation from the records in a JSONL export, without reading any source files. The
+    export is read twice (once for the index, once for the sections), so that only one module is held in memory.
+
+    :param jsonl_file_name: The path to a JSONL export.
+    :param output_file_name: The output file name for the .md file.
+    :param templates_file: The path to a JSON file with templates that override the default templates (if any).
+    :return: The names of the documented modules.
+    """
+    templates = load_templates(templates_file)
+    module_names = []
+    with timings.phase("write"), open(output_file_name, "w") as doc:
+        writer = MarkdownWriter(doc)
+        writer.write([templates.header(1, c.FILE.DEFAULT_HEADER)])
+        with timings.phase("render"):
+            for mod in jsonl.read_jsonl(jsonl_file_name):
+                writer.write(iter_module_index(mod, "", templates))
+            for mod in jsonl.read_jsonl(jsonl_file_name):
+                writer.write(iter_module_markdown(mod, "", templates))
+                module_names.append(mod.module)
+    return module_names
+
+
+def _add_to_readme(root: str = ".") -> None:
+    """
+    Add a reference to the code documentation to the README.md file in the wd (if not present yet).
+
+    :param root: The directory that holds the README.md file.
+    """
+    readme_path = os.path.join(root, "README.md")
+    if os.path.exists(readme_path):
+        with open(readme_path, "r") as readme:
+            readme_file = readme.read()
+            readme.close()
+            if c.FILE.DOCUMENTATION_REF not in readme_file:
+                readme_file += c.FILE.DOCUMENTATION_REF
+                with open(readme_path, "w") as readme:
+                    readme.write(readme_file)
+    else:
+        where = "current wd" if root == "." else root
+        console.secho(f"No README.md found in {where}. --add-to-readme option ignored", bold=True, fg="yellow")
+
+
+def split_file_path(output_file_name: str, module_name: str) -> str:
+    """
+    Split file path.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :param module_name: The module name.
+    :return: The path to the file that documents the module in split mode, in a directory named after the output file.
+    """
+    return os.path.join(os.path.splitext(output_file_name)[0], f"{module_name}.md")
+
+
+def _link(path: str, start: str) -> str:
+    """
+    Link.
+
+    :param path: The path to the target file.
+    :param start: The path to the file that contains the link.
+    :return: The relative path from the file that contains the link to the target file, with forward slashes.
+    """
+    return Path(os.path.relpath(path, os.path.dirname(os.path.abspath(start)))).as_posix()
+
+
+def _has_content(path: str, text: str) -> bool:
+    """
+    Check whether a file exists and holds a text.
+
+    :param path: The path to the file.
+    :param text: A string.
+    :return: True if the file holds the text.
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, "r") as existing:
+        return existing.read() == text
+
+
+def _write_if_changed(path: str, chunks: Iterable[str]) -> bool:
+    """
+    Write a file atomically, unless its content did not change.
+
+    Unchanged files are left untouched, so that their modification times (and any caches downstream) remain valid.
+
+    :param path: The path to the file.
+    :param chunks: An iterable of strings.
+    :return: True if the file was written.
+    """
+    text = "".join(chunks)
+    if _has_content(path, text):
+        return False
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as doc:
+        doc.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _stale_files(output_file_name: str, paths: Iterable[str]) -> List[str]:
+    """
+    Find the markdown files of modules that are no longer documented.
+
+    Only files that a previous run recorded as generated (see incremental.save_generated_files) are considered, so that
+    other files in the directory are never touched.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :param paths: The paths to the files of the documented modules.
+    :return: The paths to the files of the modules that are no longer documented.
+    """
+    directory = os.path.splitext(output_file_name)[0]
+    keep = {os.path.abspath(path) for path in paths}
+    stale = []
+    for rel_path in incremental.load_generated_files(output_file_name):
+        path = os.path.normpath(os.path.join(directory, rel_path))
+        if (
+            rel_path.endswith(".md")
+            and not os.path.isabs(rel_path)
+            and not os.path.relpath(path, directory).startswith(os.pardir)
+            and os.path.abspath(path) not in keep
+            and os.path.isfile(path)
+        ):
+            stale.append(path)
+    return stale
+
+
+def _remove_stale_files(output_file_name: str, paths: List[str]) -> None:
+    """
+    Remove the markdown files of modules that are no longer documented.
+
+    Directories that are left empty by the removal are removed as well.
+
+    :param output_file_name: The output file name for the .md (index) file.
+    :param paths: The paths to the files of the documented modules.
+    """
+    directory = os.path.splitext(output_file_name)[0]
+    for path in _stale_files(output_file_name, paths):
+        os.remove(path)
+        parent = os.path.dirname(path)
+        while os.path.abspath(parent) != os.path.abspath(directory) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+
+def _index_entry(obj: MarkDownModuleObject, path: str, output_file_name: str, templates: Templates) -> str:
+    """
+    Render the entries of a module in the hierarchical index of split mode.
+
+    :param obj: An object conforming with MarkDownModuleObject (or its summary).
+    :param path: The path to the file of the module.
+    :param output_file_name: The output file name for the .md (index) file.
+    :param templates: The compiled templates.
+    :return: Markdown syntax.
     """
-    mod_obj = [process_module(mod, args) for mod in modules]
+    return "".join(iter_module_index(obj, _link(path, output_file_name), templates))
 
-    md_string = ""
-    md_string += add_header(1, c.FILE.DEFAULT_HEADER)
 
-    # Construct hierarchical index
-    for mod in mod_obj:
-        md_string += add_index([mod.module])  # Add module link
-        if mod.class_markdown_objects:
-            for m in mod.class_markdown_objects:
-                md_string += add_index([m.class_name], 1)  # Add class link
-                for myclass in m.function_objects:
-                    md_string += add_index([f"{myclass.function_name}"], 2)  # Add class.function link
+def _split_index(entries: List[str], templates: Templates) -> str:
+    """
+    Render the hierarchical index of split mode.
+
+    :param entries: The index entries of the documented modules (see _index_entry).
+    :param templates: The compiled templates.
+    :return: Markdown syntax.
+    """
+    return templates.header(1, c.FILE.DEFAULT_HEADER) + "".join(entries)
+
+
+def _iter_split_files(
+    args, modules: List[Module], output_file_name: str, templates: Templates, source_hashes: Optional[List[str]] = None
+) -> Iterator[Tuple[Module, MarkDownModuleObject, str, str]]:
+    """
+    Extract modules and render their files in split mode.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md (index) file.
+    :param templates: The compiled templates.
+    :param source_hashes: The source hashes of the modules, if they have been computed already.
+    :return: An iterator over the modules, their objects, the paths to their files and the content of these files, in
+        the same order as the input modules. Modules that failed to process (in isolated mode) are left out.
+    """
 
-        if mod.function_markdown_objects:
-            for f in mod.function_markdown_objects:
-                md_string += add_index([f.function_name], 1)  # Add function link
+    def render(mod: Module, obj: MarkDownModuleObject) -> Iterator[str]:
+        return iter_module_markdown(
+            obj, _link(output_file_name, split_file_path(output_file_name, mod.name)), templates
+        )
+
+    extracted = iter_extract_modules(modules, args, source_hashes)
+    for mod, obj, chunks in _iter_rendered(extracted, render, _render_threads(args)):
+        if obj is None:
+            continue
+        with timings.phase("render", mod.name):
+            text = "".join(chunks)
+        yield mod, obj, split_file_path(output_file_name, mod.name), text
+
+
+def generate_split_markdown_files(args, modules: List[Module], output_file_name: str, root: str = ".") -> List[Module]:
+    """
+    Generate split markdown files.
 
-    for mod in mod_obj:
-        md_string += convert_markdown_module_object_to_markdown(mod)
+    Documents every module in a separate file, in a directory named after the output file, and writes the hierarchical
+    index (with links into the files of the modules) to the output file itself. Files are only written if their content
+    changed. Modules are written as soon as they are extracted; only their index entries are kept for the index. The
+    generated files, and the hashes of the sources, files and index entries of the modules, are recorded in a manifest
+    (see incremental.build_split_manifest), for --check.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md (index) file.
+    :param root: The root directory of the modules (which holds the README.md file).
+    :return: The documented modules (modules that failed to process in isolated mode are left out).
+    """
+    templates = load_templates(args.templates)
+    with timings.phase("incremental"):
+        source_hashes = hash_sources(modules, args)
+    hashes = dict(zip([mod.name for mod in modules], source_hashes))
+    documented, paths, entries, file_hashes, pending = [], [], [], [], []
+    n_written = 0
+    # Rendered files are written in windows, so that the writes in a window run concurrently.
+    window = c.IO.WINDOW if args.io_concurrency > 1 else 1
+
+    def write_pending() -> int:
+        with timings.phase("write"):
+            n_pending = sum(async_io.gather(lambda item: _write_if_changed(*item), pending, args.io_concurrency))
+        pending.clear()
+        return n_pending
+
+    with _open_export(args, modules, root) if args.jsonl else nullcontext() as export:
+        for mod, obj, path, text in _iter_split_files(args, modules, output_file_name, templates, source_hashes):
+            if export is not None:
+                with timings.phase("write"):
+                    export(obj)
+            pending.append((path, text))
+            if len(pending) >= window:
+                n_written += write_pending()
+            documented.append(mod)
+            paths.append(path)
+            file_hashes.append(incremental.hash_text(text))
+            with timings.phase("render"):
+                entries.append(_index_entry(obj, path, output_file_name, templates))
+    n_written += write_pending()
 
     if args.add_to_readme:
-        if os.path.exists("README.md"):
-            with open("README.md", "r") as readme:
-                readme_file = readme.read()
-                readme.close()
-                if c.FILE.DOCUMENTATION_REF not in readme_file:
-                    readme_file += c.FILE.DOCUMENTATION_REF
-                    with open("README.md", "w") as readme:
-                        readme.write(readme_file)
+        _add_to_readme(root)
+
+    with timings.phase("write"):
+        with timings.phase("render"):
+            index = _split_index(entries, templates)
+        n_written += _write_if_changed(output_file_name, [index])
+        _remove_stale_files(output_file_name, paths)
+    with timings.phase("incremental"):
+        directory = os.path.splitext(output_file_name)[0]
+        manifest = incremental.build_split_manifest(
+            args,
+            [Path(os.path.relpath(path, directory)).as_posix() for path in paths],
+            [mod.name for mod in documented],
+            [hashes[mod.name] for mod in documented],
+            file_hashes,
+            [incremental.hash_text(entry) for entry in entries],
+            incremental.hash_text(index),
+        )
+        incremental.save_split_manifest(output_file_name, manifest)
+
+    console.secho(f"Wrote {n_written} files; {len(paths) + 1 - n_written} files were unchanged.", bold=True)
+    return documented
+
+
+def _changed_modules(args, modules: List[Module], output_file_name: str) -> Tuple[Optional[dict], List[str], List[int]]:
+    """
+    Find the modules whose source changed since the output file was generated with --incremental.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md file.
+    :return: The manifest of the output file (None if there is no manifest that describes the file), the source hashes
+        of the modules, and the indices of the modules that need to be rendered (all modules if there is no manifest).
+    """
+    with timings.phase("incremental"):
+        source_hashes = hash_sources(modules, args)
+        manifest = incremental.load_manifest(output_file_name)
+        if not incremental.matches_output(manifest, args, [mod.name for mod in modules], output_file_name):
+            return None, source_hashes, list(range(len(modules)))
+
+    changed = [
+        i
+        for i, (m, source_hash) in enumerate(zip(manifest["modules"], source_hashes))
+        if m["source_hash"] != source_hash
+    ]
+    return manifest, source_hashes, changed
+
+
+def _assemble_parts(
+    rendered: List[Optional[Tuple[MarkDownModuleObject, int]]],
+    changed: List[int],
+    n_modules: int,
+    manifest: Optional[dict],
+) -> Tuple[List[int], List[Optional[Tuple[MarkDownModuleObject, int]]]]:
+    """
+    Assemble the parts of the output file.
+
+    :param rendered: The parts of the rendered modules (see _render_sections).
+    :param changed: The indices of the rendered modules.
+    :param n_modules: The number of modules.
+    :param manifest: The manifest of the existing output file, or None if all modules were rendered.
+    :return: The indices of the documented modules, and their parts (see _write_markdown_file). Without a manifest,
+        modules that failed to process (in isolated mode) are left out of the documentation; with a manifest, their
+        previous parts are kept.
+    """
+    if manifest is None:
+        documented = [i for i, part in enumerate(rendered) if part is not None]
+        return documented, [rendered[i] for i in documented]
+
+    parts = [None] * n_modules
+    for i, part in zip(changed, rendered):
+        parts[i] = part
+    return list(range(n_modules)), parts
+
+
+def generate_markdown_file(args, modules: List[Module], output_file_name: str, root: str = ".") -> List[Module]:
+    """
+    Generate markdown file.
+
+    Modules are extracted and rendered one at a time, so that the memory use is bounded by the largest module rather
+    than by the whole code base: the sections are spooled to a temporary file, and only a name-only summary of every
+    module is kept for the index, which precedes the sections in the output file. In incremental mode, only the
+    modules whose source changed since the previous run are re-rendered and spliced into the existing file. The
+    manifest of the output file is written in either mode.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md file.
+    :param root: The root directory of the modules (which holds the README.md file).
+    :return: The documented modules (modules that failed to process in isolated mode are left out).
+    """
+    if args.split:
+        return generate_split_markdown_files(args, modules, output_file_name, root)
+
+    templates = load_templates(args.templates)
+    manifest, changed = None, list(range(len(modules)))
+    if args.incremental:
+        manifest, source_hashes, changed = _changed_modules(args, modules, output_file_name)
+    else:
+        with timings.phase("incremental"):
+            source_hashes = hash_sources(modules, args)
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as spool:
+        with _open_export(args, modules, root) if args.jsonl and manifest is None else nullcontext() as export:
+            rendered = _render_sections(
+                args,
+                [modules[i] for i in changed],
+                spool,
+                export,
+                templates,
+                [source_hashes[i] for i in changed],
+            )
+
+        if manifest is not None:
+            if args.jsonl:
+                # Unchanged modules are not extracted in incremental mode; they are loaded from the cache for the
+                # export.
+                with _open_export(args, modules, root) as export:
+                    for _, obj in iter_extract_modules(modules, args, source_hashes):
+                        if obj is not None:
+                            with timings.phase("write"):
+                                export(obj)
+            for i, part in zip(changed, rendered):
+                if part is None:
+                    # The previous parts of a module that failed to process are kept; retry it in the next run.
+                    source_hashes[i] = manifest["modules"][i]["source_hash"]
+
+        documented, parts = _assemble_parts(rendered, changed, len(modules), manifest)
+        modules = [modules[i] for i in documented]
+        source_hashes = [source_hashes[i] for i in documented]
+
+        if args.add_to_readme:
+            _add_to_readme(root)
+
+        if not any(part is not None for part in parts):
+            return modules
+
+        header = templates.header(1, c.FILE.DEFAULT_HEADER)
+        with timings.phase("write"):
+            writer, index_lengths, section_lengths, _ = _write_markdown_file(
+                output_file_name, header, parts, spool, manifest, templates
+            )
+
+    # The manifest is written on every run, so that a later run with --incremental or --check can tell which modules
+    # changed.
+    with timings.phase("incremental"):
+        manifest = incremental.build_manifest(
+            args,
+            [mod.name for mod in modules],
+            source_hashes,
+            len(header),
+            index_lengths,
+            section_lengths,
+            writer.hexdigest(),
+        )
+        incremental.save_manifest(output_file_name, manifest)
+
+    return modules
+
+
+def _hash_file(path: str) -> Optional[str]:
+    """
+    Hash a file.
+
+    :param path: The path to the file.
+    :return: The hash of the file (see incremental.hash_output), or None if it cannot be read.
+    """
+    try:
+        return incremental.hash_output(path)
+    except OSError:
+        return None
+
+
+def _check_split_markdown_files(args, modules: List[Module], output_file_name: str) -> List[str]:
+    """
+    Check split markdown files.
+
+    Compares the files of the modules and the hierarchical index with the existing files, without writing to them. The
+    source hashes of the modules, and the hashes of their files, are compared with those in the manifest of the split
+    files: only the modules whose source or file changed are extracted and rendered, and the index is up to date if
+    their index entries did not change. Without a manifest that matches the modules, all modules are rendered.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md (index) file.
+    :return: The files that are out of date (with the names of their modules).
+    """
+    templates = load_templates(args.templates)
+    paths = [split_file_path(output_file_name, mod.name) for mod in modules]
+    with timings.phase("incremental"):
+        source_hashes = hash_sources(modules, args)
+        manifest = incremental.load_split_manifest(output_file_name)
+        recorded = incremental.split_manifest_modules(manifest, args, [mod.name for mod in modules])
+        suspects = list(range(len(modules)))
+        if recorded is not None:
+            file_hashes = async_io.gather(_hash_file, paths, args.io_concurrency)
+            suspects = [
+                i
+                for i, (m, source_hash, file_hash) in enumerate(zip(recorded, source_hashes, file_hashes))
+                if m.get("source_hash") != source_hash or m.get("file_hash") != file_hash
+            ]
+
+    stale, entries = [], {}
+    suspect_modules = [modules[i] for i in suspects]
+    suspect_hashes = [source_hashes[i] for i in suspects]
+    for mod, obj, path, text in _iter_split_files(args, suspect_modules, output_file_name, templates, suspect_hashes):
+        with timings.phase("write"):
+            if not _has_content(path, text):
+                stale.append(f"{path} ({mod.name})")
+        with timings.phase("render"):
+            entries[mod.name] = _index_entry(obj, path, output_file_name, templates)
+
+    # Modules that failed to process (in isolated mode) are left out of the documentation.
+    rendered = set(suspects)
+    documented = [i for i, mod in enumerate(modules) if mod.name in entries or i not in rendered]
+    with timings.phase("write"):
+        if recorded is None:
+            index = _split_index([entries[modules[i].name] for i in documented], templates)
+            index_stale = not _has_content(output_file_name, index)
         else:
-            typer.secho(
-                "No README.md found in current wd. --add-to-readme option ignored", bold=True, fg=typer.colors.YELLOW
+            index_stale = (
+                len(documented) < len(modules)
+                or any(
+                    incremental.hash_text(entries[modules[i].name]) != recorded[i].get("index_hash") for i in suspects
+                )
+                or _hash_file(output_file_name) != manifest.get("output_hash")
+            )
+        if index_stale:
+            stale.append(output_file_name)
+        documented_paths = [paths[i] for i in documented]
+        stale.extend(f"{path} (no longer documented)" for path in _stale_files(output_file_name, documented_paths))
+    return stale
+
+
+def check_markdown_file(args, modules: List[Module], output_file_name: str) -> List[str]:
+    """
+    Check markdown file.
+
+    Checks that the output file is up to date, without writing to it (or to the README.md file). The source hashes of
+    the modules are compared with those in the manifest that was written with the output file: if none changed, the
+    file is up to date without extracting any module. Otherwise, only the modules whose source changed are extracted and
+    rendered, and spliced between the parts of the other modules in the existing file, to compare the hash of the
+    result with the hash of the file. Without a manifest that matches the file, all modules are rendered and compared.
+
+    :param args: User-specified arguments.
+    :param modules: A list of (selected) modules in the wd.
+    :param output_file_name: The output file name for the .md file.
+    :return: The files (in split mode) or modules that are out of date; empty if the output is up to date.
+    """
+    if args.split:
+        return _check_split_markdown_files(args, modules, output_file_name)
+    if not os.path.isfile(output_file_name):
+        return [output_file_name]
+
+    templates = load_templates(args.templates)
+    manifest, source_hashes, changed = _changed_modules(args, modules, output_file_name)
+    if manifest is not None and not changed:
+        return []
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as spool:
+        rendered = _render_sections(
+            args, [modules[i] for i in changed], spool, None, templates, [source_hashes[i] for i in changed]
+        )
+        _, parts = _assemble_parts(rendered, changed, len(modules), manifest)
+        header = templates.header(1, c.FILE.DEFAULT_HEADER)
+        with timings.phase("write"):
+            writer, _, _, differing = _write_markdown_file(
+                output_file_name, header, parts, spool, manifest, templates, True
             )
 
-    with open(output_file_name, "w") as doc:
-        doc.write(md_string)
+    expected_hash = manifest["output_hash"] if manifest else incremental.hash_output(output_file_name)
+    if writer.hexdigest() == expected_hash:
+        return []
+    return [modules[i].name for i in differing] or [output_file_name]
 
 
 def check_md_file(md_file_name: str) -> str:
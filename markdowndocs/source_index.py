@@ -0,0 +1,220 @@
+"""
+Per-module source index.
+
+Reads a module source file once, computes the line spans of every function and method definition in a single pass over
+its syntax tree, and slices the source code of functions out of that single buffer. The source code can also be
+referred to lazily, as byte offsets into the source file, so that extracted objects do not hold a copy of the source.
+"""
+
+import ast
+import hashlib
+import inspect
+import os
+import re
+import tokenize
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from markdowndocs import constants as c
+
+
+# Line endings, as recognized by the Python tokenizer (and by files opened with universal newlines).
+_LINE_ENDINGS = re.compile(rb"\r\n?|\n")
+
+
+class SourceChangedError(RuntimeError):
+    """Raised when a source file changed between the extraction and the rendering of its documentation."""
+
+
+@lru_cache(maxsize=c.SOURCE.BUFFER_CACHE_SIZE)
+def _read_source(path: str, digest: bytes) -> bytes:
+    """
+    Read a source file, and check that it did not change since it was indexed.
+
+    Modules are rendered one after the other, so a few buffers suffice to read every file only once.
+
+    :param path: The path to the source file.
+    :param digest: The sha1 digest of the source file when it was indexed.
+    :return: The content of the source file.
+    """
+    with open(path, "rb") as source_file:
+        buffer = source_file.read()
+    if hashlib.sha1(buffer).digest() != digest:
+        raise SourceChangedError(f"{path} changed while its documentation was generated; please run again.")
+    return buffer
+
+
+def _decode(source: bytes, encoding: str) -> str:
+    """
+    Decode source code with universal newlines, as inspect.getsource returns it.
+
+    :param source: A slice of a source file.
+    :param encoding: The encoding of the source file.
+    :return: The source code, with "\\n" line endings.
+    """
+    text = source.decode(encoding)
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+class SourceFile:
+    """
+    Source file.
+
+    Identifies the content of a source file (by its digest), without holding it in memory.
+    """
+
+    __slots__ = ("path", "digest", "encoding")
+
+    def __init__(self, path: str, digest: bytes, encoding: str):
+        """
+        Initialize the source file.
+
+        :param path: The path to the source file.
+        :param digest: The sha1 digest of the content of the source file.
+        :param encoding: The encoding of the source file.
+        """
+        self.path = path
+        self.digest = digest
+        self.encoding = encoding
+
+    def read(self) -> bytes:
+        """
+        Read.
+
+        :return: The content of the source file.
+        """
+        return _read_source(self.path, self.digest)
+
+
+class SourceSegment:
+    """
+    Source segment.
+
+    The source code of a definition, stored as byte offsets into a source file and materialized (as a string) when it
+    is rendered. Segments compare equal to the strings they materialize to, and are pickled as strings.
+    """
+
+    __slots__ = ("source_file", "start", "end")
+
+    def __init__(self, source_file: SourceFile, start: int, end: int):
+        """
+        Initialize the segment.
+
+        :param source_file: The source file that holds the segment.
+        :param start: The byte offset of the start of the segment.
+        :param end: The byte offset of the end of the segment (exclusive).
+        """
+        self.source_file = source_file
+        self.start = start
+        self.end = end
+
+    def __str__(self) -> str:
+        return _decode(self.source_file.read()[self.start : self.end], self.source_file.encoding)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __bool__(self) -> bool:
+        return self.end > self.start
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, SourceSegment)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __reduce__(self):
+        return str, (str(self),)
+
+
+class SourceIndex:
+    """
+    Source index.
+
+    Holds the source of a module file, the byte offsets of its lines and the spans of all function definitions, keyed
+    by their first line (including decorators).
+    """
+
+    def __init__(self, path: str):
+        """
+        Read and index a module source file.
+
+        :param path: The path to a module source file.
+        """
+        self.path = os.path.normcase(os.path.abspath(path))
+        with open(path, "rb") as source_file:
+            self.buffer = source_file.read()
+
+        self.encoding = tokenize.detect_encoding(iter(self.buffer[:1024].splitlines(keepends=True)).__next__)[0]
+        self.line_offsets: List[int] = [0] + [m.end() for m in _LINE_ENDINGS.finditer(self.buffer)] + [len(self.buffer)]
+        self.tree = ast.parse(self.buffer, filename=path)
+        self.source_file = SourceFile(self.path, hashlib.sha1(self.buffer).digest(), self.encoding)
+
+        self.spans: Dict[int, int] = {}
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.spans[self.first_line(node)] = node.end_lineno
+
+    @staticmethod
+    def first_line(node: ast.AST) -> int:
+        """
+        First line of a definition, including its decorators.
+
+        :param node: A function or class definition node.
+        :return: The (1-based) line number.
+        """
+        return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+    def segment(self, start: int, end: int) -> str:
+        """
+        Segment.
+
+        :param start: The first line of the segment (1-based).
+        :param end: The last line of the segment (inclusive).
+        :return: The source code of the lines, with (universal) line endings.
+        """
+        return _decode(
+            self.buffer[self.line_offsets[start - 1] : self.line_offsets[min(end, len(self.line_offsets) - 1)]],
+            self.encoding,
+        )
+
+    def lazy_segment(self, start: int, end: int) -> SourceSegment:
+        """
+        Lazy segment.
+
+        :param start: The first line of the segment (1-based).
+        :param end: The last line of the segment (inclusive).
+        :return: A segment that materializes to the source code of the lines.
+        """
+        return SourceSegment(
+            self.source_file, self.line_offsets[start - 1], self.line_offsets[min(end, len(self.line_offsets) - 1)]
+        )
+
+    def node_source(self, node: ast.AST, lazy: bool = False) -> Union[str, SourceSegment]:
+        """
+        Node source.
+
+        :param node: A function definition node from the index's syntax tree.
+        :param lazy: If true, returns a SourceSegment instead of a string.
+        :return: The source code of the definition, including its decorators.
+        """
+        return (self.lazy_segment if lazy else self.segment)(self.first_line(node), node.end_lineno)
+
+    def function_source(self, func: callable, lazy: bool = False) -> Optional[Union[str, SourceSegment]]:
+        """
+        Function source.
+
+        :param func: A function defined in the indexed module.
+        :param lazy: If true, returns a SourceSegment instead of a string.
+        :return: The source code of the function, as inspect.getsource would return it; None if the function is not
+            defined in the indexed file or its span is unknown (e.g. for lambdas).
+        """
+        code = getattr(inspect.unwrap(func), "__code__", None)
+        if code is None or os.path.normcase(os.path.abspath(code.co_filename)) != self.path:
+            return None
+        end = self.spans.get(code.co_firstlineno)
+        if end is None:
+            return None
+        return (self.lazy_segment if lazy else self.segment)(code.co_firstlineno, end)
@@ -0,0 +1,210 @@
+"""
+Static extraction of documentation objects.
+
+Builds MarkDownModuleObject instances straight from the source text of a module using the ast module, so that user
+code (and its transitive dependencies) never has to be imported.
+"""
+
+import ast
+import os
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject, Module
+from markdowndocs.source_index import SourceIndex
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+# Decorators that turn a function or method into something inspect.isfunction does not pick up. Other decorators are
+# assumed to return a function, which is only known for certain at run time.
+NON_FUNCTION_DECORATORS = {"cache", "cached_property", "classmethod", "lru_cache", "property"}
+NON_FUNCTION_DECORATOR_SUFFIXES = ("setter", "getter", "deleter")
+
+
+def _decorator_name(node: ast.expr) -> str:
+    """
+    Decorator name.
+
+    :param node: A decorator expression.
+    :return: The (dotted) name of the decorator, or an empty string if it cannot be determined statically.
+    """
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_decorator_name(node.value)}.{node.attr}"
+    return ""
+
+
+def _is_plain_function(node: FunctionNode) -> bool:
+    """
+    Check whether a function or method is exposed as a plain function.
+
+    :param node: A function definition node.
+    :return: False if the function is wrapped in a decorator that returns a non-function, such as a classmethod,
+        property or lru_cache.
+    """
+    for decorator in node.decorator_list:
+        name = _decorator_name(decorator)
+        if name.split(".")[-1] in NON_FUNCTION_DECORATORS or name.endswith(NON_FUNCTION_DECORATOR_SUFFIXES):
+            return False
+    return True
+
+
+def _mangle(class_name: str, name: str) -> str:
+    """
+    Apply private name mangling, mirroring the attribute names reported by inspect.getmembers.
+
+    :param class_name: The name of the class that defines the attribute.
+    :param name: The attribute name.
+    :return: The mangled attribute name.
+    """
+    if name.startswith("__") and not name.endswith("__") and class_name.strip("_"):
+        return f"_{class_name.lstrip('_')}{name}"
+    return name
+
+
+def _bound_names(node: ast.stmt) -> List[str]:
+    """
+    Names bound by an import statement.
+
+    :param node: An import or import-from node.
+    :return: The names bound in the enclosing namespace.
+    """
+    return [(alias.asname or alias.name).split(".")[0] for alias in node.names]
+
+
+def _is_local_module(module: str, name: str, root: str = ".") -> bool:
+    """
+    Check whether an imported name refers to a module in the root directory of the modules.
+
+    Only the file system is consulted, so that no code is executed.
+
+    :param module: The dotted name of the package the name is imported from.
+    :param name: The imported name.
+    :param root: The root directory of the modules (from which they are imported).
+    :return: True if the name resolves to a module or package in the root directory.
+    """
+    candidate = os.path.join(root, *module.split("."), name)
+    return os.path.isfile(f"{candidate}.py") or os.path.isfile(os.path.join(candidate, "__init__.py"))
+
+
+def _function_object(qualname: str, node: FunctionNode, source_index: SourceIndex, args) -> FunctionObject:
+    """
+    Create a FunctionObject from a function definition node.
+
+    :param qualname: The qualified name of the function.
+    :param node: A function definition node.
+    :param source_index: The source index of the module.
+    :param args: User-specified options.
+    :return: A populated FunctionObject.
+    """
+    return FunctionObject(
+        function_name=qualname,
+        function_description=ast.get_docstring(node, clean=False),
+        code=None if args.exclude_code else source_index.node_source(node, lazy=True),
+    )
+
+
+def _class_methods(
+    class_node: ast.ClassDef, classes: Dict[str, ast.ClassDef], seen: Optional[set] = None
+) -> Dict[str, Optional[Tuple[str, FunctionNode]]]:
+    """
+    Collect the methods of a class, including those inherited from base classes defined in the same module.
+
+    :param class_node: A class definition node.
+    :param classes: All top-level class definitions in the module, by name.
+    :param seen: Names of the classes that have already been visited (guards against cyclic definitions).
+    :return: A dictionary mapping attribute names to (class name, function node) tuples, or None for attributes that
+        shadow a function with a non-function value.
+    """
+    seen = (seen or set()) | {class_node.name}
+    methods = {}
+
+    # Bases listed first take precedence, so they are merged in reverse order.
+    for base in reversed(class_node.bases):
+        if isinstance(base, ast.Name) and base.id in classes and base.id not in seen:
+            methods.update(_class_methods(classes[base.id], classes, seen))
+
+    for node in class_node.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            name = _mangle(class_node.name, node.name)
+            methods[name] = (class_node.name, node) if _is_plain_function(node) else None
+    return methods
+
+
+def parse_module(mod: Module, path: str, args) -> MarkDownModuleObject:
+    """
+    Parse module.
+
+    Statically extracts the docstrings, classes, functions and dependencies of a module and adds this information to a
+    MarkDownModuleObject instance, following the same member selection and ordering as the import-based extraction.
+
+    :param mod: The module that will be processed.
+    :param path: The path to the module source file.
+    :param args: argparse.Namespace from the CLI.
+    :return: An object conforming with MarkDownModuleObject.
+    """
+    source_index = SourceIndex(path)
+    tree = source_index.tree
+
+    dependencies, classes, functions = {}, {}, {}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                bound = alias.asname or alias.name.split(".")[0]
+                dependencies[bound] = alias.name if alias.asname else bound
+                functions.pop(bound, None)
+                classes.pop(bound, None)
+        elif isinstance(node, ast.ImportFrom):
+            for alias, bound in zip(node.names, _bound_names(node)):
+                functions.pop(bound, None)
+                classes.pop(bound, None)
+                dependencies.pop(bound, None)
+                if node.module and not node.level and _is_local_module(node.module, alias.name, mod.root):
+                    dependencies[bound] = f"{node.module}.{alias.name}"
+        elif isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+            functions.pop(node.name, None)
+            dependencies.pop(node.name, None)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if _is_plain_function(node):
+                functions[node.name] = node
+            else:
+                functions.pop(node.name, None)
+            classes.pop(node.name, None)
+            dependencies.pop(node.name, None)
+
+    markdown_module_object = MarkDownModuleObject(
+        module=mod.name,
+        module_description=ast.get_docstring(tree, clean=False),
+        class_markdown_objects=[],
+        function_markdown_objects=[],
+        dependencies=[],
+    )
+
+    if not args.exclude_dependencies:
+        markdown_module_object.dependencies = [sys.intern(dependencies[name]) for name in sorted(dependencies)]
+
+    for class_name in sorted(classes):
+        class_node = classes[class_name]
+        class_markdown_object = MarkdownClassObject(
+            class_name=class_name, class_description=ast.get_docstring(class_node, clean=False), function_objects=[]
+        )
+
+        methods = {name: method for name, method in _class_methods(class_node, classes).items() if method}
+        # __init__ order is not preserved in the case of classes with private methods.
+        names = sorted(methods, key=lambda name: (name != "__init__", name))
+        class_markdown_object.function_objects = [
+            _function_object(f"{methods[name][0]}.{methods[name][1].name}", methods[name][1], source_index, args)
+            for name in names
+        ]
+        markdown_module_object.class_markdown_objects.append(class_markdown_object)
+
+    names = sorted(functions, key=lambda name: (name != "__init__", name))
+    markdown_module_object.function_markdown_objects = [
+        _function_object(name, functions[name], source_index, args) for name in names
+    ]
+
+    return markdown_module_object
@@ -0,0 +1,235 @@
+"""
+Markdown templates.
+
+The fragments of the generated markdown (headers, navigation links, index entries, descriptions and source code blocks)
+are rendered from templates with {field} placeholders. Templates are compiled once per run: the static fields (e.g. the
+level of a header, or the symbol of a navigation link) are substituted, and the template is split into its literal text
+and the positions of the dynamic fields, which are joined for every fragment. Templates are never evaluated as code.
+Fragments that do not depend on the documented code (e.g. the "Classes" header, or the link back to the code
+documentation index) are rendered once.
+
+Users can override any of the templates with a JSON file that maps template names to templates.
+"""
+
+import json
+from functools import lru_cache
+from string import Formatter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from markdowndocs import constants as c
+from markdowndocs.md_utils import escape_underscores, gen_anchor
+
+# The default templates, and the fields that each template can use. Static fields are substituted when the template is
+# compiled; the other fields are formatted for every fragment.
+DEFAULTS = {
+    "document_header": "# <a name='{anchor}'></a>{title}",
+    "header": "\n{level} <a name='{anchor}'></a>{title}",
+    "list": "\n{title}{items}",
+    "list_item": "\n{indent}* {item}\n",
+    "index_entry": "[{title}]({file}#{anchor})",
+    "navigation": "\n{symbol} [{target}]({link})\n",
+    "description": "\n{description}",
+    "no_description": "\n*No docstrings available.*",
+    "code": "\n<details>\n<summary>source code</summary>\n\n```python\n{code}\n```\n</details>\n",
+}
+FIELDS = {
+    "document_header": ["anchor", "title"],
+    "header": ["anchor", "title"],
+    "list": ["title", "items"],
+    "list_item": ["item"],
+    "index_entry": ["title", "file", "anchor"],
+    "navigation": ["target", "link"],
+    "description": ["description"],
+    "no_description": [],
+    "code": ["code"],
+}
+STATIC_FIELDS = {"header": ["level"], "list_item": ["indent"], "navigation": ["symbol"]}
+
+
+def compile_template(name: str, template: str, **static: str) -> Callable[..., str]:
+    """
+    Compile a template.
+
+    :param name: The name of the template.
+    :param template: A template with {field} placeholders.
+    :param static: The values of the static fields of the template.
+    :return: A function that takes the (other) fields of the template as positional arguments, in the order of
+        FIELDS[name], and returns the formatted fragment.
+    """
+    allowed = set(FIELDS[name]) | set(STATIC_FIELDS.get(name, []))
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Template {name!r} is invalid: {e}") from e
+
+    # The template is split once into its literal text, with the static fields substituted, and the positions of the
+    # arguments of the other fields; rendering a fragment joins the two.
+    literals, positions = [""], []
+    for literal, field, spec, conversion in parsed:
+        literals[-1] += literal
+        if field is None:
+            continue
+        if spec or conversion:
+            raise ValueError(f"Template {name!r} does not support conversions or format specs: {{{field}}}")
+        if field not in allowed:
+            placeholders = ", ".join(f"{{{allowed_field}}}" for allowed_field in sorted(allowed))
+            raise ValueError(f"Template {name!r} supports the placeholders {placeholders}, not {{{field}}}")
+        if field in static:
+            literals[-1] += static[field]
+        else:
+            positions.append(FIELDS[name].index(field))
+            literals.append("")
+    return _join(literals, positions)
+
+
+def _join(literals: List[str], positions: List[int]) -> Callable[..., str]:
+    """
+    Join a split template.
+
+    :param literals: The literal text of the template, before, between and after the fields.
+    :param positions: The positions of the arguments of the fields.
+    :return: A function that takes the fields as positional arguments and returns the formatted fragment.
+    """
+    # Templates have at most three fields (unless a field is repeated), which are joined without a loop.
+    if len(positions) == 0:
+        (l0,) = literals
+        return lambda *values: l0
+    if len(positions) == 1:
+        l0, l1 = literals
+        (i,) = positions
+        return lambda *values: f"{l0}{values[i]}{l1}"
+    if len(positions) == 2:
+        l0, l1, l2 = literals
+        i, j = positions
+        return lambda *values: f"{l0}{values[i]}{l1}{values[j]}{l2}"
+    if len(positions) == 3:
+        l0, l1, l2, l3 = literals
+        i, j, k = positions
+        return lambda *values: f"{l0}{values[i]}{l1}{values[j]}{l2}{values[k]}{l3}"
+
+    def join(*values) -> str:
+        return literals[0] + "".join([f"{values[i]}{literal}" for i, literal in zip(positions, literals[1:])])
+
+    return join
+
+
+class Templates:
+    """
+    Compiled templates.
+
+    Renders the fragments of the generated markdown.
+    """
+
+    def __init__(self, templates: Optional[Dict[str, str]] = None):
+        """
+        Compile the templates.
+
+        :param templates: Templates that override the defaults, by name.
+        """
+        unknown = sorted(set(templates or {}) - set(DEFAULTS))
+        if unknown:
+            raise ValueError(f"Unknown templates: {', '.join(unknown)} (expected any of {', '.join(DEFAULTS)})")
+        templates = {**DEFAULTS, **(templates or {})}
+        for name, template in templates.items():
+            if not isinstance(template, str):
+                raise ValueError(f"Template {name!r} must be a string")
+
+        self.document_header = compile_template("document_header", templates["document_header"])
+        self.headers = {
+            level: compile_template("header", templates["header"], level="#" * level) for level in range(2, 7)
+        }
+        self.list = compile_template("list", templates["list"])
+        self.list_items = {
+            indent: compile_template("list_item", templates["list_item"], indent="\t" * indent) for indent in range(3)
+        }
+        self.index_entry = compile_template("index_entry", templates["index_entry"])
+        self.navigation = compile_template("navigation", templates["navigation"], symbol=c.FILE.NAVIGATION)
+        self.description = compile_template("description", templates["description"])
+        self.no_description = compile_template("no_description", templates["no_description"])()
+        self.code = compile_template("code", templates["code"])
+
+        self.section_headers = {
+            (level, text): self.header(level, text)
+            for level, text in [(3, "Dependencies"), (3, "Classes"), (3, "Functions"), (5, "Functions")]
+        }
+        self._index_navigation: Dict[str, str] = {}
+
+    def header(self, level: int, header_text: str) -> str:
+        """
+        Header.
+
+        :param level: The header level.
+        :param header_text: The header text.
+        :return: Header markdown syntax.
+        """
+        if level == 1:
+            return self.document_header(gen_anchor(header_text), escape_underscores(header_text))
+        return self.headers[level](gen_anchor(header_text), escape_underscores(header_text))
+
+    def index_navigation(self, index_file: str) -> str:
+        """
+        Navigation link to the code documentation index.
+
+        :param index_file: The (relative) path to the file with the code documentation index.
+        :return: Markdown syntax for the navigation link, which is rendered once per index file.
+        """
+        if index_file not in self._index_navigation:
+            self._index_navigation[index_file] = self.navigation(
+                "code documentation index", f"{index_file}#{gen_anchor(c.FILE.DEFAULT_HEADER)}"
+            )
+        return self._index_navigation[index_file]
+
+    def items(self, items: Iterable[str], indent: int = 0) -> str:
+        """
+        List items.
+
+        :param items: A list of items.
+        :param indent: The indentation level.
+        :return: Markdown syntax for the items of a list.
+        """
+        list_item = self.list_items[indent]
+        return "".join([list_item(item) for item in items])
+
+    def index(self, headers: Iterable[str], indent: int = 0, file_name: str = "") -> str:
+        """
+        Index.
+
+        :param headers: A list of header strings.
+        :param indent: The indentation level for the links.
+        :param file_name: The (relative) path to the file that contains the headers, if it is not the current file.
+        :return: Markdown syntax for an index.
+        """
+        index_entry = self.index_entry
+        return self.list(
+            "", self.items([index_entry(escape_underscores(h), file_name, gen_anchor(h)) for h in headers], indent)
+        )
+
+
+@lru_cache(maxsize=1)
+def _default_templates() -> Templates:
+    """
+    Default templates.
+
+    :return: The compiled default templates, which are compiled once per process.
+    """
+    return Templates()
+
+
+def load_templates(path: Optional[str] = None) -> Templates:
+    """
+    Load templates.
+
+    :param path: The path to a JSON file that maps template names to templates (e.g. {"no_description": ""}), which
+        override the defaults in DEFAULTS. If None, the default templates are used.
+    :return: The compiled templates.
+    """
+    if path is None:
+        return _default_templates()
+    with open(path, "r") as templates_file:
+        templates = json.load(templates_file)
+    if not isinstance(templates, dict):
+        raise ValueError(f"{path}: expected an object that maps template names to templates")
+    try:
+        return Templates(templates)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
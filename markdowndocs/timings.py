@@ -0,0 +1,195 @@
+"""
+Timings.
+
+Records the wall time spent in each phase of a run (discovery, import, inspection, source extraction, rendering and
+writing), per module where possible, together with the growth of the peak memory use of the process while extracting
+each module. Recording is disabled unless the user asks for timings; while disabled, phase() is a no-op.
+"""
+
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, List, Optional
+
+from markdowndocs import version
+
+PHASES = ["discovery", "cache", "incremental", "import", "parse", "source", "inspect", "extract", "render", "write"]
+
+_recorder: Optional["Timings"] = None
+
+
+def _peak_rss() -> Optional[int]:
+    """
+    Peak resident set size of the current process.
+
+    :return: The peak RSS in bytes, or None if it cannot be determined on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Timings:
+    """
+    Timings.
+
+    Phases can be nested; the time spent in a nested phase is only attributed to the nested phase, so that the phase
+    times add up to the wall time of the run.
+    """
+
+    def __init__(self):
+        """
+        Initialize the recorder.
+        """
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.modules: Dict[str, dict] = {}
+        self._stack: List[List[float]] = []
+
+    def _module(self, name: str) -> dict:
+        """
+        Module record.
+
+        :param name: The module name.
+        :return: The (new or existing) record of the module.
+        """
+        if name not in self.modules:
+            self.modules[name] = {"phases": defaultdict(float), "peak_rss_growth_bytes": None}
+        return self.modules[name]
+
+    @contextmanager
+    def phase(self, name: str, module: Optional[str] = None):
+        """
+        Time a phase.
+
+        :param name: The name of the phase.
+        :param module: The name of the module the phase applies to (if any).
+        """
+        nested = [0.0]
+        self._stack.append(nested)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            own = elapsed - nested[0]
+            self.phases[name] += own
+            if module is not None:
+                self._module(module)["phases"][name] += own
+
+    @contextmanager
+    def track_module(self, module: str):
+        """
+        Track the growth of the peak memory use of the process while a module is processed.
+
+        :param module: The module name.
+        """
+        before = _peak_rss()
+        try:
+            yield
+        finally:
+            after = _peak_rss()
+            if before is not None and after is not None:
+                record = self._module(module)
+                record["peak_rss_growth_bytes"] = (record["peak_rss_growth_bytes"] or 0) + after - before
+
+    def report(self) -> dict:
+        """
+        Report.
+
+        :return: A JSON-serializable report with the wall time of the run, the time per phase and the time per phase
+            of every module (slowest modules first).
+        """
+        modules = [
+            {
+                "module": name,
+                "seconds": sum(record["phases"].values()),
+                "phases": dict(record["phases"]),
+                "peak_rss_growth_bytes": record["peak_rss_growth_bytes"],
+            }
+            for name, record in self.modules.items()
+        ]
+        return {
+            "version": version,
+            "total_seconds": time.perf_counter() - self.start,
+            "peak_rss_bytes": _peak_rss(),
+            "phases": {name: self.phases[name] for name in PHASES if name in self.phases},
+            "modules": sorted(modules, key=lambda module: module["seconds"], reverse=True),
+        }
+
+    def summary(self, top: int = 10) -> str:
+        """
+        Summary.
+
+        :param top: The number of slowest modules to list.
+        :return: A human-readable summary of the report.
+        """
+        report = self.report()
+        lines = ["Timings:", "-------------------", f"Total: {report['total_seconds'] * 1000:.1f} ms"]
+        lines += [f" - {name}: {seconds * 1000:.1f} ms" for name, seconds in report["phases"].items()]
+        if report["peak_rss_bytes"] is not None:
+            lines.append(f"Peak memory: {report['peak_rss_bytes'] / 2 ** 20:.1f} MB")
+        if report["modules"]:
+            lines.append("Slowest modules:")
+            for module in report["modules"][:top]:
+                phases = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in module["phases"].items())
+                lines.append(f" - {module['module']}: {module['seconds'] * 1000:.1f} ms ({phases})")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        """
+        Save the report as JSON.
+
+        :param path: The path to the JSON file.
+        """
+        with open(path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+
+def enable() -> Timings:
+    """
+    Start recording timings.
+
+    :return: The recorder.
+    """
+    global _recorder
+    _recorder = Timings()
+    return _recorder
+
+
+def disable() -> None:
+    """
+    Stop recording timings.
+    """
+    global _recorder
+    _recorder = None
+
+
+def phase(name: str, module: Optional[str] = None) -> ContextManager:
+    """
+    Time a phase, if recording is enabled.
+
+    :param name: The name of the phase.
+    :param module: The name of the module the phase applies to (if any).
+    :return: A context manager.
+    """
+    return nullcontext() if _recorder is None else _recorder.phase(name, module)
+
+
+def track_module(module: str) -> ContextManager:
+    """
+    Track the memory use of the process while a module is processed, if recording is enabled.
+
+    :param module: The module name.
+    :return: A context manager.
+    """
+    return nullcontext() if _recorder is None else _recorder.track_module(module)
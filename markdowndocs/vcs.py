@@ -0,0 +1,72 @@
+"""
+Changed files in a local git repository.
+
+Lists the files that changed since a git ref (e.g. the main branch that a CI job compares against) with the git command
+line, so that only the modules in those files need to be extracted. Only the local repository is consulted; nothing is
+fetched.
+"""
+
+import os
+from typing import Iterable, List, Optional, Set
+
+
+def _git(command: List[str], root: str) -> str:
+    """
+    Run a git command.
+
+    :param command: The git command and its arguments (without "git").
+    :param root: A directory in the working tree of the repository, in which the command is run.
+    :return: The output of the command.
+    :raises RuntimeError: If git cannot be run or the command fails.
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(["git", *command], cwd=root, capture_output=True, text=True)
+    except OSError as e:
+        raise RuntimeError(f"git could not be run: {e}") from e
+    if result.returncode != 0:
+        raise RuntimeError(f"git {command[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_files(ref: str, root: str = ".") -> Set[str]:
+    """
+    Changed files.
+
+    Asks git for the Python files under root whose content in the working tree differs from ref (committed, staged and
+    unstaged changes, including deletions), and for the untracked Python files that are not ignored. Other files (e.g.
+    the generated documentation, or the cache of extracted modules) are left out, as they never hold modules.
+
+    :param ref: A git ref (e.g. a branch, a tag or a commit) in the local repository.
+    :param root: A directory in the working tree of the repository.
+    :return: The normalized paths of the changed Python files, relative to root.
+    :raises RuntimeError: If git cannot be run, root is not in a git repository or the ref is unknown.
+    """
+    if ref.startswith("-"):
+        raise RuntimeError(f"{ref!r} is not a git ref")
+
+    commands = [
+        ["diff", "--name-only", "--no-renames", "--relative", "-z", ref, "--", "*.py"],
+        ["ls-files", "--others", "--exclude-standard", "-z", "--", "*.py"],
+    ]
+    changed = set()
+    for command in commands:
+        changed.update(os.path.normpath(path) for path in _git(command, root).split("\0") if path)
+    return changed
+
+
+def working_tree_state(root: str = ".", paths: Optional[Iterable[str]] = None) -> dict:
+    """
+    Working tree state.
+
+    :param root: A directory in the working tree of a git repository.
+    :param paths: The normalized paths (relative to root) of the files to consider; all Python files if None.
+    :return: The commit that is checked out, and the (sorted) files under root that differ from it (see changed_files).
+    :raises RuntimeError: If git cannot be run, or root is not in a git repository with at least one commit.
+    """
+    commit = _git(["rev-parse", "--verify", "HEAD^{commit}"], root).strip()
+    changed = changed_files(commit, root)
+    if paths is not None:
+        changed.intersection_update(paths)
+    return {"commit": commit, "changed": sorted(changed)}
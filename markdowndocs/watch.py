@@ -0,0 +1,110 @@
+"""
+Watch mode.
+
+Keeps the process warm and regenerates the documentation incrementally whenever one of the documented modules changes.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+from markdowndocs import console
+from markdowndocs import constants as c
+from markdowndocs.constants import Module
+from markdowndocs.mddocs import forget_modules, generate_markdown_file, identify_modules
+from markdowndocs.source_index import SourceChangedError
+
+
+def _snapshot(modules: List[Module]) -> Dict[str, int]:
+    """
+    Snapshot.
+
+    :param modules: A list of (selected) modules in the wd.
+    :return: A dictionary mapping module names to the modification times of their source files.
+    """
+    snapshot = {}
+    for mod in modules:
+        try:
+            snapshot[mod.name] = os.stat(mod.path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return snapshot
+
+
+def _wait_until_settled(args, snapshot: Dict[str, int], debounce: float) -> Dict[str, int]:
+    """
+    Wait until no more files change, so that a burst of saves triggers a single regeneration.
+
+    :param args: User-specified arguments.
+    :param snapshot: The snapshot in which the first change was detected.
+    :param debounce: The time (in seconds) without changes after which the files are considered settled.
+    :return: The snapshot of the settled files.
+    """
+    while True:
+        time.sleep(debounce)
+        latest = _snapshot(identify_modules(args))
+        if latest == snapshot:
+            return snapshot
+        snapshot = latest
+
+
+def watch(
+    args,
+    output_file_name: str,
+    interval: float = c.WATCH.POLL_INTERVAL,
+    debounce: float = c.WATCH.DEBOUNCE,
+    polls: Optional[int] = None,
+) -> None:
+    """
+    Watch.
+
+    Generates the documentation, then polls the modification times of the documented modules and regenerates the
+    sections of the modules that changed.
+
+    :param args: User-specified arguments.
+    :param output_file_name: The output file name for the .md file.
+    :param interval: The time (in seconds) between two polls.
+    :param debounce: The time (in seconds) without changes to wait for before regenerating.
+    :param polls: The number of polls after which to stop watching (watches until interrupted if None).
+    """
+    args.incremental = True
+    modules = identify_modules(args)
+    generate_markdown_file(args=args, modules=modules, output_file_name=output_file_name)
+    snapshot = _snapshot(modules)
+    console.secho(f"\nWatching {len(modules)} modules for changes. Press Ctrl+C to stop.", bold=True)
+
+    failed = None
+    while polls is None or polls > 0:
+        time.sleep(interval)
+        polls = None if polls is None else polls - 1
+
+        current = None
+        try:
+            current = _snapshot(identify_modules(args))
+            if current == snapshot or current == failed:
+                continue
+
+            current = _wait_until_settled(args, current, debounce)
+            modules = identify_modules(args)
+            changed = sorted(
+                name for name in current.keys() | snapshot.keys() if current.get(name) != snapshot.get(name)
+            )
+            # Modules imported by name stay in sys.modules, so changed modules have to be executed again.
+            forget_modules([mod for mod in modules if mod.name in changed])
+            generate_markdown_file(args=args, modules=modules, output_file_name=output_file_name)
+        except SourceChangedError as e:
+            # Keep the previous snapshot, so that the documentation is regenerated in the next poll.
+            console.secho(f"\n{e}", bold=True, fg="yellow")
+            continue
+        except (Exception, SystemExit) as e:
+            # Modules are often saved half-written while they are edited. Keep the previous snapshot, and only try
+            # again once the modules change again.
+            failed = current
+            if not isinstance(e, SystemExit):
+                console.secho(f"\nFailed to regenerate {output_file_name}: {e!r}", bold=True, fg="red")
+            console.secho("Waiting for further changes.", bold=True, fg="yellow")
+            continue
+
+        prefix = "\n -"
+        console.secho(f"\nRegenerated {output_file_name} after changes in: \n -{prefix.join(changed)}", bold=True)
+        snapshot, failed = current, None
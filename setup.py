@@ -9,11 +9,13 @@ setup(
     author="ngoet",
     author_email="ndgoet@gmail.com",
     description="A light-weight markdown code documentation generator",
-    install_requires=[
-        "tabulate>=0.8.7",
-        "pandas>=1.1.2",
-        "typer>=0.3.2",
-    ],
+    install_requires=[],
+    extras_require={
+        "tables": [
+            "tabulate>=0.8.7",
+            "pandas>=1.1.2",
+        ],
+    },
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/ngoet/MarkdownDocs",
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from markdowndocs import async_io
+from markdowndocs import constants as c
+from markdowndocs.discovery import iter_python_files
+
+
+class TestAsyncIO(unittest.TestCase):
+    """
+    Test cases for concurrent file I/O.
+    """
+
+    def test_gather_keeps_order(self):
+        """
+        Test that results are returned in the order of the items, with and without concurrency.
+        """
+        items = list(range(500))
+        for concurrency in [1, 4, 16]:
+            self.assertEqual(async_io.gather(lambda x: x * 2, items, concurrency), [x * 2 for x in items])
+
+    def test_gather_sequential(self):
+        """
+        Test that a concurrency of one runs the calls in the calling thread.
+        """
+        threads = async_io.gather(lambda _: threading.get_ident(), range(10), 1)
+        self.assertEqual(set(threads), {threading.get_ident()})
+
+    def test_gather_bounded(self):
+        """
+        Test that no more calls than the concurrency are in flight at once.
+        """
+        lock, in_flight, peak = threading.Lock(), [0], [0]
+
+        def call(_):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            threading.Event().wait(0.001)
+            with lock:
+                in_flight[0] -= 1
+
+        async_io.gather(call, range(200), 4)
+        self.assertLessEqual(peak[0], 4)
+
+    def test_gather_in_running_loop(self):
+        """
+        Test that gathering works when called from a running event loop.
+        """
+
+        async def main():
+            return async_io.gather(str, range(20), 4)
+
+        self.assertEqual(asyncio.run(main()), [str(i) for i in range(20)])
+
+    def test_gather_raises(self):
+        """
+        Test that an error in a call is raised to the caller.
+        """
+        with self.assertRaises(FileNotFoundError):
+            async_io.gather(os.stat, ["does_not_exist_1", "does_not_exist_2"], 4)
+
+    def test_iter_gather_windows(self):
+        """
+        Test that iterating over the results keeps their order across windows.
+        """
+        with mock.patch.object(c.IO, "WINDOW", 7):
+            self.assertEqual(list(async_io.iter_gather(abs, range(-50, 0), 4)), list(range(50, 0, -1)))
+
+    def test_concurrent_discovery(self):
+        """
+        Test that concurrent directory listings discover the same files, in the same order.
+        """
+        with tempfile.TemporaryDirectory() as root:
+            for package in ["b", "a", os.path.join("a", "c")]:
+                os.makedirs(os.path.join(root, package))
+                for module in ["y.py", "x.py", "z.txt"]:
+                    open(os.path.join(root, package, module), "w").close()
+            open(os.path.join(root, "top.py"), "w").close()
+
+            expected = list(iter_python_files(root, max_depth=None))
+            self.assertEqual(len(expected), 7)
+            self.assertEqual(list(iter_python_files(root, max_depth=None, concurrency=8)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
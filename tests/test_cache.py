@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from markdowndocs import cache
+from markdowndocs import constants as c
+from markdowndocs.cli import set_up_parser
+from markdowndocs.constants import FunctionObject, MarkDownModuleObject, Module
+
+
+class TestCache(unittest.TestCase):
+    """
+    Test cases for the cache of extracted module objects.
+    """
+
+    def setUp(self) -> None:
+        """
+        Point the cache to a temporary directory and write a module source file.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(c.CACHE, "DIRECTORY", os.path.join(self.tmpdir.name, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+        self.path = os.path.join(self.tmpdir.name, "my_module.py")
+        with open(self.path, "w") as source_file:
+            source_file.write("def f():\n    pass\n")
+        self.module = Module(name="my_module", path=self.path)
+        self.args = set_up_parser().parse_args(["-a"])
+
+    def test_store_and_load(self) -> None:
+        """
+        Test that a stored object is loaded back unchanged.
+        """
+        key = cache.cache_key(self.module, self.path, self.args)
+        self.assertIsNone(cache.load(key))
+
+        markdown_module_object = MarkDownModuleObject(
+            module="my_module",
+            module_description=None,
+            dependencies=[],
+            function_markdown_objects=[FunctionObject("f", None, "def f():\n    pass\n")],
+            class_markdown_objects=[],
+        )
+        cache.store(key, markdown_module_object)
+        self.assertEqual(cache.load(key), markdown_module_object)
+
+        cache.clear_cache()
+        self.assertIsNone(cache.load(key))
+
+    def test_unreadable_entries(self) -> None:
+        """
+        Test that corrupt or truncated entries are treated as cache misses.
+        """
+        for content in ["not json\n", '{"type": "header", "schema": 1}\n', '{"type": "module", "module": "m"}\n']:
+            os.makedirs(c.CACHE.DIRECTORY, exist_ok=True)
+            with open(os.path.join(c.CACHE.DIRECTORY, "corrupt" + c.CACHE.SUFFIX), "w") as entry:
+                entry.write(content)
+            self.assertIsNone(cache.load("corrupt"))
+
+    def test_cache_key(self) -> None:
+        """
+        Test that the cache key changes with the module source, its root and the options that affect the extracted
+        objects.
+        """
+        key = cache.cache_key(self.module, self.path, self.args)
+        self.assertEqual(key, cache.cache_key(self.module, self.path, self.args))
+
+        exclude_code = set_up_parser().parse_args(["-a", "--exclude-code"])
+        self.assertNotEqual(key, cache.cache_key(self.module, self.path, exclude_code))
+
+        package_imports = set_up_parser().parse_args(["-a", "--package-imports"])
+        self.assertNotEqual(key, cache.cache_key(self.module, self.path, package_imports))
+
+        other_root = Module(name="my_module", path=self.path, root=self.tmpdir.name)
+        self.assertNotEqual(key, cache.cache_key(other_root, self.path, self.args))
+
+        with open(self.path, "a") as source_file:
+            source_file.write("\n\ndef g():\n    pass\n")
+        self.assertNotEqual(key, cache.cache_key(self.module, self.path, self.args))
+
+    def test_evict(self) -> None:
+        """
+        Test that the least recently used entries are evicted first.
+        """
+        markdown_module_object = MarkDownModuleObject("my_module", None, [], [], [])
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.store(key, markdown_module_object)
+            os.utime(os.path.join(c.CACHE.DIRECTORY, key + c.CACHE.SUFFIX), (i, i))
+
+        entry_size = os.path.getsize(os.path.join(c.CACHE.DIRECTORY, "a" + c.CACHE.SUFFIX))
+        cache.evict(max_size=2 * entry_size)
+        self.assertIsNone(cache.load("a"))
+        self.assertIsNotNone(cache.load("b"))
+        self.assertIsNotNone(cache.load("c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
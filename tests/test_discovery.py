@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from markdowndocs import discovery
+
+
+class TestDiscovery(unittest.TestCase):
+    """
+    Test cases for the discovery of Python modules.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a directory tree with nested packages and directories that should be pruned.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for rel_path in [
+            "top.py",
+            "__init__.py",
+            "pkg/__init__.py",
+            "pkg/mod.py",
+            "pkg/sub/nested.py",
+            "pkg/sub/deeper/deepest.py",
+            "venv/lib/site.py",
+            "node_modules/lib/tool.py",
+            ".git/hooks/hook.py",
+            "vendor/lib.py",
+            "notes.txt",
+        ]:
+            path = os.path.join(self.tmpdir.name, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        self.defaults = ["venv/", "node_modules/", ".*/"]
+
+    def test_one_level(self) -> None:
+        """
+        Test that, by default, only the working directory and its direct subdirectories are searched.
+        """
+        found = list(discovery.iter_python_files(self.tmpdir.name, exclude=self.defaults))
+        self.assertEqual(found, ["top.py", "pkg/mod.py", "vendor/lib.py"])
+
+    def test_recursive(self) -> None:
+        """
+        Test that nested packages are found in recursive mode, with the files in a directory before its subdirectories.
+        """
+        found = list(discovery.iter_python_files(self.tmpdir.name, max_depth=None, exclude=self.defaults))
+        self.assertEqual(
+            found, ["top.py", "pkg/mod.py", "pkg/sub/nested.py", "pkg/sub/deeper/deepest.py", "vendor/lib.py"]
+        )
+
+    def test_excluded_directories_are_pruned(self) -> None:
+        """
+        Test that excluded directories are never descended into.
+        """
+        scanned = []
+        scandir = os.scandir
+
+        def recording_scandir(path):
+            scanned.append(os.path.relpath(path, self.tmpdir.name))
+            return scandir(path)
+
+        with mock.patch.object(discovery.os, "scandir", recording_scandir):
+            found = list(
+                discovery.iter_python_files(
+                    self.tmpdir.name, max_depth=None, exclude=self.defaults + ["vendor/", "pkg/sub/deeper"]
+                )
+            )
+
+        self.assertEqual(found, ["top.py", "pkg/mod.py", "pkg/sub/nested.py"])
+        self.assertEqual(sorted(scanned), [".", "pkg", os.path.join("pkg", "sub")])
+
+    def test_include(self) -> None:
+        """
+        Test that only files matching the include patterns are returned, and that wildcards in include patterns do not
+        match across directories.
+        """
+        for include, expected in [
+            (["pkg/*"], ["pkg/mod.py"]),
+            (["pkg/*/*.py"], ["pkg/sub/nested.py"]),
+            (["pkg/**"], ["pkg/mod.py", "pkg/sub/nested.py", "pkg/sub/deeper/deepest.py"]),
+            (["**/deeper/*.py", "top.py"], ["top.py", "pkg/sub/deeper/deepest.py"]),
+            (["n*.py"], ["pkg/sub/nested.py"]),
+        ]:
+            found = list(
+                discovery.iter_python_files(self.tmpdir.name, max_depth=None, exclude=self.defaults, include=include)
+            )
+            self.assertEqual(found, expected, include)
+
+    def test_is_excluded(self) -> None:
+        """
+        Test .gitignore-style pattern matching.
+        """
+        self.assertTrue(discovery.is_excluded("a/build", True, ["build/"]))
+        self.assertFalse(discovery.is_excluded("a/build", False, ["build/"]))
+        self.assertTrue(discovery.is_excluded("a/test_x.py", False, ["test_*.py"]))
+        self.assertFalse(discovery.is_excluded("b/a/x.py", False, ["/a/x.py"]))
+        self.assertTrue(discovery.is_excluded("a/x.py", False, ["/a/x.py"]))
+        self.assertFalse(discovery.is_excluded("a/keep.py", False, ["a/*.py", "!a/keep.py"]))
+        self.assertTrue(discovery.is_excluded("a/drop.py", False, ["a/*.py", "!a/keep.py"]))
+
+    def test_wildcards_do_not_cross_directories(self) -> None:
+        """
+        Test that "*" and "?" only match within a path segment, and that "**" matches any number of directories.
+        """
+        self.assertTrue(discovery.is_excluded("src/x.py", False, ["src/*.py"]))
+        self.assertFalse(discovery.is_excluded("src/sub/x.py", False, ["src/*.py"]))
+        self.assertFalse(discovery.is_excluded("src/sub/x.py", False, ["src/?ub/x.py", "!src/s?b/x.py"]))
+        self.assertTrue(discovery.is_excluded("baz", True, ["**/baz"]))
+        self.assertTrue(discovery.is_excluded("foo/bar/baz", True, ["**/baz"]))
+        self.assertFalse(discovery.is_excluded("foo/barbaz", True, ["**/baz"]))
+        self.assertTrue(discovery.is_excluded("a/x/y/b.py", False, ["a/**/b.py"]))
+        self.assertTrue(discovery.is_excluded("a/b.py", False, ["a/**/b.py"]))
+        self.assertFalse(discovery.is_excluded("ab/b.py", False, ["a/**/b.py"]))
+        self.assertTrue(discovery.is_excluded("docs/x/y.py", False, ["docs/**"]))
+        self.assertTrue(discovery.is_excluded("a/b1.py", False, ["a/b[0-9].py"]))
+        self.assertFalse(discovery.is_excluded("a/b1.py", False, ["a/b[!0-9].py"]))
+
+    def test_gitignore_does_not_prune_unrelated_directories(self) -> None:
+        """
+        Test that a "**/" pattern only prunes directories with that exact name.
+        """
+        for rel_path in ["foo/barbaz/kept.py", "foo/baz/dropped.py"]:
+            path = os.path.join(self.tmpdir.name, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+        found = list(discovery.iter_python_files(self.tmpdir.name, max_depth=None, exclude=["**/baz", "pkg/*.py"]))
+        self.assertIn("foo/barbaz/kept.py", found)
+        self.assertNotIn("foo/baz/dropped.py", found)
+        self.assertIn("pkg/sub/nested.py", found)
+        self.assertNotIn("pkg/mod.py", found)
+
+
+if __name__ == "__main__":
+    unittest.main()
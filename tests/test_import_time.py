@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Cold-start budget for importing the CLI, in microseconds (as reported by python -X importtime).
+IMPORT_BUDGET_US = 150_000
+
+# Dependencies that must not be imported on the CLI's start-up path.
+HEAVY_MODULES = ["pandas", "numpy", "tabulate", "typer", "click", "multiprocessing"]
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Regression tests for the start-up cost of the CLI.
+    """
+
+    def test_cli_import_time(self) -> None:
+        """
+        Test the cold-start import of the CLI.
+
+        This test verifies that importing markdowndocs.cli does not pull in heavy dependencies and stays within the
+        import time budget.
+        """
+        code = f"import sys; import markdowndocs.cli; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+
+        self.assertEqual(result.stdout.strip(), "", "Heavy dependencies imported on the CLI start-up path.")
+
+        cumulative = [
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.rstrip().endswith("| markdowndocs.cli")
+        ]
+        self.assertLess(cumulative[0], IMPORT_BUDGET_US, "Importing markdowndocs.cli exceeds the cold-start budget.")
+
+
+if __name__ == "__main__":
+    unittest.main()
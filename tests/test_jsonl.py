@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+
+from markdowndocs import jsonl
+from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject
+
+
+class TestJsonl(unittest.TestCase):
+    """
+    Test cases for the JSONL export and import of the documentation model.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a temporary directory and a list of module objects.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "docs.jsonl")
+
+        self.modules = [
+            MarkDownModuleObject(
+                module="package/module",
+                module_description="Module docstring. ✓",
+                dependencies=["os"],
+                function_markdown_objects=[FunctionObject("f", None, "def f():\n    pass\n")],
+                class_markdown_objects=[
+                    MarkdownClassObject(
+                        class_name="MyClass",
+                        class_description="Class docstring.",
+                        function_objects=[FunctionObject("MyClass.__init__", "Init docstring.", None)],
+                    ),
+                    MarkdownClassObject(class_name="Empty", class_description=None, function_objects=[]),
+                ],
+            ),
+            MarkDownModuleObject(
+                module="other",
+                module_description=None,
+                dependencies=[],
+                function_markdown_objects=[],
+                class_markdown_objects=[],
+            ),
+        ]
+
+    def test_round_trip(self) -> None:
+        """
+        Test that exported modules are read back unchanged, with one record per module, class and function.
+        """
+        self.assertEqual(jsonl.write_jsonl(self.path, self.modules), 2)
+        self.assertEqual(list(jsonl.read_jsonl(self.path)), self.modules)
+
+        with open(self.path, "r", encoding="utf-8") as export:
+            records = [json.loads(line) for line in export]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["header", "module", "class", "function", "class", "function", "module"],
+        )
+        self.assertEqual(records[3]["class_name"], "MyClass")
+        self.assertIsNone(records[5]["class_name"])
+
+    def test_invalid_records(self) -> None:
+        """
+        Test that records that are out of order, or exports with an unsupported schema, are rejected.
+        """
+        invalid_exports = [
+            [{"type": "header", "schema": -1}],
+            [{"type": "class", "module": "m", "class_name": "C", "class_description": None}],
+            [
+                {"type": "module", "module": "m", "module_description": None, "dependencies": []},
+                {
+                    "type": "function",
+                    "module": "m",
+                    "class_name": "C",
+                    "function_name": "C.f",
+                    "function_description": None,
+                    "code": None,
+                },
+            ],
+        ]
+        for records in invalid_exports:
+            with open(self.path, "w", encoding="utf-8") as export:
+                export.writelines(json.dumps(record) + "\n" for record in records)
+            with self.assertRaises(ValueError):
+                list(jsonl.read_jsonl(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
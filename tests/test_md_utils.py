@@ -1,3 +1,5 @@
+import hashlib
+import io
 import unittest
 import pandas as pd
 from markdowndocs import md_utils
@@ -56,6 +58,44 @@ class TestMdUtils(unittest.TestCase):
         self.assertEqual(
             md_utils.add_index(["header1", "header2"]), "\n\n* [header1](#header1)\n\n* [header2](#header2)\n"
         )
+        self.assertEqual(
+            md_utils.add_index(["header1"], 1, "docs/module.md"), "\n\n\t* [header1](docs/module.md#header1)\n"
+        )
+
+    def test_gen_anchor(self) -> None:
+        """
+        Test the generation of anchors.
+
+        This test verifies that punctuation and spaces are removed and that the anchor is lowercase.
+        """
+        self.assertEqual(md_utils.gen_anchor("Greetings.__init__"), "greetingsinit")
+        self.assertEqual(md_utils.gen_anchor("Code documentation"), "codedocumentation")
+        self.assertEqual(md_utils.gen_anchor("a+b|c/d-e (f)"), "abcdef")
+
+    def test_add_header(self) -> None:
+        """
+        Test the addition of a header.
+
+        This test verifies that underscores in the header text are escaped and that a custom anchor is added.
+        """
+        self.assertEqual(
+            md_utils.add_header(2, "test_cases/one_function"),
+            "\n## <a name='testcasesonefunction'></a>test\\_cases/one\\_function",
+        )
+
+    def test_markdown_writer(self) -> None:
+        """
+        Test the markdown writer.
+
+        This test verifies that chunks are written in order and that the length and hash of the written text are tracked.
+        """
+        doc = io.StringIO()
+        writer = md_utils.MarkdownWriter(doc)
+        self.assertEqual(writer.write(["# header", "\n"]), 9)
+        self.assertEqual(writer.write(iter(["* item"])), 6)
+        self.assertEqual(doc.getvalue(), "# header\n* item")
+        self.assertEqual(writer.length, 15)
+        self.assertEqual(writer.hexdigest(), hashlib.sha256("# header\n* item".encode("utf-8")).hexdigest())
 
 
 if __name__ == "__main__":
@@ -1,13 +1,26 @@
+import json
 import os
+import shutil
+import subprocess
+import sys
+import threading
 import unittest
 from dataclasses import dataclass
 from typing import List, Optional
+from unittest.mock import patch
 
+from markdowndocs import constants as c
+from markdowndocs import jsonl
+from markdowndocs import mddocs
 from markdowndocs.cli import main, set_up_parser
+from markdowndocs.watch import watch
 
 full_path = os.path.join
 os.chdir(os.path.dirname(os.path.realpath(__file__)))
 
+mddocs_extract_module = mddocs.extract_module
+mddocs_iter_module_markdown = mddocs.iter_module_markdown
+
 tmpdir = "tmp"
 if not os.path.exists(tmpdir):
     os.makedirs(tmpdir)
@@ -87,6 +100,683 @@ class TestMarkdownDocs(unittest.TestCase):
             output.close()
             expected_output.close()
 
+    def test_markdowndocs_static_scenarios(self) -> None:
+        """
+        Test markdowndocs markdowndocs_scenarios with the --static option.
+
+        Generates markdowndocs .md output without importing the modules and validates against pre-defined output.
+        """
+        self.parser = set_up_parser()
+        for scenario in markdowndocs_scenarios:
+            parsed = self.parser.parse_args([f"-m{scenario.input_modules[0]}", "--static"])
+            parsed.module_names += scenario.input_modules[1:]
+            file_path = os.path.join("tmp", scenario.output_file_name + "_static")
+            parsed.output_file_name = file_path
+            main(parsed)
+            with open(file_path + ".md", "r") as output:
+                output_md = output.read()
+            with open(os.path.join("expected_output", scenario.output_file_name + ".md")) as expected_output:
+                expected_output_md = expected_output.read()
+
+            assert (
+                output_md == expected_output_md
+            ), f"Result for scenario {scenario.output_file_name} (--static) does not match expected output."
+
+    def test_parallel_extraction(self) -> None:
+        """
+        Test parallel extraction.
+
+        Verifies that extracting modules with a pool of worker processes produces the same output, in the same module
+        order, as the serial run.
+        """
+        self.parser = set_up_parser()
+        input_modules = [
+            full_path("test_cases", name) for name in ["one_function", "class_and_functions", "multiple_functions"]
+        ]
+        outputs = []
+        for jobs in ["1", "2"]:
+            parsed = self.parser.parse_args(["-m", *input_modules, "--jobs", jobs, "--no-cache"])
+            file_path = os.path.join("tmp", f"multiple_modules_jobs_{jobs}")
+            parsed.output_file_name = file_path
+            main(parsed)
+            with open(file_path + ".md", "r") as output:
+                outputs.append(output.read())
+
+        assert outputs[0] == outputs[1], "Output of the parallel run does not match the output of the serial run."
+
+    def test_incremental(self) -> None:
+        """
+        Test incremental regeneration.
+
+        Verifies that splicing the re-rendered section of a changed module into the existing output produces the same
+        output as a full regeneration, and that unchanged runs leave the output file untouched.
+        """
+        self.parser = set_up_parser()
+        sources = {}
+        for name in ["one_function", "class_and_functions"]:
+            with open(full_path("test_cases", f"{name}.py"), "r") as source_file:
+                sources[full_path(tmpdir, f"incremental_{name}")] = source_file.read()
+        for name, source in sources.items():
+            with open(f"{name}.py", "w") as module_file:
+                module_file.write(source)
+
+        def run(*options: str) -> str:
+            parsed = self.parser.parse_args(["-m", *sources, *options])
+            parsed.output_file_name = full_path(tmpdir, "incremental" if options else "incremental_full")
+            main(parsed)
+            with open(parsed.output_file_name + ".md", "r") as output:
+                return output.read()
+
+        run("--incremental")
+        mtime = os.path.getmtime(full_path(tmpdir, "incremental.md"))
+        run("--incremental")
+        assert mtime == os.path.getmtime(full_path(tmpdir, "incremental.md")), "Unchanged output was rewritten."
+
+        changed_module = full_path(tmpdir, "incremental_class_and_functions.py")
+        with open(changed_module, "a") as module_file:
+            module_file.write('\n\ndef added_function():\n    """Added function."""\n    return None\n')
+
+        assert run("--incremental") == run(), "Incremental output does not match the output of a full regeneration."
+
+    def test_watch(self) -> None:
+        """
+        Test watch mode.
+
+        Verifies that a change to a watched module is picked up and written to the output file.
+        """
+        module_name = full_path(tmpdir, "watched_module")
+        with open(full_path("test_cases", "one_function.py"), "r") as source_file:
+            source = source_file.read()
+        with open(f"{module_name}.py", "w") as module_file:
+            module_file.write(source)
+
+        def edit_module() -> None:
+            with open(f"{module_name}.py", "a") as module_file:
+                module_file.write('\n\ndef watched_function():\n    """Watched function."""\n')
+
+        parsed = set_up_parser().parse_args(["-m", module_name])
+        output_file_name = full_path(tmpdir, "watched_module.md")
+        timer = threading.Timer(0.1, edit_module)
+        timer.start()
+        watch(parsed, output_file_name, interval=0.05, debounce=0.05, polls=20)
+        timer.join()
+
+        with open(output_file_name, "r") as output:
+            assert "Watched function." in output.read(), "Change to watched module not picked up."
+
+    def test_watch_survives_syntax_errors(self) -> None:
+        """
+        Test watch mode.
+
+        Verifies that a half-written module is reported without stopping the watcher, and that the documentation is
+        regenerated once the module is fixed.
+        """
+        module_name = full_path(tmpdir, "watched_broken_module")
+        with open(f"{module_name}.py", "w") as module_file:
+            module_file.write('def f():\n    """First version."""\n')
+
+        def break_module() -> None:
+            with open(f"{module_name}.py", "a") as module_file:
+                module_file.write("\n\ndef g(:\n")
+
+        def fix_module() -> None:
+            with open(f"{module_name}.py", "w") as module_file:
+                module_file.write('def f():\n    """Fixed version."""\n')
+
+        parsed = set_up_parser().parse_args(["-m", module_name, "--no-cache"])
+        output_file_name = full_path(tmpdir, "watched_broken_module.md")
+        timers = [threading.Timer(0.1, break_module), threading.Timer(0.5, fix_module)]
+        for timer in timers:
+            timer.start()
+        watch(parsed, output_file_name, interval=0.05, debounce=0.05, polls=30)
+        for timer in timers:
+            timer.join()
+
+        with open(output_file_name, "r") as output:
+            assert "Fixed version." in output.read(), "Watcher did not recover from a syntax error."
+
+    def test_source_changed_during_run(self) -> None:
+        """
+        Test that a module that changes while its documentation is generated is reported with a non-zero exit status,
+        instead of a traceback.
+        """
+        # Imported here, as the source index is only needed to simulate a change of the source.
+        from markdowndocs import source_index
+
+        parsed = set_up_parser().parse_args([f"-m{full_path('test_cases', 'one_function')}", "--no-cache"])
+        parsed.output_file_name = full_path(tmpdir, "source_changed")
+        for check in [False, True]:
+            parsed.check = check
+            with patch.object(
+                source_index, "_read_source", side_effect=source_index.SourceChangedError("one_function.py changed")
+            ):
+                with self.assertRaises(SystemExit) as exit_:
+                    main(parsed)
+            assert exit_.exception.code == 1, "Run should fail when a source changes while it is documented."
+
+    def test_isolated_failures(self) -> None:
+        """
+        Test isolated mode.
+
+        Verifies that modules that hang, crash or raise during import are reported as errors while the documentation of
+        the remaining modules is still produced.
+        """
+        sources = {
+            "isolated_good": 'def good():\n    """Good function."""\n',
+            "isolated_hang": "import time\n\ntime.sleep(60)\n",
+            "isolated_crash": "import os\n\nos._exit(3)\n",
+            "isolated_raise": "raise RuntimeError('import-time failure')\n",
+        }
+        for name, source in sources.items():
+            with open(full_path(tmpdir, f"{name}.py"), "w") as module_file:
+                module_file.write(source)
+
+        parsed = set_up_parser().parse_args(
+            ["-m", *[full_path(tmpdir, name) for name in sources], "--isolate", "--timeout", "2", "--no-cache"]
+        )
+        parsed.output_file_name = full_path(tmpdir, "isolated")
+        main(parsed)
+
+        with open(full_path(tmpdir, "isolated.md"), "r") as output:
+            output_md = output.read()
+        assert "Good function." in output_md, "Documentation of the remaining modules was not produced."
+        for name in ["hang", "crash", "raise"]:
+            assert f"isolated\\_{name}" not in output_md, f"Failed module isolated_{name} should not be documented."
+
+    def test_isolated_workers_are_not_forked(self) -> None:
+        """
+        Test isolated mode.
+
+        Verifies that the workers, which are (re)started from the threads of a thread pool, are not forked from the
+        multithreaded process.
+        """
+        # Imported here, as the isolation module is otherwise only imported when modules are extracted in isolation.
+        from markdowndocs.isolation import ModuleWorker
+
+        worker = ModuleWorker()
+        thread = threading.Thread(target=worker._start)
+        thread.start()
+        thread.join()
+        try:
+            assert worker.process._start_method != "fork", "Isolated workers should not be forked from threads."
+        finally:
+            worker.stop()
+
+    def test_package_imports(self) -> None:
+        """
+        Test package-aware loading.
+
+        Verifies that a module imported by a sibling module is executed only once when modules are imported by name,
+        while the output matches the file-based loading.
+        """
+        package = full_path(tmpdir, "package_imports")
+        os.makedirs(package, exist_ok=True)
+        counter = full_path(package, "executions.txt")
+        sources = {
+            "__init__": "",
+            "base": f'with open({os.path.abspath(counter)!r}, "a") as f:\n    f.write("x")\n\n\n'
+            'def base():\n    """Base function."""\n',
+            "derived": 'from tmp.package_imports.base import base\n\n\ndef derived():\n    """Derived function."""\n',
+        }
+        for name, source in sources.items():
+            with open(full_path(package, f"{name}.py"), "w") as module_file:
+                module_file.write(source)
+
+        outputs, executions = [], []
+        for options in [[], ["--package-imports"]]:
+            if os.path.exists(counter):
+                os.remove(counter)
+            parsed = set_up_parser().parse_args(
+                ["-m", full_path(package, "derived"), full_path(package, "base"), "--no-cache", "--recursive", *options]
+            )
+            parsed.output_file_name = full_path(tmpdir, f"package_imports_{len(options)}")
+            main(parsed)
+            with open(parsed.output_file_name + ".md", "r") as output:
+                outputs.append(output.read())
+            with open(counter, "r") as counts:
+                executions.append(len(counts.read()))
+            for name in list(sys.modules):
+                if name.startswith("tmp.package_imports"):
+                    del sys.modules[name]
+
+        assert outputs[0] == outputs[1], "Output with --package-imports does not match the file-based output."
+        assert executions == [2, 1], f"Unexpected number of executions of the shared module: {executions}."
+
+    def test_split_output(self) -> None:
+        """
+        Test split output.
+
+        Verifies that every module is documented in a separate file that is linked from the index, and that only the
+        files of modules that changed are rewritten.
+        """
+        sources = {
+            "split_one": 'def one():\n    """One function."""\n',
+            "split_two": 'def two():\n    """Two function."""\n',
+        }
+        for name, source in sources.items():
+            with open(full_path(tmpdir, f"{name}.py"), "w") as module_file:
+                module_file.write(source)
+
+        parsed = set_up_parser().parse_args(["-m", *[full_path(tmpdir, name) for name in sources], "--split"])
+        parsed.output_file_name = full_path(tmpdir, "split.md")
+        main(parsed)
+
+        files = {name: full_path(tmpdir, "split", tmpdir, f"{name}.md") for name in sources}
+        with open(parsed.output_file_name, "r") as index:
+            index_md = index.read()
+        for name, path in files.items():
+            assert f"(split/{tmpdir}/{name}.md#" in index_md, f"Index does not link to the file of {name}."
+            with open(path, "r") as module_doc:
+                assert "(../../split.md#codedocumentation)" in module_doc.read(), "File does not link to the index."
+
+        mtimes = {path: os.stat(path).st_mtime_ns for path in [parsed.output_file_name, *files.values()]}
+        with open(full_path(tmpdir, "split_two.py"), "a") as module_file:
+            module_file.write('\n\ndef three():\n    """Three function."""\n')
+        main(parsed)
+
+        unchanged = [path for path in mtimes if os.stat(path).st_mtime_ns == mtimes[path]]
+        assert unchanged == [files["split_one"]], f"Unexpected unchanged files: {unchanged}."
+        with open(files["split_two"], "r") as module_doc:
+            assert "Three function." in module_doc.read(), "File of the changed module was not updated."
+
+    def test_split_output_keeps_other_files(self) -> None:
+        """
+        Test split output.
+
+        Verifies that the files of modules that are no longer documented are removed, while other markdown files in the
+        directory of the module files are kept.
+        """
+        sources = {"split_kept": "def kept():\n    pass\n", "split_dropped": "def dropped():\n    pass\n"}
+        for name, source in sources.items():
+            with open(full_path(tmpdir, f"{name}.py"), "w") as module_file:
+                module_file.write(source)
+        output_file_name = full_path(tmpdir, "split_other_files.md")
+        directory = full_path(tmpdir, "split_other_files")
+        shutil.rmtree(directory, ignore_errors=True)
+        guide = full_path(directory, "guide.md")
+        os.makedirs(full_path(directory, "notes"))
+        for path in [guide, full_path(directory, "notes", "todo.md")]:
+            with open(path, "w") as other_file:
+                other_file.write("# Written by hand\n")
+
+        for names in [list(sources), ["split_kept"]]:
+            parsed = set_up_parser().parse_args(["-m", *[full_path(tmpdir, name) for name in names], "--split"])
+            parsed.output_file_name = output_file_name
+            main(parsed)
+
+        assert os.path.isfile(full_path(directory, tmpdir, "split_kept.md")), "File of a documented module removed."
+        assert not os.path.exists(full_path(directory, tmpdir, "split_dropped.md")), "File of a dropped module kept."
+        for path in [guide, full_path(directory, "notes", "todo.md")]:
+            assert os.path.isfile(path), f"File that was not generated was removed: {path}."
+
+    def test_jsonl_round_trip(self) -> None:
+        """
+        Test JSONL export and import.
+
+        Exports the documentation model of the scenarios to JSONL, rebuilds the markdown from the export, and validates
+        against pre-defined output.
+        """
+        for scenario in markdowndocs_scenarios:
+            export_path = full_path(tmpdir, scenario.output_file_name + ".jsonl")
+            parsed = set_up_parser().parse_args([f"-m{scenario.input_modules[0]}", "--jsonl", export_path])
+            parsed.output_file_name = full_path(tmpdir, scenario.output_file_name + "_export")
+            main(parsed)
+
+            parsed = set_up_parser().parse_args(["--from-jsonl", export_path])
+            parsed.output_file_name = full_path(tmpdir, scenario.output_file_name + "_from_jsonl")
+            main(parsed)
+            with open(parsed.output_file_name + ".md", "r") as output:
+                output_md = output.read()
+            with open(os.path.join("expected_output", scenario.output_file_name + ".md")) as expected_output:
+                expected_output_md = expected_output.read()
+
+            assert (
+                output_md == expected_output_md
+            ), f"Result for scenario {scenario.output_file_name} (--from-jsonl) does not match expected output."
+
+    def test_streaming(self) -> None:
+        """
+        Test streaming from extraction to output.
+
+        Verifies that every module is rendered before the next module is extracted, so that only one module is held in
+        memory at a time, while the output matches the output of the pre-defined scenarios.
+        """
+        names = ["class_and_functions", "multiple_functions", "one_function"]
+        events = []
+
+        def extract_module(mod, args):
+            events.append(("extract", os.path.basename(mod.name)))
+            return mddocs_extract_module(mod, args)
+
+        def iter_module_markdown(obj, *args):
+            events.append(("render", os.path.basename(obj.module)))
+            return mddocs_iter_module_markdown(obj, *args)
+
+        parsed = set_up_parser().parse_args(["-m", *[full_path("test_cases", name) for name in names], "--no-cache"])
+        parsed.output_file_name = full_path(tmpdir, "streaming")
+        with patch.object(mddocs, "extract_module", extract_module), patch.object(
+            mddocs, "iter_module_markdown", iter_module_markdown
+        ):
+            main(parsed)
+
+        assert events == [
+            (event, name) for name in names for event in ["extract", "render"]
+        ], f"Modules were not streamed one at a time: {events}."
+        with open(parsed.output_file_name + ".md", "r") as output:
+            output_md = output.read()
+        for name in names:
+            with open(os.path.join("expected_output", name + ".md")) as expected_output:
+                section = expected_output.read().split("\n## ", 1)[1]
+            assert section in output_md, f"Section of {name} does not match expected output."
+
+    def test_render_threads(self) -> None:
+        """
+        Test rendering in a pool of threads.
+
+        Verifies that the sections are rendered outside the main thread, and that the single output file and the split
+        output files match the output of rendering in the main thread.
+        """
+        names = ["one_function", "class_and_functions", "multiple_functions"]
+        threads = set()
+
+        def iter_module_markdown(obj, *args):
+            threads.add(threading.current_thread() is threading.main_thread())
+            return mddocs_iter_module_markdown(obj, *args)
+
+        outputs = []
+        for render_threads in ["0", "2"]:
+            output = []
+            for split in [[], ["--split"]]:
+                parsed = set_up_parser().parse_args(
+                    ["-m", *[full_path("test_cases", name) for name in names], "--no-cache", *split]
+                    + ["--render-threads", render_threads]
+                )
+                parsed.output_file_name = full_path(tmpdir, f"render_threads_{render_threads}_{len(split)}")
+                threads.clear()
+                with patch.object(mddocs, "iter_module_markdown", iter_module_markdown):
+                    main(parsed)
+                assert threads == {render_threads == "0"}, f"Sections were not rendered in {render_threads} threads."
+
+                for path in [parsed.output_file_name + ".md"] + [
+                    full_path(parsed.output_file_name, "test_cases", name + ".md") for name in names if split
+                ]:
+                    with open(path, "r") as output_file:
+                        output.append(output_file.read().replace(f"render_threads_{render_threads}", ""))
+            outputs.append(output)
+
+        assert outputs[0] == outputs[1], "Output rendered in threads does not match the output rendered serially."
+
+    def test_batch(self) -> None:
+        """
+        Test batch mode.
+
+        Verifies that several roots are documented in one run with their own options, without changing the working
+        directory, that modules with the same name in different roots do not get mixed up, and that a root without
+        modules is reported without stopping the other roots.
+        """
+        for root in ["batch_a", "batch_b", "batch_empty"]:
+            os.makedirs(full_path(tmpdir, root), exist_ok=True)
+        for root in ["batch_a", "batch_b"]:
+            with open(full_path(tmpdir, root, "helper.py"), "w") as module_file:
+                module_file.write(f"NAME = {root[-1]!r}\n")
+            with open(full_path(tmpdir, root, "documented.py"), "w") as module_file:
+                module_file.write(
+                    "import helper\n\n\ndef describe():\n    return helper.NAME\n\n\n"
+                    'describe.__doc__ = f"Helper {helper.NAME}."\n'
+                )
+        config = {
+            "roots": [
+                {"root": "batch_a"},
+                {"root": "batch_b", "output_file_name": "docs.md", "exclude_code": True},
+                {"root": "batch_empty"},
+            ]
+        }
+        with open(full_path(tmpdir, "batch.json"), "w") as config_file:
+            json.dump(config, config_file)
+
+        cwd = os.getcwd()
+        parsed = set_up_parser().parse_args(["--batch", full_path(tmpdir, "batch.json"), "--no-cache"])
+        with self.assertRaises(SystemExit):
+            main(parsed)
+        assert os.getcwd() == cwd, "Batch mode changed the working directory."
+
+        with open(full_path(tmpdir, "batch_a", "code_documentation.md"), "r") as output:
+            output_md = output.read()
+        assert "Helper a." in output_md and "<summary>source code</summary>" in output_md
+        with open(full_path(tmpdir, "batch_b", "docs.md"), "r") as output:
+            output_md = output.read()
+        assert "Helper b." in output_md, "Module of the second root was documented with the first root's sibling."
+        assert "<summary>source code</summary>" not in output_md, "Options of the root were not applied."
+
+    def test_static_dependencies_in_root(self) -> None:
+        """
+        Test that static extraction resolves the local dependencies of a module against its root directory, rather than
+        against the working directory.
+        """
+        root = full_path(tmpdir, "static_root")
+        os.makedirs(full_path(root, "pkg"), exist_ok=True)
+        open(full_path(root, "pkg", "__init__.py"), "w").close()
+        with open(full_path(root, "pkg", "helper.py"), "w") as module_file:
+            module_file.write("NAME = 'helper'\n")
+        with open(full_path(root, "uses_helper.py"), "w") as module_file:
+            module_file.write("from pkg import helper\n\n\ndef describe():\n    return helper.NAME\n")
+
+        parsed = set_up_parser().parse_args(["-m", "uses_helper", "--static", "--no-cache"])
+        (mod,) = mddocs.identify_modules(parsed, root)
+        assert mddocs.extract_module(mod, parsed).dependencies == ["pkg.helper"], "Local dependency not resolved."
+
+    def test_static_matches_import_for_cached_functions(self) -> None:
+        """
+        Test that static extraction skips functions and methods wrapped in functools.lru_cache, like the import-based
+        extraction, while keeping functions wrapped in decorators that return a function.
+        """
+        root = full_path(tmpdir, "static_cached")
+        os.makedirs(root, exist_ok=True)
+        with open(full_path(root, "cached_functions.py"), "w") as module_file:
+            module_file.write(
+                '"""Cached functions."""\n\nimport functools\nfrom functools import lru_cache\n\n\n'
+                "def traced(func):\n    @functools.wraps(func)\n    def wrapper(*args):\n        return func(*args)\n\n"
+                "    return wrapper\n\n\n"
+                "@functools.lru_cache(maxsize=None)\ndef cached(x):\n    return x\n\n\n"
+                "@lru_cache\ndef also_cached(x):\n    return x\n\n\n"
+                '@traced\ndef plain(x):\n    """Plain."""\n    return x\n\n\n'
+                "class Cached:\n    @functools.lru_cache()\n    def method(self):\n        return 1\n\n"
+                "    def other(self):\n        return 2\n"
+            )
+
+        for options in [[], ["--exclude-code"]]:
+            imported = set_up_parser().parse_args(["-m", "cached_functions", "--no-cache"] + options)
+            static = set_up_parser().parse_args(["-m", "cached_functions", "--static", "--no-cache"] + options)
+            (mod,) = mddocs.identify_modules(imported, root)
+            expected = mddocs.extract_module(mod, imported)
+            result = mddocs.extract_module(mod, static)
+            assert [f.function_name for f in result.function_markdown_objects] == ["plain", "traced"]
+            assert result == expected, f"Static extraction does not match the import-based extraction ({options})."
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_since(self) -> None:
+        """
+        Test the git-aware mode.
+
+        Verifies that only the modules whose source files changed since the git ref, or since the previous JSONL
+        export, are extracted, that the other modules are taken from that export, and that the output matches the
+        output of a full run.
+        """
+        repo = os.path.abspath(full_path(tmpdir, "since_repo"))
+        shutil.rmtree(repo, ignore_errors=True)
+        os.makedirs(repo)
+        for name in ["since_a", "since_b", "since_d"]:
+            with open(full_path(repo, f"{name}.py"), "w") as module_file:
+                module_file.write(f'def {name}():\n    """{name} v1."""\n')
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for command in [["init", "-q"], ["add", "."], ["commit", "-q", "-m", "Add modules"]]:
+            subprocess.run(git + command, cwd=repo, check=True)
+
+        extracted = []
+
+        def extract_module(mod, args):
+            extracted.append(mod.name)
+            return mddocs_extract_module(mod, args)
+
+        cwd = os.getcwd()
+        os.chdir(repo)
+        try:
+            options = ["-a", "--static", "--no-cache", "--jsonl", "docs.jsonl"]
+            main(set_up_parser().parse_args([*options, "--since", "HEAD"]))
+            # A change that is committed after the export, and an uncommitted change.
+            with open("since_b.py", "a") as module_file:
+                module_file.write('\n\ndef since_c():\n    """since_c v1."""\n')
+            for command in [["add", "."], ["commit", "-q", "-m", "Change since_b"]]:
+                subprocess.run(git + command, cwd=repo, check=True)
+            with open("since_d.py", "a") as module_file:
+                module_file.write('\n\ndef since_e():\n    """since_e v1."""\n')
+            with patch.object(mddocs, "extract_module", extract_module):
+                main(set_up_parser().parse_args([*options, "--since", "HEAD", "--output-file-name", "since.md"]))
+                main(set_up_parser().parse_args([*options, "--since", "HEAD", "--output-file-name", "since.md"]))
+            main(set_up_parser().parse_args([*options, "--output-file-name", "full.md"]))
+            with open("since.md", "r") as since_output, open("full.md", "r") as full_output:
+                since_md, full_md = since_output.read(), full_output.read()
+            # An unknown ref fails, even without a previous export; --since fails without an export to reuse.
+            for arguments, code in [
+                (["-a", "--jsonl", "missing.jsonl", "--since", "nosuchref", "--output-file-name", "unknown.md"], 1),
+                (["-a", "--since", "HEAD", "--output-file-name", "no_export.md"], 2),
+            ]:
+                with self.assertRaises(SystemExit) as exit_:
+                    main(set_up_parser().parse_args(arguments))
+                assert exit_.exception.code == code, f"Unexpected exit status for {arguments}."
+                assert not os.path.exists(arguments[-1]), f"Output written for {arguments}."
+                assert not [f for f in os.listdir(".") if f.endswith(".tmp")], "Temporary files were left behind."
+        finally:
+            os.chdir(cwd)
+
+        # The second run extracts the uncommitted change again, as it differs from the checked out commit.
+        assert extracted == ["since_b", "since_d", "since_d"], f"Unexpected extracted modules: {extracted}."
+        assert "since_c v1." in since_md, "The module that changed since the export was not documented."
+        assert "since_e v1." in since_md, "The module that changed since HEAD was not documented."
+        assert since_md == full_md, "Output of the run since HEAD does not match the output of a full run."
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_since_ignores_generated_files(self) -> None:
+        """
+        Test that the files written by a run (the cache, the markdown output and the JSONL export) are not recorded as
+        changes in the export, and do not invalidate its reuse.
+        """
+        repo = os.path.abspath(full_path(tmpdir, "since_generated_repo"))
+        shutil.rmtree(repo, ignore_errors=True)
+        os.makedirs(repo)
+        for name in ["generated_a", "generated_b"]:
+            with open(full_path(repo, f"{name}.py"), "w") as module_file:
+                module_file.write(f'def {name}():\n    """{name}."""\n')
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for command in [["init", "-q"], ["add", "."], ["commit", "-q", "-m", "Add modules"]]:
+            subprocess.run(git + command, cwd=repo, check=True)
+
+        extracted = []
+
+        def extract_module(mod, args):
+            extracted.append(mod.name)
+            return mddocs_extract_module(mod, args)
+
+        cwd = os.getcwd()
+        os.chdir(repo)
+        try:
+            arguments = ["-a", "--static", "--jsonl", "docs.jsonl", "--since", "HEAD", "--output-file-name", "docs.md"]
+            main(set_up_parser().parse_args(arguments))
+            assert os.path.isdir(c.CACHE.DIRECTORY), "The cache was not written."
+            # The second run records the state of the working tree, which now holds the files of the first run.
+            with patch.object(mddocs, "extract_module", extract_module):
+                main(set_up_parser().parse_args(arguments))
+                main(set_up_parser().parse_args(arguments))
+            header = jsonl.read_header("docs.jsonl")
+        finally:
+            os.chdir(cwd)
+
+        assert header["git"]["changed"] == [], f"Generated files were recorded as changes: {header['git']['changed']}."
+        assert extracted == [], f"Modules were extracted although no source changed: {extracted}."
+
+    def test_check(self) -> None:
+        """
+        Test check mode.
+
+        Verifies that, after a normal run (with or without --split), an up-to-date output passes without extracting any
+        module, that a stale output fails after extracting only the changed module and reports it, and that the output
+        is never written.
+        """
+        sources = {}
+        for name in ["one_function", "class_and_functions"]:
+            with open(full_path("test_cases", f"{name}.py"), "r") as source_file:
+                sources[full_path(tmpdir, f"check_{name}")] = source_file.read()
+        changed_module = full_path(tmpdir, "check_class_and_functions")
+
+        extracted = []
+
+        def extract_module(mod, args):
+            extracted.append(mod.name)
+            return mddocs_extract_module(mod, args)
+
+        for options, output_file_name in [
+            ([], full_path(tmpdir, "check.md")),
+            (["--split"], full_path(tmpdir, "check_split.md")),
+        ]:
+            for name, source in sources.items():
+                with open(f"{name}.py", "w") as module_file:
+                    module_file.write(source)
+            parsed = set_up_parser().parse_args(["-m", *sources, "--no-cache", *options])
+            parsed.output_file_name = output_file_name
+            main(parsed)
+            mtime = os.path.getmtime(output_file_name)
+
+            def check() -> List[str]:
+                parsed = set_up_parser().parse_args(["-m", *sources, "--no-cache", "--check", *options])
+                with patch.object(mddocs, "extract_module", extract_module):
+                    return mddocs.check_markdown_file(parsed, mddocs.identify_modules(parsed), output_file_name)
+
+            extracted.clear()
+            assert check() == [], f"Up-to-date output was reported as stale ({options})."
+            assert not extracted, f"Modules were extracted although no source changed ({options}): {extracted}."
+
+            with open(f"{changed_module}.py", "a") as module_file:
+                module_file.write('\n\ndef added_function():\n    """Added function."""\n    return None\n')
+            stale = check()
+            if options:
+                changed_file = mddocs.split_file_path(output_file_name, changed_module)
+                assert stale == [f"{changed_file} ({changed_module})", output_file_name], f"Unexpected report: {stale}."
+            else:
+                assert stale == [changed_module], f"Unexpected report: {stale}."
+            assert extracted == [changed_module], f"Unchanged modules were extracted ({options}): {extracted}."
+            assert mtime == os.path.getmtime(output_file_name), f"The output was written in check mode ({options})."
+
+        parsed = set_up_parser().parse_args(["-m", *sources, "--no-cache", "--check"])
+        parsed.output_file_name = full_path(tmpdir, "check")
+        with self.assertRaises(SystemExit) as exit_:
+            main(parsed)
+        assert exit_.exception.code == 1, "Stale output did not fail the check."
+
+    def test_extraction_finishes(self) -> None:
+        """
+        Test that the extraction runs to completion.
+
+        Verifies that the cache is trimmed after new entries were stored, once the last module has been rendered.
+        """
+        parsed = set_up_parser().parse_args(["-m", full_path("test_cases", "one_function")])
+        parsed.output_file_name = full_path(tmpdir, "extraction_finishes")
+        with patch.object(mddocs.c.CACHE, "DIRECTORY", full_path(tmpdir, "extraction_finishes_cache")), patch.object(
+            mddocs.cache, "evict", wraps=mddocs.cache.evict
+        ) as evict:
+            mddocs.cache.clear_cache()
+            main(parsed)
+        assert evict.call_count == 1, "The cache was not trimmed after the run."
+
+    def test_invalid_concurrency_options(self) -> None:
+        """
+        Test that negative numbers of workers or threads, and an I/O concurrency below one, are rejected.
+        """
+        for arguments in [["--jobs", "-1"], ["--render-threads", "-2"], ["--io-concurrency", "0"]]:
+            parsed = set_up_parser().parse_args(["-m", "one_function"] + arguments)
+            with patch("sys.stderr"), self.assertRaises(SystemExit) as exit_:
+                main(parsed)
+            assert exit_.exception.code == 2, f"{arguments} was accepted."
+
     def test_mddocs_options(self) -> None:
         """
         Test mddocs options.
@@ -0,0 +1,119 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from markdowndocs import mddocs
+from markdowndocs.cli import set_up_parser
+
+# A linear algorithm compares every name a small, constant number of times; a quadratic one compares it with every other
+# name. Timings are left to the benchmarks, as wall-clock ratios are unreliable on shared machines.
+MAX_COMPARISONS_PER_NAME = 8
+N = 2_000
+
+
+class CountingStr(str):
+    """
+    A string that counts the equality comparisons it takes part in.
+    """
+
+    comparisons = 0
+
+    def __eq__(self, other) -> bool:
+        """
+        Compare with another string, and count the comparison.
+
+        :param other: The object to compare with.
+        :return: True if the strings are equal.
+        """
+        CountingStr.comparisons += 1
+        return str.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        """
+        Compare with another string, and count the comparison.
+
+        :param other: The object to compare with.
+        :return: True if the strings differ.
+        """
+        CountingStr.comparisons += 1
+        return str.__ne__(self, other)
+
+    __hash__ = str.__hash__
+
+    def __getitem__(self, key) -> "CountingStr":
+        """
+        Slice the string, keeping the comparisons counted.
+
+        :param key: An index or slice.
+        :return: The sliced string.
+        """
+        return CountingStr(str.__getitem__(self, key))
+
+    def replace(self, *args) -> "CountingStr":
+        """
+        Replace substrings, keeping the comparisons counted.
+
+        :param args: The arguments of str.replace.
+        :return: The string with the substrings replaced.
+        """
+        return CountingStr(str.replace(self, *args))
+
+
+def count_comparisons(func) -> int:
+    """
+    Count comparisons.
+
+    :param func: A function without arguments.
+    :return: The number of equality comparisons of CountingStr instances during the call.
+    """
+    CountingStr.comparisons = 0
+    func()
+    return CountingStr.comparisons
+
+
+class TestScaling(unittest.TestCase):
+    """
+    Scaling tests that guard against quadratic behavior in method and module selection.
+    """
+
+    def test_extract_function_information(self) -> None:
+        """
+        Test that extracting the methods of a class compares every method name a constant number of times.
+        """
+        args = set_up_parser().parse_args(["-a", "--exclude-code"])
+        condition = CountingStr("mod")
+        functions = [
+            (CountingStr(f"method_{i}"), SimpleNamespace(__module__="mod", __qualname__=f"C.method_{i}", __doc__=None))
+            for i in range(N)
+        ] + [(CountingStr("__init__"), SimpleNamespace(__module__="mod", __qualname__="C.__init__", __doc__=None))]
+
+        extracted = []
+        comparisons = count_comparisons(
+            lambda: extracted.extend(mddocs._extract_function_information(functions, None, args, condition))
+        )
+        self.assertEqual(extracted[0].function_name, "C.__init__")
+        self.assertEqual(len(extracted), N + 1)
+        self.assertLessEqual(comparisons, MAX_COMPARISONS_PER_NAME * N)
+
+    def test_identify_modules(self) -> None:
+        """
+        Test that selecting and excluding modules compares every module name a constant number of times.
+        """
+        paths = [CountingStr(f"package/module_{i}.py") for i in range(N)]
+        for option in ["-m", "-e"]:
+            args = set_up_parser().parse_args([option, "placeholder"])
+            names = [p[:-3] for p in paths]
+            if option == "-m":
+                args.module_names = names
+            else:
+                args.exclude_modules = names
+
+            modules = []
+            with mock.patch.object(mddocs, "iter_python_files", return_value=paths + ["extra.py"]):
+                comparisons = count_comparisons(lambda: modules.extend(mddocs.identify_modules(args)))
+            self.assertEqual(len(modules), N if option == "-m" else 1)
+            self.assertLessEqual(comparisons, MAX_COMPARISONS_PER_NAME * N, option)
+
+
+if __name__ == "__main__":
+    unittest.main()
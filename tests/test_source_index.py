@@ -0,0 +1,132 @@
+import importlib.util
+import inspect
+import os
+import pickle
+import tempfile
+import unittest
+
+from markdowndocs.source_index import SourceChangedError, SourceIndex, SourceSegment
+
+SOURCE = '''import functools
+
+
+def decorator(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@decorator
+def decorated(x):
+    """Decorated function."""
+    return (
+        x
+        + 1
+    )
+
+
+class Greetings:
+    """Greetings."""
+
+    def __init__(self, name):
+        self.name = name
+
+    @staticmethod
+    def hello() -> str:
+        return "hello"  # comment
+
+    async def greet(self):
+        return self.name
+
+
+def last(): return "é"
+'''
+
+
+class TestSourceIndex(unittest.TestCase):
+    """
+    Test cases for the per-module source index.
+    """
+
+    def setUp(self) -> None:
+        """
+        Write and import a module with decorated functions, methods and non-ASCII source.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "indexed_module.py")
+        with open(self.path, "w", encoding="utf-8") as module_file:
+            module_file.write(SOURCE)
+        spec = importlib.util.spec_from_file_location("indexed_module", self.path)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+        self.functions = [
+            self.module.decorator,
+            self.module.decorated,
+            self.module.Greetings.__init__,
+            self.module.Greetings.hello,
+            self.module.Greetings.greet,
+            self.module.last,
+        ]
+
+    def test_function_source(self) -> None:
+        """
+        Test that the sliced source code matches inspect.getsource.
+        """
+        source_index = SourceIndex(self.path)
+        for func in self.functions:
+            self.assertEqual(source_index.function_source(func), inspect.getsource(func))
+
+    def test_crlf_line_endings(self) -> None:
+        """
+        Test that the (lazily) sliced source code of a file with CRLF line endings matches inspect.getsource.
+        """
+        path = os.path.join(self.tmpdir.name, "crlf_module.py")
+        with open(path, "w", encoding="utf-8", newline="\r\n") as module_file:
+            module_file.write(SOURCE)
+        spec = importlib.util.spec_from_file_location("crlf_module", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        source_index = SourceIndex(path)
+        for func in [module.decorated, module.Greetings.hello, module.last]:
+            self.assertNotIn("\r", inspect.getsource(func))
+            self.assertEqual(source_index.function_source(func), inspect.getsource(func))
+            self.assertEqual(str(source_index.function_source(func, lazy=True)), inspect.getsource(func))
+
+    def test_unknown_function(self) -> None:
+        """
+        Test that functions defined elsewhere are not resolved.
+        """
+        source_index = SourceIndex(self.path)
+        self.assertIsNone(source_index.function_source(inspect.getsource))
+        self.assertIsNone(source_index.function_source(lambda: None))
+
+    def test_lazy_source(self) -> None:
+        """
+        Test that lazy segments materialize to the sliced source code, and are pickled as strings.
+        """
+        source_index = SourceIndex(self.path)
+        for func in self.functions:
+            segment = source_index.function_source(func, lazy=True)
+            self.assertIsInstance(segment, SourceSegment)
+            self.assertEqual(str(segment), inspect.getsource(func))
+            self.assertEqual(segment, inspect.getsource(func))
+            self.assertEqual(pickle.loads(pickle.dumps(segment)), inspect.getsource(func))
+            self.assertIsInstance(pickle.loads(pickle.dumps(segment)), str)
+
+    def test_changed_source(self) -> None:
+        """
+        Test that lazy segments are not materialized from a source file that changed after it was indexed.
+        """
+        segment = SourceIndex(self.path).function_source(self.module.last, lazy=True)
+        with open(self.path, "w", encoding="utf-8") as module_file:
+            module_file.write(SOURCE.replace("é", "e"))
+        with self.assertRaises(SourceChangedError):
+            str(segment)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+
+from markdowndocs import md_utils
+from markdowndocs.constants import FunctionObject, MarkdownClassObject, MarkDownModuleObject
+from markdowndocs.mddocs import iter_module_index, iter_module_markdown
+from markdowndocs.templates import Templates, compile_template, load_templates
+
+
+class TestTemplates(unittest.TestCase):
+    """
+    Test cases for the compiled markdown templates.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a module object.
+        """
+        self.module = MarkDownModuleObject(
+            module="package/my_module",
+            module_description=None,
+            dependencies=["os"],
+            function_markdown_objects=[FunctionObject("my_function", "Does {things}.", "def my_function():\n    pass")],
+            class_markdown_objects=[MarkdownClassObject("MyClass", "", [FunctionObject("my_method", None, None)])],
+        )
+
+    def test_defaults_match_md_utils(self):
+        """
+        Test that the default templates render the same fragments as the md_utils helpers.
+        """
+        templates = load_templates()
+        for level in range(1, 7):
+            self.assertEqual(templates.header(level, "My_header"), md_utils.add_header(level, "My_header"))
+        self.assertEqual(templates.index(["a_b", "c"], 1, "f.md"), md_utils.add_index(["a_b", "c"], 1, "f.md"))
+        self.assertEqual(
+            templates.list(templates.section_headers[3, "Dependencies"], templates.items(["os", "sys"])),
+            md_utils.list_to_md(["os", "sys"], md_utils.add_header(3, "Dependencies")),
+        )
+        self.assertEqual(templates.code("x = {1}"), md_utils.add_python_snippet("x = {1}"))
+
+    def test_compile_template(self):
+        """
+        Test that static fields are substituted, that fields can be repeated or left out, and that braces in the template
+        and in the values are kept.
+        """
+        navigation = compile_template("navigation", "{{{symbol}}} '{target}' \\ {link}", symbol="{up}")
+        self.assertEqual(navigation("top", "#{x}"), "{{up}} 'top' \\ #{x}")
+
+        repeated = compile_template("index_entry", "{anchor}{title}{anchor}{file}{anchor}")
+        self.assertEqual(repeated("t", "f", "a"), "atafa")
+        self.assertEqual(compile_template("navigation", "{{}}")("top", "#"), "{}")
+
+    def test_custom_templates(self):
+        """
+        Test that templates from a file change the layout, and that the other templates keep their defaults.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "templates.json")
+            with open(path, "w") as templates_file:
+                json.dump({"navigation": "", "no_description": "\nTODO", "code": "\n    {code}\n"}, templates_file)
+            templates = load_templates(path)
+
+        markdown = "".join(iter_module_markdown(self.module, "", templates))
+        self.assertNotIn("Back to", markdown)
+        self.assertIn("\nTODO", markdown)
+        self.assertIn("\n    def my_function():\n    pass\n", markdown)
+        self.assertIn("\nDoes {things}.", markdown)
+        self.assertIn(md_utils.add_header(4, "my_function"), markdown)
+        self.assertEqual(
+            "".join(iter_module_index(self.module, "", templates)), "".join(iter_module_index(self.module))
+        )
+
+    def test_invalid_templates(self):
+        """
+        Test that unknown templates and placeholders are rejected.
+        """
+        for templates in [{"footer": ""}, {"header": "{name}"}, {"code": "{code!r}"}, {"code": "{"}, {"code": 1}]:
+            with self.assertRaises(ValueError):
+                Templates(templates)
+
+
+if __name__ == "__main__":
+    unittest.main()
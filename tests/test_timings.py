@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from markdowndocs import timings
+
+
+class TestTimings(unittest.TestCase):
+    """
+    Test cases for the timings recorder.
+    """
+
+    def setUp(self) -> None:
+        """
+        Make sure recording is disabled after every test.
+        """
+        self.addCleanup(timings.disable)
+
+    def test_disabled(self) -> None:
+        """
+        Test that phases are not recorded while recording is disabled.
+        """
+        recorder = timings.Timings()
+        with timings.phase("import", "my_module"), timings.track_module("my_module"):
+            pass
+        self.assertEqual(recorder.report()["phases"], {})
+        self.assertEqual(recorder.report()["modules"], [])
+
+    def test_nested_phases(self) -> None:
+        """
+        Test that the time spent in a nested phase is only attributed to the nested phase.
+        """
+        recorder = timings.enable()
+        with timings.phase("inspect", "my_module"):
+            time.sleep(0.02)
+            with timings.phase("import", "my_module"):
+                time.sleep(0.05)
+
+        report = recorder.report()
+        self.assertGreaterEqual(report["phases"]["import"], 0.05)
+        self.assertLess(report["phases"]["inspect"], 0.05)
+        self.assertEqual(list(report["phases"]), ["import", "inspect"])
+
+        [module] = report["modules"]
+        self.assertEqual(module["module"], "my_module")
+        self.assertAlmostEqual(module["seconds"], report["phases"]["import"] + report["phases"]["inspect"])
+
+    def test_slowest_modules_first(self) -> None:
+        """
+        Test that modules are reported from slowest to fastest.
+        """
+        recorder = timings.enable()
+        for name, seconds in [("fast", 0.0), ("slow", 0.02)]:
+            with timings.track_module(name), timings.phase("import", name):
+                time.sleep(seconds)
+
+        self.assertEqual([module["module"] for module in recorder.report()["modules"]], ["slow", "fast"])
+        self.assertIn(" - slow:", recorder.summary(top=1))
+        self.assertNotIn(" - fast:", recorder.summary(top=1))
+
+    def test_save(self) -> None:
+        """
+        Test that the report is saved as JSON.
+        """
+        recorder = timings.enable()
+        with timings.phase("discovery"):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "timings.json")
+            recorder.save(path)
+            with open(path, "r") as report_file:
+                report = json.load(report_file)
+        self.assertIn("discovery", report["phases"])
+        self.assertEqual(report["modules"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,8 @@
+import helper
+
+
+def describe():
+    return helper.NAME
+
+
+describe.__doc__ = f"Helper {helper.NAME}."
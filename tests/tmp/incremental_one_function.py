@@ -0,0 +1,8 @@
+def greet(name: str) -> str:
+    """
+    Generates a greeting.
+
+    :param name: A name.
+    :return: A greeting.
+    """
+    return f"Hello {name}"
@@ -0,0 +1,2 @@
+def good():
+    """Good function."""
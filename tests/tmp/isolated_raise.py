@@ -0,0 +1 @@
+raise RuntimeError('import-time failure')
@@ -0,0 +1,6 @@
+with open('/root/package/tests/tmp/package_imports/executions.txt', "a") as f:
+    f.write("x")
+
+
+def base():
+    """Base function."""
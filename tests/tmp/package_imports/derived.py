@@ -0,0 +1,5 @@
+from tmp.package_imports.base import base
+
+
+def derived():
+    """Derived function."""
@@ -0,0 +1,2 @@
+def kept():
+    pass
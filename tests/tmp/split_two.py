@@ -0,0 +1,6 @@
+def two():
+    """Two function."""
+
+
+def three():
+    """Three function."""
@@ -0,0 +1,37 @@
+"""Cached functions."""
+
+import functools
+from functools import lru_cache
+
+
+def traced(func):
+    @functools.wraps(func)
+    def wrapper(*args):
+        return func(*args)
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def cached(x):
+    return x
+
+
+@lru_cache
+def also_cached(x):
+    return x
+
+
+@traced
+def plain(x):
+    """Plain."""
+    return x
+
+
+class Cached:
+    @functools.lru_cache()
+    def method(self):
+        return 1
+
+    def other(self):
+        return 2
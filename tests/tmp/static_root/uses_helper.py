@@ -0,0 +1,5 @@
+from pkg import helper
+
+
+def describe():
+    return helper.NAME
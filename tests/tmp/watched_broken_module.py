@@ -0,0 +1,2 @@
+def f():
+    """Fixed version."""
@@ -0,0 +1,12 @@
+def greet(name: str) -> str:
+    """
+    Generates a greeting.
+
+    :param name: A name.
+    :return: A greeting.
+    """
+    return f"Hello {name}"
+
+
+def watched_function():
+    """Watched function."""